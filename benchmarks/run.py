@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks the discovery, parsing, classification, graph building and path
+queries on a synthetic *aces-dev* like transforms tree.
+
+Usage::
+
+    python -m benchmarks.run --transforms 5000 --history benchmarks.json
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import generate_synthetic_tree
+from discover_aces_dev.common import is_networkx_installed
+from discover_aces_dev.compact_graph import CompactGraph
+from discover_aces_dev.discover import (classify_aces_ctl_transforms,
+                                        discover_aces_ctl,
+                                        find_transform_pairs,
+                                        parse_ctl_transforms)
+
+__all__ = ['measure', 'run_benchmarks', 'compare_results', 'main']
+
+
+def measure(callable_, repeat=3):
+    """
+    Measures the best execution time and the peak memory allocated by given
+    callable.
+
+    Parameters
+    ----------
+    callable_ : callable
+        Callable to measure.
+    repeat : int, optional
+        Execution count, the best time is retained.
+
+    Returns
+    -------
+    tuple
+        Result of the last execution and measurement, i.e. a *dict* with the
+        *time* in seconds and *peak_memory* in bytes.
+    """
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = callable_()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    callable_()
+    _current, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, {'time': min(timings), 'peak_memory': peak_memory}
+
+
+def _unclassify(classified_ctl_transforms):
+    from discover_aces_dev.graph import _unclassify_ctl_transforms
+
+    return _unclassify_ctl_transforms(classified_ctl_transforms)
+
+
+def run_benchmarks(root_directory, repeat=3, queries=1000, seed=0):
+    """
+    Runs the benchmarks on given transforms tree.
+
+    Parameters
+    ----------
+    root_directory : unicode
+        Transforms root directory.
+    repeat : int, optional
+        Execution count of each benchmark, the best time is retained.
+    queries : int, optional
+        Path query count.
+    seed : int, optional
+        Random seed for the path queries.
+
+    Returns
+    -------
+    dict
+        Measurements of each stage.
+    """
+
+    results = {}
+
+    unclassified_ctl_transforms, results['discover_aces_ctl'] = measure(
+        lambda: discover_aces_ctl(root_directory), repeat)
+
+    paths = list(
+        itertools.chain.from_iterable(unclassified_ctl_transforms.values()))
+
+    _ctl_transforms, results['parse_ctl_transforms'] = measure(
+        lambda: parse_ctl_transforms(paths), repeat)
+
+    _ctl_transforms, results['find_transform_pairs'] = measure(
+        lambda: [
+            find_transform_pairs(ctl_transforms)
+            for ctl_transforms in unclassified_ctl_transforms.values()
+        ], repeat)
+
+    classified_ctl_transforms, results['classify_aces_ctl_transforms'] = (
+        measure(
+            lambda: classify_aces_ctl_transforms(unclassified_ctl_transforms),
+            repeat))
+
+    ctl_transforms = _unclassify(classified_ctl_transforms)
+
+    graph, results['build_compact_graph'] = measure(
+        lambda: CompactGraph.from_ctl_transforms(ctl_transforms), repeat)
+
+    if is_networkx_installed():
+        _graph, results['build_networkx_graph'] = measure(
+            graph.to_networkx, repeat)
+
+    random_state = random.Random(seed)
+    pairs = [(random_state.choice(graph.nodes),
+              random_state.choice(graph.nodes)) for _ in range(queries)]
+
+    _paths, results['shortest_path'] = measure(
+        lambda: [graph.shortest_path(*pair) for pair in pairs], repeat)
+
+    _paths, results['dijkstra_path'] = measure(
+        lambda: [graph.dijkstra_path(*pair) for pair in pairs], repeat)
+
+    _predecessors, results['precompute_shortest_paths'] = measure(
+        lambda: CompactGraph.from_ctl_transforms(ctl_transforms).
+        precompute_shortest_paths(), 1)
+
+    graph.precompute_shortest_paths()
+    _paths, results['shortest_path_precomputed'] = measure(
+        lambda: [graph.shortest_path(*pair) for pair in pairs], repeat)
+
+    return results
+
+
+def compare_results(results, reference_results, threshold=0.1):
+    """
+    Compares given benchmark results to reference results.
+
+    Parameters
+    ----------
+    results : dict
+        Benchmark results.
+    reference_results : dict
+        Reference benchmark results.
+    threshold : float, optional
+        Relative time increase above which a stage is considered as
+        regressed.
+
+    Returns
+    -------
+    dict
+        Relative time change of the regressed stages.
+    """
+
+    regressions = {}
+    for stage, measurement in results.items():
+        reference_measurement = reference_results.get(stage)
+        if reference_measurement is None or not reference_measurement['time']:
+            continue
+
+        change = measurement['time'] / reference_measurement['time'] - 1
+        if change > threshold:
+            regressions[stage] = change
+
+    return regressions
+
+
+def _revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(__file__),
+            stderr=subprocess.DEVNULL).decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmarks "discover-aces-dev" on a synthetic tree.')
+    parser.add_argument(
+        '--root-directory',
+        help='Existing transforms tree to benchmark instead of generating a '
+        'synthetic one.')
+    parser.add_argument('--categories', type=int, default=8)
+    parser.add_argument('--vendors', type=int, default=4)
+    parser.add_argument('--transforms', type=int, default=2000)
+    parser.add_argument('--malformed-ratio', type=float, default=0.05)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument(
+        '--history',
+        help='JSON file the results are appended to and compared against.')
+    parser.add_argument('--threshold', type=float, default=0.1)
+    arguments = parser.parse_args(arguments)
+
+    logging.disable(logging.WARNING)
+
+    parameters = {
+        key: getattr(arguments, key)
+        for key in ('categories', 'vendors', 'transforms', 'malformed_ratio',
+                    'root_directory')
+    }
+
+    if arguments.root_directory is None:
+        with tempfile.TemporaryDirectory() as root_directory:
+            generate_synthetic_tree(root_directory, arguments.categories,
+                                    arguments.vendors, arguments.transforms,
+                                    arguments.malformed_ratio)
+            results = run_benchmarks(root_directory, arguments.repeat,
+                                     arguments.queries)
+    else:
+        results = run_benchmarks(arguments.root_directory, arguments.repeat,
+                                 arguments.queries)
+
+    for stage, measurement in results.items():
+        print(f'{stage:<32}{measurement["time"] * 1000:>12.3f} ms'
+              f'{measurement["peak_memory"] / 1024:>12.1f} KiB')
+
+    if arguments.history is None:
+        return 0
+
+    history = []
+    if os.path.exists(arguments.history):
+        with open(arguments.history) as history_file:
+            history = json.load(history_file)
+
+    reference = next((entry for entry in reversed(history)
+                      if entry['parameters'] == parameters), None)
+
+    history.append({
+        'timestamp': time.time(),
+        'revision': _revision(),
+        'python': platform.python_version(),
+        'parameters': parameters,
+        'results': results
+    })
+    with open(arguments.history, 'w') as history_file:
+        json.dump(history, history_file, indent=2)
+
+    if reference is None:
+        return 0
+
+    regressions = compare_results(results, reference['results'],
+                                  arguments.threshold)
+    for stage, change in regressions.items():
+        print(f'"{stage}" regressed by {change:.1%} since '
+              f'"{reference["revision"]}" revision!')
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
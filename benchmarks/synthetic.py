@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+
+from discover_aces_dev.discover import ACES_URN
+
+__all__ = ['generate_synthetic_tree']
+
+_CATEGORY_DIRECTORIES = [
+    'csc', 'idt', 'odt', 'outputTransforms', 'lmt', 'lib', 'utilities', 'rrt'
+]
+
+_HEADER = '''// <ACEStransformID>{id}</ACEStransformID>
+// <ACESuserName>{user_name}</ACESuserName>
+
+//
+// Synthetic "{name}" transform.
+//
+
+import "ACESlib.Utilities";
+import "ACESlib.Transform_Common";
+
+'''
+
+_HEADER_WITHOUT_ID = '''//
+// Synthetic "{name}" transform without "ACEStransformID".
+//
+
+'''
+
+_BODY = '''void main(input varying float rIn,
+          input varying float gIn,
+          input varying float bIn,
+          input varying float aIn,
+          output varying float rOut,
+          output varying float gOut,
+          output varying float bOut,
+          output varying float aOut)
+{
+    rOut = rIn;
+    gOut = gIn;
+    bOut = bIn;
+    aOut = aIn;
+}
+'''
+
+
+def _malform_id(id_, random_state):
+    # Malformations that "patch_invalid_id" definition recovers from, the
+    # version scheme being only patched for "ACEScsc" transforms.
+    malformations = ['urn', 'none']
+    if '.ACEScsc.' in id_:
+        malformations.append('version')
+
+    malformation = random_state.choice(malformations)
+    if malformation == 'urn':
+        return id_.replace(f'{ACES_URN}:', '')
+    elif malformation == 'version':
+        return id_.rsplit('.', 3)[0] + '.a1.v1'
+    else:
+        return None
+
+
+def _transforms(category_directory, vendor, index):
+    # Returns the basenames and identifiers of the forward and inverse
+    # transforms, the inverse being "None" when the category has no inverse.
+    name = f'{vendor}_{index:05}'
+    version = 'a1.0.3'
+
+    if category_directory == 'csc':
+        return [(f'ACEScsc.Academy.{name}_to_ACES',
+                 f'ACEScsc.Academy.{name}_to_ACES.{version}'),
+                (f'ACEScsc.Academy.ACES_to_{name}',
+                 f'ACEScsc.Academy.ACES_to_{name}.{version}')]
+    elif category_directory == 'idt':
+        return [(f'IDT.{vendor}.{name}', f'IDT.{vendor}.{name}.a1.v1')]
+    elif category_directory == 'odt':
+        return [(f'ODT.Academy.{name}', f'ODT.Academy.{name}.{version}'),
+                (f'InvODT.Academy.{name}', f'InvODT.Academy.{name}.{version}')]
+    elif category_directory == 'outputTransforms':
+        return [(f'RRTODT.Academy.{name}', f'RRTODT.Academy.{name}.a1.1.0'),
+                (f'InvRRTODT.Academy.{name}',
+                 f'InvRRTODT.Academy.{name}.a1.1.0')]
+    elif category_directory == 'lmt':
+        return [(f'LMT.Academy.{name}', f'LMT.Academy.{name}.{version}')]
+    elif category_directory == 'lib':
+        return [(f'ACESlib.{name}', f'ACESlib.{name}.{version}')]
+    elif category_directory == 'utilities':
+        return [(f'ACESutil.{name}', f'ACESutil.{name}.{version}')]
+    elif category_directory == 'rrt':
+        return [(f'RRT_{name}', f'RRT.{version}'),
+                (f'InvRRT_{name}', f'InvRRT.{version}')]
+    else:
+        return [(f'ACESutil.{name}', f'ACESutil.{name}.{version}')]
+
+
+def generate_synthetic_tree(root_directory,
+                            categories=8,
+                            vendors=4,
+                            transforms=1000,
+                            malformed_ratio=0.05,
+                            seed=0):
+    """
+    Generates a synthetic *aces-dev* like transforms tree.
+
+    The tree has a *ctl* directory whose sub-directories are the categories,
+    each category containing a *vendorSupplied* directory with the vendor
+    sub-directories. Categories with inverse transforms, e.g. *csc*, *odt*,
+    *outputTransforms* and *rrt*, receive forward and inverse pairs.
+
+    Parameters
+    ----------
+    root_directory : unicode
+        Directory to generate the tree into.
+    categories : int, optional
+        Category count, categories beyond the *aces-dev* ones are named
+        *category_n* and hold utility transforms.
+    vendors : int, optional
+        Vendor sub-directory count per category.
+    transforms : int, optional
+        Approximate *CTL* transform count.
+    malformed_ratio : float, optional
+        Ratio of transforms whose *ACEStransformID* header is missing or
+        malformed in a way the parser recovers from.
+    seed : int, optional
+        Random seed for reproducibility.
+
+    Returns
+    -------
+    list
+        Paths of the generated *CTL* transforms.
+    """
+
+    random_state = random.Random(seed)
+
+    category_directories = [
+        _CATEGORY_DIRECTORIES[index] if index < len(_CATEGORY_DIRECTORIES)
+        else f'category_{index}' for index in range(categories)
+    ]
+
+    paths = []
+    index = 0
+    while len(paths) < transforms:
+        category_directory = category_directories[index % categories]
+        vendor = f'Vendor{(index // categories) % vendors}'
+        directory = os.path.join(root_directory, 'ctl', category_directory,
+                                 'vendorSupplied', vendor)
+        os.makedirs(directory, exist_ok=True)
+
+        for basename, id_ in _transforms(category_directory, vendor, index):
+            id_ = f'{ACES_URN}:{id_}'
+            if random_state.random() < malformed_ratio:
+                id_ = _malform_id(id_, random_state)
+
+            path = os.path.join(directory, f'{basename}.ctl')
+            with open(path, 'w') as ctl_file:
+                if id_ is None:
+                    ctl_file.write(_HEADER_WITHOUT_ID.format(name=basename))
+                else:
+                    ctl_file.write(
+                        _HEADER.format(
+                            id=id_,
+                            user_name=f'Synthetic - {basename}',
+                            name=basename))
+                ctl_file.write(_BODY)
+
+            paths.append(path)
+
+        index += 1
+
+    return paths
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import itertools
+import os
+from collections import defaultdict
+
+from discover_aces_dev.discover import (
+    REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT, CTLTransform,
+    _classified_paths_to_paths, _classify_ctl_transforms,
+    _filter_ctl_transforms, _scan_directory, classify_ctl_transform_paths)
+
+__all__ = [
+    'ASYNC_DISCOVERY_CONCURRENCY', 'async_discover_aces_ctl',
+    'async_parse_ctl_transforms', 'async_classify_aces_ctl_transforms'
+]
+
+ASYNC_DISCOVERY_CONCURRENCY = 32
+"""
+Default maximum count of concurrent directory listings and file reads.
+"""
+
+
+async def _run(semaphore, executor, function, *args):
+    async with semaphore:
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, function, *args)
+
+
+async def _walk(directory, relative_directory, rules, semaphore, executor):
+    # Scans the sub-directories concurrently and flattens the result in the
+    # same depth-first, top-down order as the synchronous walk.
+    scan = await _run(semaphore, executor, _scan_directory, directory,
+                      relative_directory, rules)
+    if scan is None:
+        return []
+
+    sub_directories, files = scan
+
+    walks = await asyncio.gather(*[
+        _walk(sub_directory, relative_sub_directory, rules, semaphore,
+              executor)
+        for sub_directory, relative_sub_directory in sub_directories
+    ])
+
+    return [(directory, relative_directory, files)
+            ] + list(itertools.chain.from_iterable(walks))
+
+
+async def async_discover_aces_ctl(
+        root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
+        filterers=None,
+        rules=None,
+        concurrency=ASYNC_DISCOVERY_CONCURRENCY,
+        executor=None):
+    """
+    Discovers the *CTL* transforms under given root directory, listing the
+    directories concurrently.
+
+    The blocking directory listings run in given executor, at most
+    *concurrency* at a time, so that the event loop is never blocked.
+
+    Parameters
+    ----------
+    root_directory : unicode, optional
+        Root directory to discover the *CTL* transforms from.
+    filterers : array_like, optional
+        Callables receiving a filename and returning whether the file should
+        be kept.
+    rules : DiscoveryRules, optional
+        Declarative rules pruning the directories before they are walked and
+        excluding *CTL* transforms.
+    concurrency : int, optional
+        Maximum count of concurrent directory listings.
+    executor : Executor, optional
+        :class:`concurrent.futures.Executor` class instance running the
+        directory listings, defaults to the event loop default executor.
+
+    Returns
+    -------
+    dict
+        Unclassified *CTL* transforms, as returned by
+        :func:`discover_aces_dev.discover_aces_ctl` definition.
+    """
+
+    root_directory = os.path.normpath(os.path.expandvars(root_directory))
+    if filterers is None:
+        filterers = []
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    ctl_transforms = defaultdict(list)
+    for directory, relative_directory, entries in await _walk(
+            root_directory, '', rules, semaphore, executor):
+        paths = _filter_ctl_transforms(directory, relative_directory,
+                                       entries, filterers, rules)
+        if paths:
+            ctl_transforms[directory].extend(paths)
+
+    return ctl_transforms
+
+
+async def async_parse_ctl_transforms(paths,
+                                     concurrency=ASYNC_DISCOVERY_CONCURRENCY,
+                                     executor=None):
+    """
+    Parses given *CTL* transform paths, reading their headers concurrently.
+
+    Parameters
+    ----------
+    paths : array_like
+        *CTL* transform paths.
+    concurrency : int, optional
+        Maximum count of concurrent header reads.
+    executor : Executor, optional
+        :class:`concurrent.futures.Executor` class instance running the
+        header reads, defaults to the event loop default executor.
+
+    Returns
+    -------
+    list
+        :class:`discover_aces_dev.CTLTransform` class instances in the same
+        order as given paths.
+    """
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    return list(await asyncio.gather(
+        *[_run(semaphore, executor, CTLTransform, path) for path in paths]))
+
+
+async def async_classify_aces_ctl_transforms(
+        unclassified_ctl_transforms,
+        concurrency=ASYNC_DISCOVERY_CONCURRENCY,
+        executor=None,
+        index=None):
+    """
+    Classifies given *CTL* transforms, reading their headers concurrently.
+
+    Parameters
+    ----------
+    unclassified_ctl_transforms : dict
+        Unclassified *CTL* transforms as returned by
+        :func:`async_discover_aces_ctl` or
+        :func:`discover_aces_dev.discover_aces_ctl` definitions.
+    concurrency : int, optional
+        Maximum count of concurrent header reads.
+    executor : Executor, optional
+        :class:`concurrent.futures.Executor` class instance running the
+        header reads, defaults to the event loop default executor.
+    index : TransformIndex, optional
+        Index populated during the classification.
+
+    Returns
+    -------
+    dict
+        Classified *CTL* transforms, as returned by
+        :func:`discover_aces_dev.classify_aces_ctl_transforms` definition.
+
+    Examples
+    --------
+    >>> async def catalogue():
+    ...     return await async_classify_aces_ctl_transforms(
+    ...         await async_discover_aces_ctl())
+    >>> classified_ctl_transforms = asyncio.run(catalogue())
+    ... # doctest: +SKIP
+    """
+
+    classified_paths = list(
+        classify_ctl_transform_paths(unclassified_ctl_transforms))
+    paths = _classified_paths_to_paths(classified_paths)
+    ctl_transforms = dict(
+        zip(paths, await async_parse_ctl_transforms(paths, concurrency,
+                                                    executor)))
+
+    return _classify_ctl_transforms(classified_paths, ctl_transforms, index)
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import itertools
+import logging
+import os
+import sqlite3
+from collections import defaultdict
+
+from discover_aces_dev.common import vivified_to_dict
+from discover_aces_dev.discover import (
+    CTL_TRANSFORM_METADATA_ATTRIBUTES, CTLTransform, CTLTransformPair,
+    classify_ctl_transform_paths)
+
+__all__ = ['DISCOVERY_CACHE_SCHEMA_VERSION', 'file_digest', 'DiscoveryCache']
+
+DISCOVERY_CACHE_SCHEMA_VERSION = 2
+
+_STAT_COLUMNS = ['path', 'mtime', 'size', 'digest']
+
+_CLASSIFICATION_COLUMNS = [
+    'category', 'classifiers', 'basename', 'direction', 'classified'
+]
+
+_COLUMNS = (_STAT_COLUMNS + CTL_TRANSFORM_METADATA_ATTRIBUTES +
+            _CLASSIFICATION_COLUMNS)
+
+
+def file_digest(path, chunk_size=65536):
+    """
+    Returns the *SHA-256* hex digest of the content of given file.
+
+    Parameters
+    ----------
+    path : unicode
+        File path.
+    chunk_size : int
+        Size of the chunks read from the file.
+
+    Returns
+    -------
+    unicode
+        File content digest.
+    """
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file_:
+        for chunk in iter(lambda: file_.read(chunk_size), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class DiscoveryCache:
+    """
+    Persistent, incremental index of the discovered *CTL* transforms.
+
+    The index is stored in a *SQLite* database keyed by the transform path,
+    modification time, size and content digest. It holds the parsed
+    :class:`discover_aces_dev.CTLTransform` metadata and the classification
+    of each transform so that subsequent runs only parse the files that were
+    added or changed since the last run.
+
+    An index is meant to be dedicated to a single transforms root: files that
+    are not part of the classified transforms are removed from it.
+
+    Parameters
+    ----------
+    path : unicode
+        Path to the index database, ``:memory:`` can be used for a transient
+        index.
+    """
+
+    def __init__(self, path):
+        self._path = path
+
+        self._connection = sqlite3.connect(path)
+        self._initialise()
+
+    @property
+    def path(self):
+        return self._path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._connection.execute(
+            'SELECT COUNT(*) FROM ctl_transforms').fetchone()[0]
+
+    def _initialise(self):
+        version = self._connection.execute('PRAGMA user_version').fetchone()[0]
+
+        if version != DISCOVERY_CACHE_SCHEMA_VERSION:
+            logging.info(
+                '"%s" discovery cache schema is outdated, rebuilding it!',
+                self._path)
+            self._connection.execute('DROP TABLE IF EXISTS ctl_transforms')
+
+        columns = ', '.join(
+            'path TEXT PRIMARY KEY' if column == 'path' else column
+            for column in _COLUMNS)
+        self._connection.execute(
+            f'CREATE TABLE IF NOT EXISTS ctl_transforms ({columns})')
+        self._connection.execute(
+            f'PRAGMA user_version = {DISCOVERY_CACHE_SCHEMA_VERSION}')
+        self._connection.commit()
+
+    def _rows(self):
+        columns = ', '.join(_COLUMNS)
+        return {
+            row[0]: dict(zip(_COLUMNS, row))
+            for row in self._connection.execute(
+                f'SELECT {columns} FROM ctl_transforms')
+        }
+
+    def _parse(self, path, stat, row=None):
+        digest = file_digest(path)
+
+        if row is not None and row['digest'] == digest:
+            logging.info('"%s" CTL transform content is unchanged.', path)
+
+            row.update(mtime=stat.st_mtime_ns, size=stat.st_size)
+
+            return row
+
+        logging.info('"%s" CTL transform was modified, parsing it!', path)
+
+        row = dict.fromkeys(_COLUMNS)
+        row.update(CTLTransform(path).metadata)
+        row.update(
+            path=path,
+            mtime=stat.st_mtime_ns,
+            size=stat.st_size,
+            digest=digest)
+
+        return row
+
+    def _synchronise(self, paths):
+        rows = self._rows()
+        synchronised_rows, is_modified = {}, False
+        for path in paths:
+            stat = os.stat(path)
+            row = rows.pop(path, None)
+
+            if (row is not None and row['mtime'] == stat.st_mtime_ns and
+                    row['size'] == stat.st_size):
+                synchronised_rows[path] = row
+                continue
+
+            synchronised_rows[path] = self._parse(path, stat, row)
+            is_modified = True
+
+        if rows:
+            logging.info('%s CTL transform(s) were removed.', len(rows))
+
+            self._connection.executemany(
+                'DELETE FROM ctl_transforms WHERE path = ?',
+                [(path, ) for path in rows])
+            is_modified = True
+
+        return synchronised_rows, is_modified
+
+    def _store(self, rows):
+        placeholders = ', '.join('?' for _ in _COLUMNS)
+        self._connection.executemany(
+            f'INSERT OR REPLACE INTO ctl_transforms VALUES ({placeholders})',
+            [[row[column] for column in _COLUMNS] for row in rows])
+        self._connection.commit()
+
+    def ctl_transform(self, path):
+        """
+        Returns the :class:`discover_aces_dev.CTLTransform` class instance for
+        given path, parsing the file only if its index entry is stale.
+
+        Parameters
+        ----------
+        path : unicode
+            *CTL* transform path.
+
+        Returns
+        -------
+        CTLTransform
+            *CTL* transform.
+        """
+
+        stat = os.stat(path)
+        columns = ', '.join(_COLUMNS)
+        row = self._connection.execute(
+            f'SELECT {columns} FROM ctl_transforms WHERE path = ?',
+            (path, )).fetchone()
+
+        if row is not None:
+            row = dict(zip(_COLUMNS, row))
+
+            if (row['mtime'] == stat.st_mtime_ns and
+                    row['size'] == stat.st_size):
+                return CTLTransform(path, row)
+
+        row = self._parse(path, stat, row)
+        self._store([row])
+
+        return CTLTransform(path, row)
+
+    def classify_aces_ctl_transforms(self, unclassified_ctl_transforms):
+        """
+        Classifies given *CTL* transforms, re-using the index entries of the
+        files that were not added, modified or removed since the last run.
+
+        Parameters
+        ----------
+        unclassified_ctl_transforms : dict
+            Unclassified *CTL* transforms as returned by
+            :func:`discover_aces_dev.discover_aces_ctl` definition.
+
+        Returns
+        -------
+        dict
+            Classified *CTL* transforms.
+        """
+
+        paths = list(
+            itertools.chain.from_iterable(
+                unclassified_ctl_transforms.values()))
+
+        rows, is_modified = self._synchronise(paths)
+
+        if is_modified or not all(row['classified'] for row in rows.values()):
+            # The files that "find_transform_pairs" definition drops, e.g.
+            # colliding pair basenames, are classified without category so
+            # that they are skipped without classifying them on every run.
+            for row in rows.values():
+                row.update(
+                    dict.fromkeys(_CLASSIFICATION_COLUMNS), classified=1)
+
+            for category, classifiers, basename, pairs in (
+                    classify_ctl_transform_paths(
+                        unclassified_ctl_transforms)):
+                for direction, path in pairs.items():
+                    rows[path].update(
+                        category=category,
+                        classifiers=classifiers,
+                        basename=basename,
+                        direction=direction if len(pairs) == 2 else None)
+
+            self._store(rows.values())
+        else:
+            logging.info('Discovery cache is up-to-date.')
+
+        classified_ctl_transforms = defaultdict(lambda: defaultdict(dict))
+        ctl_transform_pairs = defaultdict(dict)
+        for path, row in rows.items():
+            if row['category'] is None:
+                continue
+
+            category, classifiers, basename = (row['category'],
+                                               row['classifiers'],
+                                               row['basename'])
+            ctl_transform = CTLTransform(path, row)
+
+            if row['direction'] is None:
+                classified_ctl_transforms[category][classifiers][basename] = (
+                    ctl_transform)
+            else:
+                # Reserving the slot so that ordering matches the uncached
+                # classification.
+                classified_ctl_transforms[category][classifiers][basename] = (
+                    None)
+                ctl_transform_pairs[(category, classifiers,
+                                     basename)][row['direction']] = (
+                                         ctl_transform)
+
+        for (category, classifiers,
+             basename), pairs in ctl_transform_pairs.items():
+            classified_ctl_transforms[category][classifiers][basename] = (
+                CTLTransformPair(pairs['forward_transform'],
+                                 pairs['inverse_transform']))
+
+        return vivified_to_dict(classified_ctl_transforms)
+
+    def clear(self):
+        """
+        Removes all the entries from the index.
+        """
+
+        self._connection.execute('DELETE FROM ctl_transforms')
+        self._connection.commit()
+
+    def close(self):
+        """
+        Closes the index database connection.
+        """
+
+        self._connection.close()
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+import json
+import os
+import socket
+import sys
+import tempfile
+
+__all__ = ['DAEMON_ADDRESS', 'DaemonError', 'DaemonClient']
+
+DAEMON_ADDRESS = os.environ.get(
+    'DISCOVER_ACES_DEV_DAEMON_ADDRESS',
+    os.path.join(tempfile.gettempdir(), 'discover-aces-dev.sock'))
+"""
+Default address of the query daemon, a *Unix* domain socket path unless
+overridden with the *DISCOVER_ACES_DEV_DAEMON_ADDRESS* environment variable,
+a *host:port* value selecting a localhost *TCP* socket.
+"""
+
+
+class DaemonError(Exception):
+    """
+    Exception raised when the query daemon fails to answer a request.
+    """
+
+
+_READ_ONLY_METHODS = ('ping', 'lookup', 'path', 'search')
+
+
+def _parse_address(address):
+    if isinstance(address, str) and ':' in address and os.sep not in address:
+        host, port = address.rsplit(':', 1)
+
+        return host, int(port)
+
+    return address
+
+
+class DaemonClient:
+    """
+    Thin client of the :mod:`discover_aces_dev.daemon` query daemon, it only
+    depends on the standard library so that its import is cheap. The
+    connection is opened on first request and kept open for the subsequent
+    ones.
+
+    Parameters
+    ----------
+    address : unicode or tuple, optional
+        *Unix* domain socket path or *(host, port)* tuple of the daemon.
+    timeout : numeric, optional
+        Socket timeout in seconds.
+
+    Examples
+    --------
+    >>> with DaemonClient() as client:  # doctest: +SKIP
+    ...     [ctl_transform['path'] for ctl_transform in
+    ...      client.conversion_path('ACEScg', 'Rec709_100nits_dim')]
+    ['.../ACEScsc.Academy.ACEScg_to_ACES.ctl', '.../RRT.ctl', \
+'.../ODT.Academy.Rec709_100nits_dim.ctl']
+    """
+
+    def __init__(self, address=DAEMON_ADDRESS, timeout=30):
+        self._address = _parse_address(address)
+        self._timeout = timeout
+        self._socket = None
+        self._file = None
+        self._identifiers = itertools.count()
+
+    @property
+    def address(self):
+        return self._address
+
+    def _connect(self):
+        family = (socket.AF_INET
+                  if isinstance(self._address, tuple) else socket.AF_UNIX)
+        self._socket = socket.socket(family, socket.SOCK_STREAM)
+        self._socket.settimeout(self._timeout)
+        try:
+            self._socket.connect(self._address)
+        except OSError:
+            self.close()
+            raise
+
+        self._file = self._socket.makefile('rwb')
+
+    def request(self, method, **params):
+        """
+        Sends given request to the daemon and returns its result.
+
+        Parameters
+        ----------
+        method : unicode
+            {'ping', 'lookup', 'path', 'search', 'reload', 'shutdown'},
+            request method.
+
+        Other Parameters
+        ----------------
+        \\**params : dict, optional
+            Request parameters.
+
+        Returns
+        -------
+        object
+            Request result.
+
+        Raises
+        ------
+        DaemonError
+            If the daemon cannot be reached or the request fails.
+        """
+
+        request = {
+            'id': next(self._identifiers),
+            'method': method,
+            'params': params
+        }
+        data = json.dumps(request, separators=(',', ':')).encode() + b'\n'
+
+        # A kept-alive connection might have been closed by a restarted
+        # daemon, the request is sent again once on a new connection if it
+        # was not sent yet or is read-only, the "reload" and "shutdown"
+        # requests must not be repeated.
+        for attempt in range(2):
+            sent = False
+            try:
+                if self._socket is None:
+                    self._connect()
+
+                sent = True
+                self._file.write(data)
+                self._file.flush()
+                line = self._file.readline()
+                if not line:
+                    raise ConnectionError('Connection closed by the daemon!')
+
+                break
+            except OSError as error:
+                self.close()
+                if attempt or (sent and method not in _READ_ONLY_METHODS):
+                    raise DaemonError(
+                        f'"{self._address}" daemon cannot be reached: '
+                        f'{error}') from error
+
+        response = json.loads(line)
+        if 'error' in response:
+            raise DaemonError(response['error'])
+
+        return response['result']
+
+    def ping(self):
+        return self.request('ping')
+
+    def lookup(self, **criteria):
+        """
+        Returns the *CTL* transforms matching all the given criteria, see
+        :meth:`discover_aces_dev.TransformIndex.query` method.
+
+        Other Parameters
+        ----------------
+        \\**criteria : dict, optional
+            Indexed attributes and their values.
+
+        Returns
+        -------
+        list
+            *CTL* transforms metadata and path.
+        """
+
+        return self.request('lookup', **criteria)
+
+    def conversion_path(self, source, target):
+        """
+        Returns the chain of *CTL* transforms converting from given source to
+        given target colourspace.
+
+        Parameters
+        ----------
+        source : unicode
+            Source colourspace.
+        target : unicode
+            Target colourspace.
+
+        Returns
+        -------
+        list
+            Ordered *CTL* transforms metadata and path.
+        """
+
+        return self.request('path', source=source, target=target)
+
+    def search(self, query, mode='prefix', limit=None):
+        """
+        Searches the *CTL* transforms matching all the terms of given query,
+        see :meth:`discover_aces_dev.SearchIndex.search` method.
+
+        Parameters
+        ----------
+        query : unicode
+            Query.
+        mode : unicode, optional
+            {'prefix', 'substring', 'exact'}, how the query terms match.
+        limit : int, optional
+            Maximum result count.
+
+        Returns
+        -------
+        list
+            *CTL* transforms metadata, path and score sorted by decreasing
+            score.
+        """
+
+        return self.request('search', query=query, mode=mode, limit=limit)
+
+    def close(self):
+        """
+        Closes the connection.
+        """
+
+        for resource in (self._file, self._socket):
+            if resource is not None:
+                try:
+                    resource.close()
+                except OSError:
+                    pass
+
+        self._file = self._socket = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Queries the "discover-aces-dev" daemon.')
+    parser.add_argument('--address', default=DAEMON_ADDRESS)
+    parser.add_argument(
+        'method',
+        choices=['ping', 'lookup', 'path', 'search', 'reload', 'shutdown'])
+    parser.add_argument(
+        'arguments',
+        nargs='*',
+        help='"attribute=value" criteria for "lookup", source and target for '
+        '"path", query for "search".')
+    arguments = parser.parse_args()
+
+    params = {}
+    if arguments.method == 'lookup':
+        params = dict(
+            criterion.split('=', 1) for criterion in arguments.arguments)
+    elif arguments.method == 'path':
+        params = dict(zip(['source', 'target'], arguments.arguments))
+    elif arguments.method == 'search':
+        params = {'query': ' '.join(arguments.arguments)}
+
+    with DaemonClient(arguments.address) as client:
+        try:
+            result = client.request(arguments.method, **params)
+        except DaemonError as error:
+            sys.exit(str(error))
+
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write('\n')
@@ -5,7 +5,7 @@ from collections import defaultdict
 
 __all__ = [
     'first_item', 'common_ancestor', 'paths_common_ancestor', 'vivification',
-    'vivified_to_dict', 'is_networkx_installed'
+    'vivified_to_dict', 'is_networkx_installed', 'is_numpy_installed'
 ]
 
 
@@ -42,7 +42,7 @@ def common_ancestor(*args):
     """
 
     array = list(map(set, zip(*args)))
-    divergence = filter(lambda i: len(i) > 1, array)
+    divergence = [i for i in array if len(i) > 1]
     if divergence:
         ancestor = first_item(args)[:array.index(first_item(divergence))]
     else:
@@ -111,3 +111,35 @@ def is_networkx_installed(raise_exception=False):
                 '"NetworkX" related API features are not available: "{0}".'.
                 format(error))
         return False
+
+
+def is_numpy_installed(raise_exception=False):
+    """
+    Returns if *NumPy* is installed and available.
+
+    Parameters
+    ----------
+    raise_exception : bool
+        Raise exception if *NumPy* is unavailable.
+
+    Returns
+    -------
+    bool
+        Is *NumPy* installed.
+
+    Raises
+    ------
+    ImportError
+        If *NumPy* is not installed.
+    """
+
+    try:  # pragma: no cover
+        import numpy  # noqa
+
+        return True
+    except ImportError as error:  # pragma: no cover
+        if raise_exception:
+            raise ImportError(
+                '"NumPy" related API features are not available: "{0}".'.
+                format(error))
+        return False
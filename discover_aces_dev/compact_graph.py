@@ -0,0 +1,763 @@
+# -*- coding: utf-8 -*-
+
+import heapq
+from array import array
+from collections import deque
+
+from discover_aces_dev.common import is_networkx_installed
+
+__all__ = ['CompactGraph']
+
+
+class CompactGraph:
+    """
+    Compact, immutable directed graph with integer interned nodes and
+    *CSR*-style adjacency arrays.
+
+    The graph supports breadth-first, *Dijkstra* and *k* shortest paths
+    searches and reachability queries without requiring *NetworkX* which is
+    only needed to export the graph with the :meth:`CompactGraph.to_networkx`
+    method.
+
+    Parameters
+    ----------
+    nodes : array_like
+        Node names, the position of a node being its integer identifier.
+    edges : array_like
+        Edges as *(source, target, data, weight)* tuples where *source* and
+        *target* are node names, *data* is an arbitrary object attached to
+        the edge and *weight* its cost for the *Dijkstra* path searches.
+        Duplicate edges replace the previous ones.
+    node_types : array_like, optional
+        Type of each node.
+    """
+
+    def __init__(self, nodes, edges, node_types=None):
+        self._nodes = tuple(nodes)
+        self._indexes = {node: index for index, node in enumerate(self._nodes)}
+        self._node_types = (tuple(node_types) if node_types is not None else
+                            (None, ) * len(self._nodes))
+
+        adjacency = [{} for _ in self._nodes]
+        for source, target, data, weight in edges:
+            adjacency[self._indexes[source]][self._indexes[target]] = (data,
+                                                                       weight)
+
+        self._offsets = array('l', [0])
+        self._targets = array('l')
+        self._weights = array('d')
+        self._edge_data = []
+        for neighbours in adjacency:
+            for target, (data, weight) in neighbours.items():
+                self._targets.append(target)
+                self._weights.append(weight)
+                self._edge_data.append(data)
+
+            self._offsets.append(len(self._targets))
+
+        self._predecessors = None
+        self._undirected_adjacency_arrays = None
+
+    @classmethod
+    def from_ctl_transforms(cls, ctl_transforms, weighter=None):
+        """
+        Builds a graph whose nodes are the colourspaces and edges the
+        :class:`discover_aces_dev.CTLTransform` class instances converting
+        between them.
+
+        Parameters
+        ----------
+        ctl_transforms : array_like
+            *CTL* transforms, those without a source or target are ignored.
+        weighter : callable, optional
+            Callable returning the weight of the edge of given *CTL*
+            transform, edges have unit weight if *None*.
+
+        Returns
+        -------
+        CompactGraph
+            Compact graph.
+        """
+
+        nodes = {}
+        edges = []
+        for ctl_transform in ctl_transforms:
+            source = ctl_transform.source
+            target = ctl_transform.target
+
+            if source is None or target is None:
+                continue
+
+            nodes[source] = ctl_transform.type
+            nodes[target] = ctl_transform.type
+
+            weight = 1 if weighter is None else weighter(ctl_transform)
+            edges.append((source, target, ctl_transform, weight))
+
+        return cls(nodes.keys(), edges, nodes.values())
+
+    @classmethod
+    def from_csr(cls, nodes, node_types, offsets, targets, weights,
+                 edge_data):
+        """
+        Builds a graph from its *CSR* adjacency arrays as returned by the
+        :meth:`CompactGraph.to_csr` method, without re-interning the nodes and
+        edges.
+
+        Parameters
+        ----------
+        nodes : array_like
+            Node names.
+        node_types : array_like
+            Type of each node.
+        offsets : array_like
+            Offset of the first outgoing edge of each node into the edge
+            arrays, followed by the edge count.
+        targets : array_like
+            Target node identifier of each edge.
+        weights : array_like
+            Weight of each edge.
+        edge_data : array_like
+            Data attached to each edge.
+
+        Returns
+        -------
+        CompactGraph
+            Compact graph.
+        """
+
+        graph = cls.__new__(cls)
+
+        graph._nodes = tuple(nodes)
+        graph._indexes = {
+            node: index
+            for index, node in enumerate(graph._nodes)
+        }
+        graph._node_types = tuple(node_types)
+        graph._offsets = offsets
+        graph._targets = targets
+        graph._weights = weights
+        graph._edge_data = list(edge_data)
+        graph._predecessors = None
+        graph._undirected_adjacency_arrays = None
+
+        return graph
+
+    def to_csr(self):
+        """
+        Returns the *CSR* adjacency arrays of the graph.
+
+        Returns
+        -------
+        tuple
+            Edge offsets of each node, target node identifiers, weights and
+            data of the edges.
+        """
+
+        return self._offsets, self._targets, self._weights, self._edge_data
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @property
+    def node_types(self):
+        return self._node_types
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, node):
+        return node in self._indexes
+
+    def number_of_edges(self):
+        return len(self._targets)
+
+    def index(self, node):
+        """
+        Returns the integer identifier of given node.
+
+        Parameters
+        ----------
+        node : unicode
+            Node name.
+
+        Returns
+        -------
+        int
+            Node identifier.
+
+        Raises
+        ------
+        ValueError
+            If the node is not in the graph.
+        """
+
+        index = self._indexes.get(node)
+        if index is None:
+            raise ValueError(f'"{node}" node is not in the graph!')
+
+        return index
+
+    def node_type(self, node):
+        return self._node_types[self.index(node)]
+
+    def _successors(self, index):
+        return self._targets[self._offsets[index]:self._offsets[index + 1]]
+
+    def successors(self, node):
+        return [
+            self._nodes[target]
+            for target in self._successors(self.index(node))
+        ]
+
+    def edges(self):
+        for source in range(len(self._nodes)):
+            for edge in range(self._offsets[source],
+                              self._offsets[source + 1]):
+                yield (self._nodes[source], self._nodes[self._targets[edge]],
+                       self._edge_data[edge])
+
+    def _edge(self, source, target):
+        for edge in range(self._offsets[source], self._offsets[source + 1]):
+            if self._targets[edge] == target:
+                return edge
+
+        raise ValueError(f'"{self._nodes[source]}" to '
+                         f'"{self._nodes[target]}" edge is not in the graph!')
+
+    def edge_data(self, source, target):
+        return self._edge_data[self._edge(
+            self.index(source), self.index(target))]
+
+    def edge_weight(self, source, target):
+        return self._weights[self._edge(
+            self.index(source), self.index(target))]
+
+    def path_edge_data(self, path):
+        """
+        Returns the data of the edges along given path.
+
+        Parameters
+        ----------
+        path : array_like
+            Node names.
+
+        Returns
+        -------
+        list
+            Edge data.
+        """
+
+        return [
+            self.edge_data(source, target)
+            for source, target in zip(path[:-1], path[1:])
+        ]
+
+    def _breadth_first_search(self, source):
+        predecessors = array('l', [-1]) * len(self._nodes)
+        predecessors[source] = source
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            for target in self._successors(node):
+                if predecessors[target] == -1:
+                    predecessors[target] = node
+                    queue.append(target)
+
+        return predecessors
+
+    def _unwind(self, predecessors, source, target):
+        if predecessors[target] == -1:
+            return None
+
+        path = [target]
+        while target != source:
+            target = predecessors[target]
+            path.append(target)
+
+        return [self._nodes[node] for node in reversed(path)]
+
+    def reachable(self, source):
+        """
+        Returns the nodes reachable from given source node.
+
+        Parameters
+        ----------
+        source : unicode
+            Source node name.
+
+        Returns
+        -------
+        set
+            Reachable node names, including the source node.
+        """
+
+        index = self.index(source)
+        predecessors = (self._predecessors[index] if self._predecessors
+                        is not None else self._breadth_first_search(index))
+
+        return {
+            self._nodes[node]
+            for node, predecessor in enumerate(predecessors)
+            if predecessor != -1
+        }
+
+    def _undirected_adjacency(self):
+        # The undirected adjacency is built once, in the same *CSR* layout as
+        # the directed one, the graph being immutable.
+        if self._undirected_adjacency_arrays is None:
+            neighbours = [[] for _ in self._nodes]
+            for source in range(len(self._nodes)):
+                for target in self._successors(source):
+                    neighbours[source].append(target)
+                    neighbours[target].append(source)
+
+            offsets = array('l', [0])
+            targets = array('l')
+            for node_neighbours in neighbours:
+                targets.extend(node_neighbours)
+                offsets.append(len(targets))
+
+            self._undirected_adjacency_arrays = offsets, targets
+
+        return self._undirected_adjacency_arrays
+
+    def neighbourhood(self, node, radius=1):
+        """
+        Returns the nodes within given edge count of given node or nodes,
+        regardless of the edges direction.
+
+        Parameters
+        ----------
+        node : unicode or array_like
+            Node name or names, the neighbourhoods of several nodes are
+            searched at once.
+        radius : int, optional
+            Maximum edge count.
+
+        Returns
+        -------
+        set
+            Node names, including given nodes.
+        """
+
+        offsets, targets = self._undirected_adjacency()
+
+        nodes = [node] if isinstance(node, str) else node
+        distances = dict.fromkeys((self.index(node) for node in nodes), 0)
+        queue = deque(distances)
+        while queue:
+            index = queue.popleft()
+            if distances[index] == radius:
+                continue
+
+            for neighbour in targets[offsets[index]:offsets[index + 1]]:
+                if neighbour not in distances:
+                    distances[neighbour] = distances[index] + 1
+                    queue.append(neighbour)
+
+        return {self._nodes[index] for index in distances}
+
+    def subgraph(self, nodes):
+        """
+        Returns the subgraph induced by given nodes.
+
+        Parameters
+        ----------
+        nodes : array_like
+            Node names, those not in the graph are ignored.
+
+        Returns
+        -------
+        CompactGraph
+            Subgraph with the given nodes, in the graph order, and the edges
+            between them.
+        """
+
+        indexes = sorted(
+            {self._indexes[node]
+             for node in nodes if node in self._indexes})
+        retained = set(indexes)
+
+        edges = []
+        for source in indexes:
+            for edge in range(self._offsets[source],
+                              self._offsets[source + 1]):
+                target = self._targets[edge]
+                if target in retained:
+                    edges.append((self._nodes[source], self._nodes[target],
+                                  self._edge_data[edge], self._weights[edge]))
+
+        return CompactGraph([self._nodes[index] for index in indexes], edges,
+                            [self._node_types[index] for index in indexes])
+
+    def has_path(self, source, target):
+        return self.shortest_path(source, target) is not None
+
+    def precompute_shortest_paths(self):
+        """
+        Precomputes the breadth-first search predecessors of every node so
+        that :meth:`CompactGraph.shortest_path` and
+        :meth:`CompactGraph.reachable` methods do not search the graph.
+        """
+
+        if self._predecessors is None:
+            self._predecessors = [
+                self._breadth_first_search(source)
+                for source in range(len(self._nodes))
+            ]
+
+    def shortest_path(self, source, target):
+        """
+        Returns the shortest path, in edge count, between given source and
+        target nodes.
+
+        Parameters
+        ----------
+        source : unicode
+            Source node name.
+        target : unicode
+            Target node name.
+
+        Returns
+        -------
+        list or None
+            Node names along the path or *None* if the target is not
+            reachable from the source.
+        """
+
+        source, target = self.index(source), self.index(target)
+        predecessors = (self._predecessors[source]
+                        if self._predecessors is not None else
+                        self._breadth_first_search(source))
+
+        return self._unwind(predecessors, source, target)
+
+    def shortest_paths(self, source):
+        """
+        Returns the shortest paths, in edge count, from given source node to
+        every reachable node with a single breadth-first search.
+
+        Parameters
+        ----------
+        source : unicode
+            Source node name.
+
+        Returns
+        -------
+        dict
+            Node names along the path keyed by reachable node name.
+        """
+
+        index = self.index(source)
+        predecessors = (self._predecessors[index] if self._predecessors
+                        is not None else self._breadth_first_search(index))
+
+        return {
+            self._nodes[target]: self._unwind(predecessors, index, target)
+            for target, predecessor in enumerate(predecessors)
+            if predecessor != -1
+        }
+
+    def reversed(self):
+        """
+        Returns the graph with all its edges reversed.
+
+        Returns
+        -------
+        CompactGraph
+            Reversed graph, the edges keep their data and weight.
+        """
+
+        edges = []
+        for source in range(len(self._nodes)):
+            for edge in range(self._offsets[source],
+                              self._offsets[source + 1]):
+                edges.append((self._nodes[self._targets[edge]],
+                              self._nodes[source], self._edge_data[edge],
+                              self._weights[edge]))
+
+        return CompactGraph(self._nodes, edges, self._node_types)
+
+    def dijkstra_path(self, source, target):
+        """
+        Returns the path with the lowest total weight between given source and
+        target nodes.
+
+        Parameters
+        ----------
+        source : unicode
+            Source node name.
+        target : unicode
+            Target node name.
+
+        Returns
+        -------
+        list or None
+            Node names along the path or *None* if the target is not
+            reachable from the source.
+        """
+
+        source, target = self.index(source), self.index(target)
+        _distances, predecessors = self._dijkstra(source, target)
+
+        return self._unwind(predecessors, source, target)
+
+    def _dijkstra(self,
+                  source,
+                  target=-1,
+                  excluded_nodes=None,
+                  excluded_edges=None,
+                  potentials=None,
+                  limit=float('inf')):
+        # Returns the distances and predecessors arrays of a search from given
+        # source node, stopping once the target node is reached, if any, and
+        # avoiding given nodes and edges. The potentials are lower bounds of
+        # the distance of each node to the target turning the search into an
+        # "A*" search, the nodes with infinite potential or whose distance
+        # lower bound exceeds the limit are not visited.
+        if potentials is None:
+            potentials = array('d', [0]) * len(self._nodes)
+
+        offsets, targets, weights = self._offsets, self._targets, self._weights
+        excluded_nodes = excluded_nodes or ()
+        excluded_edges = excluded_edges or ()
+
+        distances = array('d', [float('inf')]) * len(self._nodes)
+        predecessors = array('l', [-1]) * len(self._nodes)
+        distances[source], predecessors[source] = 0, source
+
+        heap = [(potentials[source], source)]
+        while heap:
+            priority, node = heapq.heappop(heap)
+            if node == target:
+                break
+
+            distance = distances[node]
+            if priority > distance + potentials[node]:
+                continue
+
+            for edge in range(offsets[node], offsets[node + 1]):
+                successor = targets[edge]
+                candidate = distance + weights[edge]
+                if candidate >= distances[successor]:
+                    continue
+
+                priority = candidate + potentials[successor]
+                if priority > limit or priority == float('inf'):
+                    continue
+
+                if successor in excluded_nodes or edge in excluded_edges:
+                    continue
+
+                distances[successor] = candidate
+                predecessors[successor] = node
+                heapq.heappush(heap, (priority, successor))
+
+        return distances, predecessors
+
+    def _spur_path(self, source, target, excluded_nodes, excluded_edges,
+                   potentials, limit=float('inf')):
+        distances, predecessors = self._dijkstra(
+            source, target, excluded_nodes, excluded_edges, potentials, limit)
+
+        if predecessors[target] == -1:
+            return None
+
+        path = [target]
+        while path[-1] != source:
+            path.append(predecessors[path[-1]])
+
+        return distances[target], path[::-1]
+
+    def _k_shortest_paths(self,
+                          source,
+                          target,
+                          k,
+                          potentials=None,
+                          first_path=None):
+        if source == target or k < 1:
+            return []
+
+        if first_path is None:
+            first_path = self._spur_path(source, target, None, None,
+                                         potentials)
+            if first_path is None:
+                return []
+
+        # The paths are stored with the index of the node they deviate from
+        # their parent path at: the spur paths of the root paths ending
+        # before it have already been searched while finding the parent path.
+        paths = [(first_path[0], first_path[1], 0)]
+        candidates = []
+        seen = {tuple(first_path[1])}
+        while len(paths) < k:
+            _weight, previous_path, deviation = paths[-1]
+            root_weight = 0
+            for i in range(len(previous_path) - 1):
+                if i < deviation:
+                    root_weight += self._weights[self._edge(
+                        previous_path[i], previous_path[i + 1])]
+                    continue
+
+                spur_node = previous_path[i]
+                root_path = previous_path[:i + 1]
+
+                # The edges leaving the spur node along the already found
+                # paths sharing the root path and the root path nodes are
+                # removed so that the spur path deviates and is loopless.
+                excluded_edges = {
+                    self._edge(path[i], path[i + 1])
+                    for _weight, path, _deviation in paths
+                    if path[:i + 1] == root_path
+                }
+                # A spur path cannot be kept if enough cheaper candidates
+                # have already been found.
+                limit = float('inf')
+                if len(paths) + len(candidates) >= k:
+                    limit = heapq.nsmallest(k - len(paths),
+                                            candidates)[-1][0] - root_weight
+
+                spur_path = self._spur_path(spur_node, target,
+                                            set(root_path[:-1]),
+                                            excluded_edges, potentials, limit)
+
+                if spur_path is not None:
+                    path = root_path[:-1] + spur_path[1]
+                    if tuple(path) not in seen:
+                        seen.add(tuple(path))
+                        heapq.heappush(candidates,
+                                       (root_weight + spur_path[0], len(path),
+                                        path, i))
+
+                root_weight += self._weights[self._edge(
+                    spur_node, previous_path[i + 1])]
+
+            if not candidates:
+                break
+
+            weight, _length, path, deviation = heapq.heappop(candidates)
+            paths.append((weight, path, deviation))
+
+        return [(weight, [self._nodes[node] for node in path])
+                for weight, path, _deviation in paths]
+
+    def k_shortest_paths(self, source, target, k):
+        """
+        Returns the *k* loopless paths with the lowest total weight between
+        given source and target nodes using *Yen* algorithm.
+
+        Parameters
+        ----------
+        source : unicode
+            Source node name.
+        target : unicode
+            Target node name.
+        k : int
+            Maximum path count.
+
+        Returns
+        -------
+        list
+            *(weight, path)* tuples sorted by increasing total weight where
+            *path* is the list of node names along the path.
+        """
+
+        return self._k_shortest_paths(self.index(source), self.index(target),
+                                      k)
+
+    def all_k_shortest_paths(self, k):
+        """
+        Yields the *k* loopless paths with the lowest total weight between
+        every pair of distinct nodes connected by a path.
+
+        The distances of all the nodes to each target are computed once on
+        the reversed graph and used as exact lower bounds by the *Yen*
+        algorithm searches, which then only visit the nodes leading to the
+        target.
+
+        Parameters
+        ----------
+        k : int
+            Maximum path count per pair of nodes.
+
+        Yields
+        ------
+        tuple
+            *(source, target, paths)* tuples where *paths* is as returned by
+            :meth:`CompactGraph.k_shortest_paths` method.
+        """
+
+        reversed_graph = self.reversed()
+        for target in range(len(self._nodes)):
+            # The reversed graph search also gives the shortest path of every
+            # node to the target, i.e. the first path of each pair.
+            potentials, successors = reversed_graph._dijkstra(target)
+            for source in range(len(self._nodes)):
+                if source == target or successors[source] == -1:
+                    continue
+
+                first_path = [source]
+                while first_path[-1] != target:
+                    first_path.append(successors[first_path[-1]])
+
+                yield (self._nodes[source], self._nodes[target],
+                       self._k_shortest_paths(source, target, k, potentials,
+                                              (potentials[source],
+                                               first_path)))
+
+    def reweighted(self, weighter):
+        """
+        Returns the graph with the weight of each edge computed from its
+        data.
+
+        Parameters
+        ----------
+        weighter : callable
+            Callable receiving the data of an edge, e.g. a
+            :class:`discover_aces_dev.CTLTransform` class instance, and
+            returning its weight.
+
+        Returns
+        -------
+        CompactGraph
+            Graph sharing the nodes and edges of the graph.
+        """
+
+        return CompactGraph.from_csr(
+            self._nodes, self._node_types, self._offsets, self._targets,
+            array('d', [weighter(data) for data in self._edge_data]),
+            self._edge_data)
+
+    def to_networkx(self):
+        """
+        Exports the graph to a *NetworkX* directed graph.
+
+        Returns
+        -------
+        DiGraph
+            *NetworkX* directed graph, the node types are stored in the
+            *ctl_transform_type* node attribute, the edge data in the
+            *ctl_transform* edge attribute and the edge weights in the
+            *weight* edge attribute.
+        """
+
+        is_networkx_installed(raise_exception=True)
+
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        for node, node_type in zip(self._nodes, self._node_types):
+            graph.add_node(node, ctl_transform_type=node_type)
+
+        for source in range(len(self._nodes)):
+            for edge in range(self._offsets[source],
+                              self._offsets[source + 1]):
+                graph.add_edge(
+                    self._nodes[source],
+                    self._nodes[self._targets[edge]],
+                    ctl_transform=self._edge_data[edge],
+                    weight=self._weights[edge])
+
+        return graph
@@ -0,0 +1,493 @@
+# -*- coding: utf-8 -*-
+
+import re
+from collections import namedtuple
+
+__all__ = [
+    'CTLSyntaxError', 'Token', 'tokenize_ctl', 'Program', 'Import', 'Struct',
+    'Field', 'Function', 'Parameter', 'Declaration', 'Declarator', 'Block',
+    'If', 'For', 'While', 'Return', 'ExpressionStatement', 'Literal', 'Name',
+    'Unary', 'Binary', 'Conditional', 'Assignment', 'Increment', 'Call',
+    'Index', 'Member', 'InitializerList', 'parse_ctl'
+]
+
+
+class CTLSyntaxError(SyntaxError):
+    """
+    Exception raised when *CTL* code cannot be parsed.
+    """
+
+
+Token = namedtuple('Token', ('kind', 'value', 'line'))
+
+_PATTERN_TOKEN = re.compile(
+    r'''
+    (?P<space>\s+)
+    |(?P<comment>//[^\n]*|/\*.*?\*/)
+    |(?P<number>(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?[fF]?)
+    |(?P<string>"(?:[^"\\]|\\.)*")
+    |(?P<name>[A-Za-z_]\w*)
+    |(?P<operator>\|\||&&|==|!=|<=|>=|\+\+|--|[-+*/%]=
+                  |[-+*/%<>=!{}()\[\];,.?:])
+    ''', re.VERBOSE | re.DOTALL)
+
+Program = namedtuple('Program', ('imports', 'definitions'))
+Import = namedtuple('Import', ('module', ))
+Struct = namedtuple('Struct', ('name', 'fields'))
+Field = namedtuple('Field', ('type', 'name', 'dimensions'))
+Function = namedtuple(
+    'Function',
+    ('return_type', 'return_dimensions', 'name', 'parameters', 'body'))
+Parameter = namedtuple(
+    'Parameter', ('qualifiers', 'type', 'name', 'dimensions', 'default'))
+Declaration = namedtuple('Declaration', ('const', 'type', 'declarators'))
+Declarator = namedtuple('Declarator', ('name', 'dimensions', 'initializer'))
+Block = namedtuple('Block', ('statements', ))
+If = namedtuple('If', ('condition', 'then', 'otherwise'))
+For = namedtuple('For', ('initialisation', 'condition', 'step', 'body'))
+While = namedtuple('While', ('condition', 'body'))
+Return = namedtuple('Return', ('value', ))
+ExpressionStatement = namedtuple('ExpressionStatement', ('expression', ))
+Literal = namedtuple('Literal', ('value', ))
+Name = namedtuple('Name', ('name', ))
+Unary = namedtuple('Unary', ('operator', 'operand'))
+Binary = namedtuple('Binary', ('operator', 'left', 'right'))
+Conditional = namedtuple('Conditional',
+                         ('condition', 'consequent', 'alternative'))
+Assignment = namedtuple('Assignment', ('operator', 'target', 'value'))
+Increment = namedtuple('Increment', ('operator', 'target', 'prefix'))
+Call = namedtuple('Call', ('name', 'arguments'))
+Index = namedtuple('Index', ('value', 'index'))
+Member = namedtuple('Member', ('value', 'name'))
+InitializerList = namedtuple('InitializerList', ('elements', ))
+
+_QUALIFIERS = ('input', 'output', 'varying', 'uniform')
+
+_BINARY_OPERATORS = [
+    ('||', ),
+    ('&&', ),
+    ('==', '!='),
+    ('<', '>', '<=', '>='),
+    ('+', '-'),
+    ('*', '/', '%'),
+]
+
+_ASSIGNMENT_OPERATORS = ('=', '+=', '-=', '*=', '/=', '%=')
+
+
+def tokenize_ctl(code):
+    """
+    Tokenizes given *CTL* code.
+
+    Parameters
+    ----------
+    code : unicode
+        *CTL* code.
+
+    Returns
+    -------
+    list
+        :class:`Token` class instances, comments and whitespaces excluded.
+
+    Raises
+    ------
+    CTLSyntaxError
+        If an unexpected character is encountered.
+    """
+
+    tokens = []
+    position, line = 0, 1
+    while position < len(code):
+        match = _PATTERN_TOKEN.match(code, position)
+        if match is None:
+            raise CTLSyntaxError(
+                f'Unexpected "{code[position]}" character at line {line}!')
+
+        kind, value = match.lastgroup, match.group()
+        if kind == 'number':
+            number = value.rstrip('fF')
+            value = (int(number) if re.fullmatch(r'\d+', number) else
+                     float(number))
+            tokens.append(Token(kind, value, line))
+        elif kind == 'string':
+            tokens.append(Token(kind, value[1:-1], line))
+        elif kind in ('name', 'operator'):
+            tokens.append(Token(kind, value, line))
+
+        line += match.group().count('\n')
+        position = match.end()
+
+    tokens.append(Token('end', None, line))
+
+    return tokens
+
+
+class _Parser:
+    def __init__(self, code):
+        self._tokens = tokenize_ctl(code)
+        self._position = 0
+
+    def _peek(self, offset=0):
+        return self._tokens[min(self._position + offset,
+                                len(self._tokens) - 1)]
+
+    def _next(self):
+        token = self._tokens[self._position]
+        self._position += 1
+
+        return token
+
+    def _is(self, value, offset=0):
+        token = self._peek(offset)
+
+        return token.kind in ('name', 'operator') and token.value == value
+
+    def _accept(self, value):
+        if self._is(value):
+            return self._next()
+
+        return None
+
+    def _expect(self, value):
+        token = self._next()
+        if token.kind not in ('name', 'operator') or token.value != value:
+            raise CTLSyntaxError(f'Expected "{value}" but got "{token.value}" '
+                                 f'at line {token.line}!')
+
+        return token
+
+    def _name(self):
+        token = self._next()
+        if token.kind != 'name':
+            raise CTLSyntaxError(f'Expected a name but got "{token.value}" '
+                                 f'at line {token.line}!')
+
+        return token.value
+
+    def _dimensions(self):
+        dimensions = []
+        while self._accept('['):
+            if self._accept(']'):
+                dimensions.append(None)
+            else:
+                dimensions.append(self._expression())
+                self._expect(']')
+
+        return dimensions
+
+    def _is_declaration(self):
+        # Two consecutive names, e.g. "float x" or "Chromaticities c", can
+        # only start a declaration, this avoids tracking the type names.
+        if self._is('const'):
+            return True
+
+        return self._peek().kind == 'name' and self._peek(1).kind == 'name'
+
+    def parse(self):
+        imports, definitions = [], []
+        while self._peek().kind != 'end':
+            if self._accept(';'):
+                continue
+
+            if self._accept('import'):
+                token = self._next()
+                if token.kind != 'string':
+                    raise CTLSyntaxError(
+                        f'Expected a module name at line {token.line}!')
+
+                imports.append(Import(token.value))
+                self._expect(';')
+            elif self._accept('struct'):
+                definitions.append(self._struct())
+            elif self._is_function():
+                definitions.append(self._function())
+            else:
+                definitions.append(self._declaration())
+
+        return Program(imports, definitions)
+
+    def _struct(self):
+        name = self._name()
+        fields = []
+        self._expect('{')
+        while not self._accept('}'):
+            type_ = self._name()
+            while True:
+                fields.append(Field(type_, self._name(), self._dimensions()))
+                if not self._accept(','):
+                    break
+
+            self._expect(';')
+        self._accept(';')
+
+        return Struct(name, fields)
+
+    def _is_function(self):
+        offset = 1
+        while self._is('[', offset):
+            while not self._is(']', offset):
+                token = self._peek(offset)
+                if token.kind == 'end':
+                    raise CTLSyntaxError(
+                        f'Expected "]" but got the end of the code at line '
+                        f'{token.line}!')
+
+                offset += 1
+            offset += 1
+
+        return (self._peek(offset).kind == 'name' and
+                self._is('(', offset + 1))
+
+    def _function(self):
+        return_type = self._name()
+        return_dimensions = self._dimensions()
+        name = self._name()
+        self._expect('(')
+        parameters = []
+        while not self._accept(')'):
+            qualifiers = set()
+            while self._peek().value in _QUALIFIERS:
+                qualifiers.add(self._next().value)
+
+            type_ = self._name()
+            parameter_name = self._name()
+            dimensions = self._dimensions()
+            default = self._expression() if self._accept('=') else None
+            parameters.append(
+                Parameter(qualifiers, type_, parameter_name, dimensions,
+                          default))
+            if not self._accept(','):
+                self._expect(')')
+                break
+
+        return Function(return_type, return_dimensions, name, parameters,
+                        self._block())
+
+    def _declaration(self, terminated=True):
+        const = bool(self._accept('const'))
+        type_ = self._name()
+        if type_ == 'unsigned' and self._is('int'):
+            self._next()
+
+        declarators = []
+        while True:
+            name = self._name()
+            dimensions = self._dimensions()
+            initializer = self._initializer() if self._accept('=') else None
+            declarators.append(Declarator(name, dimensions, initializer))
+            if not self._accept(','):
+                break
+
+        if terminated:
+            self._expect(';')
+
+        return Declaration(const, type_, declarators)
+
+    def _initializer(self):
+        if self._accept('{'):
+            elements = []
+            while not self._accept('}'):
+                elements.append(self._initializer())
+                if not self._accept(','):
+                    self._expect('}')
+                    break
+
+            return InitializerList(elements)
+
+        return self._expression()
+
+    def _block(self):
+        self._expect('{')
+        statements = []
+        while not self._accept('}'):
+            statements.append(self._statement())
+
+        return Block(statements)
+
+    def _statement(self):
+        if self._is('{'):
+            return self._block()
+
+        if self._accept(';'):
+            return Block([])
+
+        if self._accept('if'):
+            self._expect('(')
+            condition = self._expression()
+            self._expect(')')
+            then = self._statement()
+            otherwise = self._statement() if self._accept('else') else None
+
+            return If(condition, then, otherwise)
+
+        if self._accept('for'):
+            self._expect('(')
+            initialisation = None
+            if not self._is(';'):
+                initialisation = (self._declaration(False)
+                                  if self._is_declaration() else
+                                  ExpressionStatement(self._expression()))
+            self._expect(';')
+            condition = None if self._is(';') else self._expression()
+            self._expect(';')
+            step = None if self._is(')') else self._expression()
+            self._expect(')')
+
+            return For(initialisation, condition, step, self._statement())
+
+        if self._accept('while'):
+            self._expect('(')
+            condition = self._expression()
+            self._expect(')')
+
+            return While(condition, self._statement())
+
+        if self._accept('return'):
+            value = None if self._is(';') else self._expression()
+            self._expect(';')
+
+            return Return(value)
+
+        if self._is_declaration():
+            return self._declaration()
+
+        expression = self._expression()
+        self._expect(';')
+
+        return ExpressionStatement(expression)
+
+    def _expression(self):
+        target = self._conditional()
+
+        token = self._peek()
+        if token.kind == 'operator' and token.value in _ASSIGNMENT_OPERATORS:
+            self._next()
+            if not isinstance(target, (Name, Index, Member)):
+                raise CTLSyntaxError(
+                    f'Invalid assignment target at line {token.line}!')
+
+            return Assignment(token.value, target, self._expression())
+
+        return target
+
+    def _conditional(self):
+        condition = self._binary(0)
+        if self._accept('?'):
+            consequent = self._expression()
+            self._expect(':')
+
+            return Conditional(condition, consequent, self._conditional())
+
+        return condition
+
+    def _binary(self, level):
+        if level == len(_BINARY_OPERATORS):
+            return self._unary()
+
+        left = self._binary(level + 1)
+        while True:
+            token = self._peek()
+            if (token.kind != 'operator' or
+                    token.value not in _BINARY_OPERATORS[level]):
+                return left
+
+            self._next()
+            left = Binary(token.value, left, self._binary(level + 1))
+
+    def _unary(self):
+        token = self._peek()
+        if token.kind == 'operator' and token.value in ('-', '+', '!'):
+            self._next()
+
+            return Unary(token.value, self._unary())
+
+        if token.kind == 'operator' and token.value in ('++', '--'):
+            self._next()
+
+            return Increment(token.value, self._unary(), True)
+
+        return self._postfix()
+
+    def _postfix(self):
+        expression = self._primary()
+        while True:
+            if self._accept('['):
+                expression = Index(expression, self._expression())
+                self._expect(']')
+            elif self._accept('.'):
+                expression = Member(expression, self._name())
+            elif self._is('++') or self._is('--'):
+                expression = Increment(self._next().value, expression,
+                                       False)
+            else:
+                return expression
+
+    def _primary(self):
+        token = self._next()
+
+        if token.kind in ('number', 'string'):
+            return Literal(token.value)
+
+        if token.kind == 'name':
+            if token.value in ('true', 'false'):
+                return Literal(token.value == 'true')
+
+            if self._accept('('):
+                arguments = []
+                while not self._accept(')'):
+                    arguments.append(self._initializer())
+                    if not self._accept(','):
+                        self._expect(')')
+                        break
+
+                return Call(token.value, arguments)
+
+            return Name(token.value)
+
+        if token.value == '(':
+            expression = self._expression()
+            self._expect(')')
+
+            return expression
+
+        if token.value == '{':
+            self._position -= 1
+
+            return self._initializer()
+
+        raise CTLSyntaxError(
+            f'Unexpected "{token.value}" token at line {token.line}!')
+
+
+def parse_ctl(code):
+    """
+    Parses given *CTL* code into an abstract syntax tree.
+
+    The supported subset covers the constructs used by the *aces-dev*
+    transforms: imports, structs, constants, functions with array return
+    types and qualified parameters, declarations, assignments, *if*, *for*
+    and *while* statements and the *C* operators.
+
+    Parameters
+    ----------
+    code : unicode
+        *CTL* code.
+
+    Returns
+    -------
+    Program
+        Abstract syntax tree.
+
+    Raises
+    ------
+    CTLSyntaxError
+        If the code cannot be parsed.
+
+    Examples
+    --------
+    >>> program = parse_ctl('import "ACESlib.Utilities"; const float X = 1.0;')
+    >>> program.imports
+    [Import(module='ACESlib.Utilities')]
+    """
+
+    return _Parser(code).parse()
@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+
+from discover_aces_dev.client import DAEMON_ADDRESS, _parse_address
+from discover_aces_dev.discover import (
+    REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT, classify_aces_ctl_transforms,
+    discover_aces_ctl)
+from discover_aces_dev.graph import (CONVERSION_GRAPH_FILTERERS,
+                                     _build_compact_graph)
+from discover_aces_dev.index import TransformIndex
+from discover_aces_dev.instrumentation import count, timer
+from discover_aces_dev.search import SearchIndex
+
+__all__ = ['QueryDaemon', 'serve']
+
+
+def _serialize_ctl_transform(ctl_transform):
+    return dict(ctl_transform.metadata, path=ctl_transform.path)
+
+
+class _Catalogue:
+    # Classified "CTL" transforms with their index, search index and
+    # conversion graph, built once and shared by all the requests.
+
+    def __init__(self, classified_ctl_transforms, root_directory,
+                 graph_filterers):
+        self.classified_ctl_transforms = classified_ctl_transforms
+
+        with timer('daemon_build'):
+            self.index = TransformIndex(classified_ctl_transforms)
+            self.search_index = SearchIndex(classified_ctl_transforms)
+
+            # The graph is built as by "get_compact_conversion_graph", the
+            # filterers being applied at discovery time, but not memoized so
+            # that it reflects the reloaded transforms.
+            self.graph = _build_compact_graph(root_directory, graph_filterers)
+            self.graph.precompute_shortest_paths()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    # Answers the JSON lines requests of a connection until it is closed so
+    # that the clients can keep their connection alive.
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+
+            self.wfile.write(self.server.query_daemon.handle(line))
+            self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingMixIn,
+                  socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class QueryDaemon:
+    """
+    Resident daemon keeping the classified *CTL* transforms, their indexes
+    and the automatic colour conversion graph in memory and answering
+    queries over a *Unix* domain socket or a localhost *TCP* socket.
+
+    The protocol is line delimited *JSON*: each request is an object with
+    *id*, *method* and *params* keys, and each response an object with the
+    request *id* and either a *result* or an *error* key. The methods are:
+
+    -   *ping*: Returns *pong*.
+    -   *lookup*: Returns the *CTL* transforms matching the criteria given as
+        parameters, see :meth:`discover_aces_dev.TransformIndex.query`
+        method.
+    -   *path*: Returns the chain of *CTL* transforms converting from the
+        *source* to the *target* colourspace.
+    -   *search*: Returns the *CTL* transforms matching the *query*, with
+        their *score*, see :meth:`discover_aces_dev.SearchIndex.search`
+        method.
+    -   *reload*: Discovers and classifies the *CTL* transforms again.
+    -   *shutdown*: Stops the daemon.
+
+    The *CTL* transforms are returned as their metadata and path.
+
+    Parameters
+    ----------
+    address : unicode or tuple, optional
+        *Unix* domain socket path or *(host, port)* tuple to listen on.
+    root_directory : unicode, optional
+        Root directory to discover the *CTL* transforms from.
+    filterers : array_like, optional
+        Callables receiving a filename and returning whether the file should
+        be kept.
+    rules : DiscoveryRules, optional
+        Declarative rules pruning the directories and excluding *CTL*
+        transforms.
+    graph_filterers : array_like, optional
+        Filterers discovering the conversion graph *CTL* transforms as with
+        :func:`discover_aces_dev.get_compact_conversion_graph` definition,
+        defaults to :attr:`discover_aces_dev.CONVERSION_GRAPH_FILTERERS`.
+    watch : bool, optional
+        Whether to keep the catalogue up-to-date with a
+        :class:`discover_aces_dev.LiveCatalogue` class instance rather than
+        on *reload* requests.
+
+    Examples
+    --------
+    >>> QueryDaemon().serve_forever()  # doctest: +SKIP
+    """
+
+    def __init__(self,
+                 address=DAEMON_ADDRESS,
+                 root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
+                 filterers=None,
+                 rules=None,
+                 graph_filterers=None,
+                 watch=False):
+        self._address = _parse_address(address)
+        self._root_directory = root_directory
+        self._filterers = filterers
+        self._rules = rules
+        self._graph_filterers = (graph_filterers
+                                 if graph_filterers is not None else
+                                 CONVERSION_GRAPH_FILTERERS)
+
+        self._lock = threading.RLock()
+        self._catalogue = None
+        self._live_catalogue = None
+        self._watch_thread = None
+        self._stop_event = threading.Event()
+
+        if watch:
+            from discover_aces_dev.watch import LiveCatalogue
+
+            self._live_catalogue = LiveCatalogue(
+                root_directory,
+                filterers,
+                rules,
+                callbacks=[lambda event: self._invalidate()])
+            self._watch_thread = threading.Thread(
+                target=self._live_catalogue.run,
+                args=(self._stop_event, ),
+                daemon=True)
+
+        self._methods = {
+            'ping': self._ping,
+            'lookup': self._lookup,
+            'path': self._path,
+            'search': self._search,
+            'reload': self._reload,
+            'shutdown': self._shutdown,
+        }
+
+        self._catalogue = self._build_catalogue()
+        self._server = self._create_server()
+
+    @property
+    def address(self):
+        return self._address
+
+    @property
+    def catalogue(self):
+        with self._lock:
+            if self._catalogue is None:
+                self._catalogue = self._build_catalogue()
+
+            return self._catalogue
+
+    def _build_catalogue(self):
+        if self._live_catalogue is not None:
+            classified_ctl_transforms = (
+                self._live_catalogue.classified_ctl_transforms)
+        else:
+            classified_ctl_transforms = classify_aces_ctl_transforms(
+                discover_aces_ctl(self._root_directory, self._filterers,
+                                  self._rules))
+
+        return _Catalogue(classified_ctl_transforms, self._root_directory,
+                          self._graph_filterers)
+
+    def _invalidate(self):
+        with self._lock:
+            self._catalogue = None
+
+    def _create_server(self):
+        if isinstance(self._address, tuple):
+            server = _TCPServer(self._address, _RequestHandler)
+            # The port might have been chosen by the system.
+            self._address = server.server_address[:2]
+        else:
+            # A socket file left by a daemon that did not exit cleanly is
+            # removed, a running daemon is never replaced.
+            if os.path.exists(self._address):
+                probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                try:
+                    probe.connect(self._address)
+                except OSError:
+                    os.remove(self._address)
+                else:
+                    raise OSError(f'"{self._address}" daemon is already '
+                                  f'running!')
+                finally:
+                    probe.close()
+
+            server = _UnixServer(self._address, _RequestHandler)
+
+        server.query_daemon = self
+
+        return server
+
+    def _ping(self):
+        return 'pong'
+
+    def _lookup(self, **criteria):
+        return [
+            _serialize_ctl_transform(ctl_transform)
+            for ctl_transform in self.catalogue.index.query(**criteria)
+        ]
+
+    def _path(self, source, target):
+        graph = self.catalogue.graph
+
+        path = None
+        if source in graph and target in graph:
+            path = graph.shortest_path(source, target)
+
+        if path is None:
+            raise ValueError(
+                f'No conversion path exists from "{source}" to "{target}"!')
+
+        return [
+            _serialize_ctl_transform(ctl_transform)
+            for ctl_transform in graph.path_edge_data(path)
+        ]
+
+    def _search(self, query, mode='prefix', limit=None):
+        return [
+            dict(_serialize_ctl_transform(ctl_transform), score=score)
+            for ctl_transform, score in self.catalogue.search_index.search(
+                query, mode, limit)
+        ]
+
+    def _reload(self):
+        catalogue = self._build_catalogue()
+        with self._lock:
+            self._catalogue = catalogue
+
+        return len(catalogue.index)
+
+    def _shutdown(self):
+        # "shutdown" blocks until the serving loop exits, thus it cannot be
+        # called from the thread answering the request.
+        threading.Thread(target=self.shutdown, daemon=True).start()
+
+        return True
+
+    def handle(self, line):
+        """
+        Answers given request line.
+
+        Parameters
+        ----------
+        line : bytes
+            *JSON* encoded request.
+
+        Returns
+        -------
+        bytes
+            *JSON* encoded response line.
+        """
+
+        count('daemon_requests')
+
+        identifier = None
+        try:
+            request = json.loads(line)
+            identifier = request.get('id')
+
+            method = self._methods.get(request.get('method'))
+            if method is None:
+                raise ValueError(
+                    f'"{request.get("method")}" method is invalid, it must '
+                    f'be one of {sorted(self._methods)}!')
+
+            with timer(f'daemon_{request["method"]}'):
+                response = {
+                    'id': identifier,
+                    'result': method(**request.get('params') or {})
+                }
+        except Exception as error:
+            logging.debug('Request failed: %s', error, exc_info=True)
+            response = {
+                'id': identifier,
+                'error': f'{error.__class__.__name__}: {error}'
+            }
+
+        return json.dumps(response, separators=(',', ':')).encode() + b'\n'
+
+    def serve_forever(self):
+        """
+        Answers the requests until :meth:`QueryDaemon.shutdown` method is
+        called or a *shutdown* request is received.
+        """
+
+        if self._watch_thread is not None:
+            self._watch_thread.start()
+
+        logging.info('Serving on "%s".', self._address)
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self):
+        """
+        Stops the serving loop.
+        """
+
+        self._server.shutdown()
+
+    def close(self):
+        """
+        Closes the server socket and stops watching the transforms.
+        """
+
+        self._stop_event.set()
+        self._server.server_close()
+
+        if not isinstance(self._address, tuple):
+            try:
+                os.remove(self._address)
+            except OSError:
+                pass
+
+        if self._live_catalogue is not None:
+            if self._watch_thread.is_alive():
+                self._watch_thread.join()
+
+            self._live_catalogue.close()
+
+
+def serve(address=DAEMON_ADDRESS,
+          root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
+          filterers=None,
+          rules=None,
+          watch=False):
+    """
+    Serves the queries on given address until a *shutdown* request is
+    received, see :class:`QueryDaemon` class.
+
+    Parameters
+    ----------
+    address : unicode or tuple, optional
+        *Unix* domain socket path or *(host, port)* tuple to listen on.
+    root_directory : unicode, optional
+        Root directory to discover the *CTL* transforms from.
+    filterers : array_like, optional
+        Callables receiving a filename and returning whether the file should
+        be kept.
+    rules : DiscoveryRules, optional
+        Declarative rules pruning the directories and excluding *CTL*
+        transforms.
+    watch : bool, optional
+        Whether to keep the catalogue up-to-date with the filesystem.
+    """
+
+    QueryDaemon(address, root_directory, filterers, rules,
+                watch=watch).serve_forever()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from rich.logging import RichHandler
+
+    logging.basicConfig(
+        level=logging.INFO, datefmt="[%X] ", handlers=[RichHandler()])
+
+    parser = argparse.ArgumentParser(
+        description='Serves the "discover-aces-dev" queries.')
+    parser.add_argument(
+        'root_directory',
+        nargs='?',
+        default=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT)
+    parser.add_argument('--address', default=DAEMON_ADDRESS)
+    parser.add_argument('--watch', action='store_true')
+    arguments = parser.parse_args()
+
+    serve(arguments.address, arguments.root_directory, watch=arguments.watch)
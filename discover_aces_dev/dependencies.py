@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import os
+import threading
+from collections import defaultdict, deque
+
+from discover_aces_dev.common import is_networkx_installed
+from discover_aces_dev.discover import (
+    REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT, classify_aces_ctl_transforms,
+    discover_aces_ctl)
+
+__all__ = [
+    'DependencyGraph', 'get_dependency_graph', 'invalidate_dependency_graph'
+]
+
+_DEPENDENCY_GRAPHS = {}
+
+_DEPENDENCY_GRAPHS_LOCK = threading.RLock()
+
+
+def _module_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+class DependencyGraph:
+    """
+    Directed acyclic graph of the *CTL* transforms *import* statements, e.g.
+    an *ODT* importing the *ACESlib.Transform_Common* and
+    *ACESlib.Utilities* modules.
+
+    The imported modules are resolved against the basenames of the given
+    *CTL* transforms, the imports that cannot be resolved are retained in
+    :meth:`DependencyGraph.unresolved_imports` method.
+
+    Parameters
+    ----------
+    ctl_transforms : array_like
+        :class:`discover_aces_dev.CTLTransform` class instances, including the
+        library modules they import.
+
+    Examples
+    --------
+    >>> dependency_graph = get_dependency_graph()  # doctest: +SKIP
+    >>> dependency_graph.affected(['lib/ACESlib.Tonescales.ctl'])
+    ... # doctest: +SKIP
+    [CTLTransform('Tonescales', 'ACESlib.Tonescales.ctl'), \
+CTLTransform('None', 'RRT.ctl'), ...]
+    """
+
+    def __init__(self, ctl_transforms):
+        self._ctl_transforms = {}
+        for ctl_transform in ctl_transforms:
+            self._ctl_transforms[os.path.normpath(
+                ctl_transform.path)] = ctl_transform
+
+        self._modules = {}
+        for path in self._ctl_transforms:
+            module = _module_name(path)
+            if module in self._modules:
+                logging.warning('"%s" module is ambiguous, "%s" is ignored!',
+                                module, path)
+                continue
+
+            self._modules[module] = path
+
+        self._dependencies = {}
+        self._dependants = defaultdict(list)
+        self._unresolved_imports = {}
+        for path, ctl_transform in self._ctl_transforms.items():
+            dependencies = []
+            for module in ctl_transform.imports:
+                dependency = self._modules.get(module)
+                if dependency is None:
+                    self._unresolved_imports.setdefault(path,
+                                                        []).append(module)
+                    continue
+
+                dependencies.append(dependency)
+                self._dependants[dependency].append(path)
+
+            self._dependencies[path] = dependencies
+
+        self._order = None
+
+    def __len__(self):
+        return len(self._ctl_transforms)
+
+    def __contains__(self, path):
+        return os.path.normpath(path) in self._ctl_transforms
+
+    def _path(self, path):
+        path = os.path.normpath(path)
+        if path in self._ctl_transforms:
+            return path
+
+        # Files outside the graph, e.g. a library from another checkout, are
+        # matched by module name.
+        return self._modules.get(_module_name(path))
+
+    def ctl_transform(self, path):
+        return self._ctl_transforms[os.path.normpath(path)]
+
+    def unresolved_imports(self):
+        """
+        Returns the imports that could not be resolved.
+
+        Returns
+        -------
+        dict
+            Unresolved module names keyed by importing *CTL* transform path.
+        """
+
+        return dict(self._unresolved_imports)
+
+    def dependencies(self, path):
+        """
+        Returns the *CTL* transforms directly imported by given *CTL*
+        transform.
+
+        Parameters
+        ----------
+        path : unicode
+            *CTL* transform path.
+
+        Returns
+        -------
+        list
+            Imported *CTL* transforms.
+        """
+
+        return [
+            self._ctl_transforms[dependency]
+            for dependency in self._dependencies[os.path.normpath(path)]
+        ]
+
+    def dependants(self, path):
+        """
+        Returns the *CTL* transforms directly importing given *CTL* transform.
+
+        Parameters
+        ----------
+        path : unicode
+            *CTL* transform path.
+
+        Returns
+        -------
+        list
+            Importing *CTL* transforms.
+        """
+
+        return [
+            self._ctl_transforms[dependant]
+            for dependant in self._dependants.get(os.path.normpath(path), [])
+        ]
+
+    def topological_order(self):
+        """
+        Returns the *CTL* transforms paths sorted so that every module comes
+        before the *CTL* transforms importing it.
+
+        Returns
+        -------
+        list
+            Sorted *CTL* transforms paths.
+
+        Raises
+        ------
+        ValueError
+            If the imports are cyclic.
+        """
+
+        if self._order is not None:
+            return self._order
+
+        in_degrees = {
+            path: len(dependencies)
+            for path, dependencies in self._dependencies.items()
+        }
+        queue = deque(path for path, in_degree in in_degrees.items()
+                      if in_degree == 0)
+        order = []
+        while queue:
+            path = queue.popleft()
+            order.append(path)
+            for dependant in self._dependants.get(path, []):
+                in_degrees[dependant] -= 1
+                if in_degrees[dependant] == 0:
+                    queue.append(dependant)
+
+        if len(order) != len(in_degrees):
+            cycle = sorted(path for path, in_degree in in_degrees.items()
+                           if in_degree > 0)
+            raise ValueError(f'{cycle} CTL transforms have cyclic imports!')
+
+        self._order = order
+
+        return order
+
+    def affected(self, changed_paths):
+        """
+        Returns the minimal set of *CTL* transforms affected by given changed
+        files, i.e. the changed files and the *CTL* transforms importing them
+        directly or transitively, in topological order.
+
+        Parameters
+        ----------
+        changed_paths : array_like
+            Changed *CTL* files paths, those unknown to the graph are matched
+            by module name and ignored if they do not match any module.
+
+        Returns
+        -------
+        list
+            Affected *CTL* transforms, every module coming before the *CTL*
+            transforms importing it.
+        """
+
+        affected = set()
+        queue = deque()
+        for path in changed_paths:
+            path = self._path(path)
+            if path is not None and path not in affected:
+                affected.add(path)
+                queue.append(path)
+
+        while queue:
+            for dependant in self._dependants.get(queue.popleft(), []):
+                if dependant not in affected:
+                    affected.add(dependant)
+                    queue.append(dependant)
+
+        return [
+            self._ctl_transforms[path] for path in self.topological_order()
+            if path in affected
+        ]
+
+    def to_networkx(self):
+        """
+        Exports the graph to a *NetworkX* directed graph whose edges go from
+        the modules to the *CTL* transforms importing them.
+
+        Returns
+        -------
+        DiGraph
+            *NetworkX* directed graph, the *CTL* transforms are stored in the
+            *ctl_transform* node attribute.
+        """
+
+        is_networkx_installed(raise_exception=True)
+
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        for path, ctl_transform in self._ctl_transforms.items():
+            graph.add_node(path, ctl_transform=ctl_transform)
+
+        for path, dependencies in self._dependencies.items():
+            for dependency in dependencies:
+                graph.add_edge(dependency, path)
+
+        return graph
+
+
+def _dependency_graph_key(root_directory, filterers):
+    return (os.path.normpath(os.path.expandvars(root_directory)),
+            tuple(filterers or []))
+
+
+def get_dependency_graph(
+        root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
+        filterers=None):
+    """
+    Returns the *CTL* import dependency graph for given transforms root
+    directory and filterers.
+
+    The graph is built on first request and memoized per root directory and
+    filterers combination until :func:`invalidate_dependency_graph`
+    definition is called.
+
+    Parameters
+    ----------
+    root_directory : unicode, optional
+        Transforms root directory.
+    filterers : array_like, optional
+        Filterers passed to :func:`discover_aces_dev.discover_aces_ctl`
+        definition.
+
+    Returns
+    -------
+    DependencyGraph
+        *CTL* import dependency graph.
+    """
+
+    from discover_aces_dev.graph import _unclassify_ctl_transforms
+
+    key = _dependency_graph_key(root_directory, filterers)
+    with _DEPENDENCY_GRAPHS_LOCK:
+        graph = _DEPENDENCY_GRAPHS.get(key)
+        if graph is None:
+            graph = _DEPENDENCY_GRAPHS[key] = DependencyGraph(
+                _unclassify_ctl_transforms(
+                    classify_aces_ctl_transforms(
+                        discover_aces_ctl(key[0], list(key[1])))))
+
+    return graph
+
+
+def invalidate_dependency_graph(root_directory=None, filterers=None):
+    """
+    Invalidates the memoized *CTL* import dependency graphs.
+
+    Parameters
+    ----------
+    root_directory : unicode, optional
+        Transforms root directory of the graph to invalidate, all the graphs
+        are invalidated if *None*.
+    filterers : array_like, optional
+        Filterers of the graph to invalidate.
+    """
+
+    with _DEPENDENCY_GRAPHS_LOCK:
+        if root_directory is None:
+            _DEPENDENCY_GRAPHS.clear()
+        else:
+            _DEPENDENCY_GRAPHS.pop(
+                _dependency_graph_key(root_directory, filterers), None)
@@ -1,17 +1,23 @@
 # -*- coding: utf-8 -*-
-import itertools
+import fnmatch
 import logging
 import os
 import re
 from collections import defaultdict
+from concurrent.futures import (Executor, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
 
-from discover_aces_dev.common import paths_common_ancestor, vivified_to_dict
+from discover_aces_dev.common import vivified_to_dict
+from discover_aces_dev.instrumentation import count, timer
 
 __all__ = [
     'ACES_URN', 'ACES_TYPES', 'ACES_CTL_TRANSFORM_ROOT_CATEGORIES',
     'EXCLUDED_CLASSIFIERS', 'REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT',
+    'CTL_TRANSFORM_METADATA_ATTRIBUTES', 'CTL_TRANSFORM_PARSING_EXECUTORS',
     'CTLTransform', 'CTLTransformPair', 'find_transform_pairs',
-    'discover_aces_ctl', 'classify_aces_ctl_transforms'
+    'DiscoveryRules', 'iter_aces_ctl', 'discover_aces_ctl', 'DirectoryTrie',
+    'classify_ctl_transform_paths', 'parse_ctl_transforms',
+    'classify_aces_ctl_transforms', 'iter_classified_aces_ctl_transforms'
 ]
 
 ACES_ID_SEPARATOR = '.'
@@ -36,32 +42,73 @@ ACES_CTL_TRANSFORM_ROOT_CATEGORIES = {
 
 EXCLUDED_CLASSIFIERS = ['vendorSupplied']
 
+CTL_TRANSFORM_PARSING_EXECUTORS = {
+    'thread': ThreadPoolExecutor,
+    'process': ProcessPoolExecutor
+}
+
 REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT = os.environ.get(
     'OPENCOLORIO_CONFIG_ACES__REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT',
     os.path.join(
         os.path.dirname(__file__), '../', 'reference_implementation',
         'transforms'))
 
+CTL_TRANSFORM_METADATA_ATTRIBUTES = [
+    'id', 'urn', 'type', 'namespace', 'name', 'major_version_number',
+    'minor_version_number', 'patch_version_number', 'user_name',
+    'description', 'source', 'target'
+]
+
+
+_PATTERN_ACES_TRANSFORM_ID = re.compile(
+    '<ACEStransformID>(.*)</ACEStransformID>')
+
+_PATTERN_ACES_USER_NAME = re.compile('<ACESuserName>(.*)</ACESuserName>')
+
+_PATTERN_INVERSE_CSC = re.compile('.*_to_ACES$')
+
+_PATTERN_CTL_IMPORT = re.compile('^\\s*import\\s+"([^"]+)"\\s*;',
+                                 re.MULTILINE)
+
+_PATTERN_CTL_COMMENT = re.compile(r'"(?:[^"\\]|\\.)*"|//[^\n]*|/\*.*?\*/',
+                                  re.DOTALL)
+
+
+def _strip_ctl_comments(code):
+    # The strings are matched so that comment markers in them are retained,
+    # the comments newlines are retained so that the statements following a
+    # comment still start a line.
+    def replace(match):
+        comment = match.group(0)
+        if comment.startswith('"'):
+            return comment
+
+        return '\n' * comment.count('\n') or ' '
+
+    return _PATTERN_CTL_COMMENT.sub(replace, code)
+
 
 def patch_invalid_id(id_):
     invalid_id = id_
     if not id_.startswith(ACES_URN):
-        logging.warning(f'{invalid_id} is missing "ACES" URN!')
+        logging.warning('%s is missing "ACES" URN!', invalid_id)
 
         id_ = f'{ACES_URN}:{id_}'
 
     if 'Academy.P3D65_108nits_7.2nits_ST2084' in id_:
-        logging.warning(f'{invalid_id} has an invalid separator in "7.2nits"!')
+        logging.warning('%s has an invalid separator in "7.2nits"!',
+                        invalid_id)
 
         id_ = id_.replace('7.2', '7')
     elif 'ACEScsc' in id_:
         if not 'ACEScsc.Academy' in id_:
-            logging.warning(f'{invalid_id} is missing "Academy" namespace!')
+            logging.warning('%s is missing "Academy" namespace!',
+                            invalid_id)
 
             id_ = id_.replace('ACEScsc', 'ACEScsc.Academy')
 
         if id_.endswith('a1.v1'):
-            logging.warning(f'{invalid_id} version scheme is invalid!')
+            logging.warning('%s version scheme is invalid!', invalid_id)
 
             id_ = id_.replace('a1.v1', 'a1.1.0')
 
@@ -69,10 +116,16 @@ def patch_invalid_id(id_):
 
 
 class CTLTransform:
-    def __init__(self, path):
+    __slots__ = ('_path', '_code', '_id', '_urn', '_type', '_namespace',
+                 '_name', '_major_version_number', '_minor_version_number',
+                 '_patch_version_number', '_user_name', '_description',
+                 '_source', '_target', '_imports')
+
+    def __init__(self, path, metadata=None):
         self._path = path
 
         self._code = None
+        self._imports = None
         self._id = None
         self._urn = None
         self._type = None
@@ -86,7 +139,11 @@ class CTLTransform:
         self._source = None
         self._target = None
 
-        self._parse()
+        if metadata is None:
+            self._parse()
+        else:
+            for attribute in CTL_TRANSFORM_METADATA_ATTRIBUTES:
+                setattr(self, f'_{attribute}', metadata[attribute])
 
     @property
     def path(self):
@@ -94,8 +151,22 @@ class CTLTransform:
 
     @property
     def code(self):
+        if self._code is None:
+            with open(self._path) as ctl_file:
+                self._code = ctl_file.read()
+
         return self._code
 
+    @property
+    def imports(self):
+        # The imports follow the comment header, they are extracted lazily
+        # from the code rather than while parsing the header.
+        if self._imports is None:
+            self._imports = _PATTERN_CTL_IMPORT.findall(
+                _strip_ctl_comments(self.code))
+
+        return self._imports
+
     @property
     def id(self):
         return self._id
@@ -144,6 +215,13 @@ class CTLTransform:
     def target(self):
         return self._target
 
+    @property
+    def metadata(self):
+        return {
+            attribute: getattr(self, f'_{attribute}')
+            for attribute in CTL_TRANSFORM_METADATA_ATTRIBUTES
+        }
+
     def __str__(self):
         return f'{self.__class__.__name__}({self._name})'
 
@@ -155,7 +233,11 @@ class CTLTransform:
         if self._id is None:
             return
 
-        id_ = patch_invalid_id(self._id)
+        with timer('patch_invalid_id'):
+            id_ = patch_invalid_id(self._id)
+
+        if id_ != self._id:
+            count('invalid_ids_patched')
 
         self._urn, components = id_.rsplit(ACES_URN_SEPARATOR, 1)
         components = components.split(ACES_ID_SEPARATOR)
@@ -214,37 +296,47 @@ class CTLTransform:
                 self._source, self._target = 'OCES', 'ACES2065-1'
 
     def _parse(self):
-        with open(self._path) as ctl_file:
-            self._code = ctl_file.read()
+        # Only the comment header is parsed, the file is streamed line by line
+        # and reading stops at the header boundary, the code being loaded
+        # lazily by the "code" property.
+        count('ctl_transforms_parsed')
+
+        # The header lines are read up to the first line that is neither a
+        # comment nor holds an "ACES" tag, the parsing below stops there.
+        header = []
+        with timer('read'), open(self._path) as ctl_file:
+            for line in ctl_file:
+                line = line.strip()
+                if not line:
+                    continue
 
-            lines = filter(None,
-                           (line.strip() for line in self._code.split('\n')))
+                header.append(line)
+                if not line.startswith('//') and '<ACES' not in line:
+                    break
 
-            in_header = True
-            for line in lines:
-                search = re.search('<ACEStransformID>(.*)</ACEStransformID>',
-                                   line)
+        with timer('parse_header'):
+            for line in header:
+                search = _PATTERN_ACES_TRANSFORM_ID.search(line)
                 if search:
                     self._id = search.group(1)
                     self._parse_id()
                     continue
 
-                search = re.search('<ACESuserName>(.*)</ACESuserName>', line)
+                search = _PATTERN_ACES_USER_NAME.search(line)
                 if search:
                     self._user_name = search.group(1)
                     continue
 
-                if line.startswith('//'):
-                    self._description += line[2:].strip()
-                    self._description += '\n'
-                else:
-                    in_header = False
-
-                if not in_header:
+                if not line.startswith('//'):
                     break
 
+                self._description += line[2:].strip()
+                self._description += '\n'
+
 
 class CTLTransformPair:
+    __slots__ = ('_forward_transform', '_inverse_transform')
+
     def __init__(self, forward_transform, inverse_transform):
         self._forward_transform = forward_transform
         self._inverse_transform = inverse_transform
@@ -270,7 +362,7 @@ class CTLTransformPair:
                 f"'{os.path.basename(self._inverse_transform.path)}'))")
 
 
-def find_transform_pairs(ctl_transforms):
+def _find_transform_pairs(ctl_transforms):
     ctl_transform_pairs = defaultdict(dict)
     for ctl_transform in ctl_transforms:
         is_forward = True
@@ -280,7 +372,7 @@ def find_transform_pairs(ctl_transforms):
             basename = basename.replace('Inv', '')
             is_forward = False
 
-        if re.search('.*_to_ACES$', basename):
+        if _PATTERN_INVERSE_CSC.search(basename):
             basename = basename.replace('_to_ACES', '')
             is_forward = False
 
@@ -294,85 +386,661 @@ def find_transform_pairs(ctl_transforms):
     return ctl_transform_pairs
 
 
-def discover_aces_ctl(root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
-                      filterers=None):
+def find_transform_pairs(ctl_transforms):
+    with timer('pairing'):
+        return _find_transform_pairs(ctl_transforms)
+
+
+def _compile_patterns(patterns):
+    # Compiles glob and regular expression patterns into a single matcher
+    # searched against "/" separated relative paths: globs without separator
+    # match any path component while globs with separators match the path
+    # from its start, "*" matching across separators as in "fnmatch".
+    expressions = []
+    for pattern in patterns:
+        if not isinstance(pattern, str):
+            expressions.append(pattern.pattern)
+        elif '/' in pattern:
+            expressions.append(f'^{fnmatch.translate(pattern)}')
+        else:
+            expressions.append(f'(?:^|/){fnmatch.translate(pattern)}')
+
+    if not expressions:
+        return None
+
+    return re.compile('|'.join(f'(?:{expression})'
+                               for expression in expressions))
+
+
+class DiscoveryRules:
+    """
+    Declarative include and exclude rules pushed down into the *CTL*
+    transforms discovery so that whole sub-trees are pruned before being
+    walked.
+
+    Categories are matched against the first path component being a key of
+    :attr:`ACES_CTL_TRANSFORM_ROOT_CATEGORIES`, either by directory name,
+    e.g. *odt*, or by category, e.g. *output_transform*.
+
+    Parameters
+    ----------
+    categories : array_like, optional
+        Categories to discover, all the categories are discovered if *None*.
+    excluded_categories : array_like, optional
+        Categories to prune.
+    excluded_classifiers : array_like, optional
+        Directory names to prune wherever they are in the tree, e.g.
+        *vendorSupplied*.
+    patterns : array_like, optional
+        Glob patterns or compiled regular expressions the *CTL* transforms
+        paths, relative to the root directory, must match to be discovered.
+    excluded_patterns : array_like, optional
+        Glob patterns or compiled regular expressions pruning the matching
+        directories and *CTL* transforms.
+
+    Examples
+    --------
+    >>> rules = DiscoveryRules(
+    ...     categories=['output_transform', 'csc'],
+    ...     excluded_classifiers=['vendorSupplied'],
+    ...     excluded_patterns=['*_to_ACES.ctl'])
+    >>> rules.is_directory_excluded('ctl/idt')
+    True
+    >>> rules.is_file_included('ctl/csc/ACEScg/ACEScsc.ACEScg_to_ACES.ctl')
+    False
+    """
+
+    def __init__(self,
+                 categories=None,
+                 excluded_categories=None,
+                 excluded_classifiers=None,
+                 patterns=None,
+                 excluded_patterns=None):
+        self._categories = (self._category_directories(categories)
+                            if categories is not None else None)
+        self._excluded_categories = self._category_directories(
+            excluded_categories or [])
+
+        self._matcher = _compile_patterns(patterns or [])
+        self._excluded_matcher = _compile_patterns(
+            list(excluded_patterns or []) + [
+                re.compile(f'(?:^|/){re.escape(classifier)}(?:/|$)')
+                for classifier in excluded_classifiers or []
+            ])
+
+    @staticmethod
+    def _category_directories(categories):
+        categories = set(categories)
+
+        return {
+            directory
+            for directory, category in (
+                ACES_CTL_TRANSFORM_ROOT_CATEGORIES.items())
+            if directory in categories or category in categories
+        }
+
+    def _is_category_excluded(self, components):
+        for component in components:
+            if component in ACES_CTL_TRANSFORM_ROOT_CATEGORIES:
+                return (component in self._excluded_categories or
+                        (self._categories is not None and
+                         component not in self._categories))
+
+        return None
+
+    def is_directory_excluded(self, relative_directory):
+        """
+        Returns whether given directory and its sub-tree should be pruned.
+
+        Parameters
+        ----------
+        relative_directory : unicode
+            "/" separated directory path relative to the root directory.
+
+        Returns
+        -------
+        bool
+            Whether the directory should be pruned.
+        """
+
+        if self._is_category_excluded(relative_directory.split('/')):
+            return True
+
+        return bool(self._excluded_matcher and
+                    self._excluded_matcher.search(relative_directory))
+
+    def is_file_included(self, relative_path):
+        """
+        Returns whether given *CTL* transform should be discovered.
+
+        Parameters
+        ----------
+        relative_path : unicode
+            "/" separated *CTL* transform path relative to the root directory.
+
+        Returns
+        -------
+        bool
+            Whether the *CTL* transform should be discovered.
+        """
+
+        is_category_excluded = self._is_category_excluded(
+            relative_path.split('/')[:-1])
+        if is_category_excluded or (is_category_excluded is None and
+                                    self._categories is not None):
+            return False
+
+        if self._excluded_matcher and self._excluded_matcher.search(
+                relative_path):
+            return False
+
+        return not self._matcher or bool(self._matcher.search(relative_path))
+
+
+def _scan_directory(directory, relative_directory, rules=None):
+    # Scans given directory, returning its sub-directories that are not
+    # pruned by the rules and its file entries, or "None" if it cannot be
+    # scanned.
+    try:
+        with timer('walk'), os.scandir(directory) as iterator:
+            entries = list(iterator)
+    except OSError:
+        return None
+
+    count('directories_walked')
+
+    sub_directories, files = [], []
+    for entry in entries:
+        try:
+            is_directory = entry.is_dir()
+        except OSError:
+            is_directory = False
+
+        if not is_directory:
+            files.append(entry)
+            continue
+
+        if entry.is_symlink():
+            continue
+
+        relative_sub_directory = (f'{relative_directory}/{entry.name}'
+                                  if relative_directory else entry.name)
+        if rules is not None and rules.is_directory_excluded(
+                relative_sub_directory):
+            logging.debug('"%s" directory was pruned!', entry.path)
+            continue
+
+        sub_directories.append((entry.path, relative_sub_directory))
+
+    return sub_directories, files
+
+
+def _walk(root_directory, rules=None):
+    # Depth-first, top-down walk mirroring "os.walk" ordering but yielding the
+    # file entries of each directory as soon as it is scanned and pruning the
+    # directories excluded by the rules before scanning them.
+    directories = [(root_directory, '')]
+    while directories:
+        directory, relative_directory = directories.pop()
+        scan = _scan_directory(directory, relative_directory, rules)
+        if scan is None:
+            continue
+
+        sub_directories, files = scan
+
+        yield directory, relative_directory, files
+
+        directories.extend(reversed(sub_directories))
+
+
+def _filter_ctl_transforms(directory,
+                           relative_directory,
+                           entries,
+                           filterers,
+                           rules=None):
+    ctl_transforms = []
+    for entry in entries:
+        filename = entry.name
+        if not filename.lower().endswith('ctl'):
+            continue
+
+        if rules is not None and not rules.is_file_included(
+                f'{relative_directory}/{filename}'
+                if relative_directory else filename):
+            continue
+
+        excluded = False
+        for filterer in filterers:
+            if not filterer(filename):
+                excluded = True
+                break
+
+        if excluded:
+            continue
+
+        ctl_transform = os.path.join(directory, filename)
+        logging.info('"%s" CTL transform was found!', ctl_transform)
+
+        ctl_transforms.append(ctl_transform)
+
+    if ctl_transforms:
+        count('ctl_transforms_found', len(ctl_transforms))
+
+    return ctl_transforms
+
+
+def iter_aces_ctl(root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
+                  filterers=None,
+                  rules=None):
+    """
+    Discovers the *CTL* transforms under given root directory, yielding them
+    directory by directory as soon as each directory is scanned.
+
+    Parameters
+    ----------
+    root_directory : unicode, optional
+        Root directory to discover the *CTL* transforms from.
+    filterers : array_like, optional
+        Callables receiving a filename and returning whether the file should
+        be kept.
+    rules : DiscoveryRules, optional
+        Declarative rules pruning the directories before they are walked and
+        excluding *CTL* transforms.
+
+    Yields
+    ------
+    tuple
+        Directory and list of *CTL* transform paths it contains, directories
+        without *CTL* transforms are skipped.
+    """
+
     root_directory = os.path.normpath(os.path.expandvars(root_directory))
     if filterers is None:
         filterers = []
 
+    for directory, relative_directory, entries in _walk(
+            root_directory, rules):
+        ctl_transforms = _filter_ctl_transforms(
+            directory, relative_directory, entries, filterers, rules)
+
+        if ctl_transforms:
+            yield directory, ctl_transforms
+
+
+def discover_aces_ctl(root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
+                      filterers=None,
+                      rules=None):
     ctl_transforms = defaultdict(list)
-    for directory, _sub_directories, filenames in os.walk(root_directory):
-        if not filenames:
-            continue
+    for directory, paths in iter_aces_ctl(root_directory, filterers, rules):
+        ctl_transforms[directory].extend(paths)
 
-        for filename in filenames:
-            if not filename.lower().endswith('ctl'):
-                continue
+    return ctl_transforms
 
-            excluded = False
-            for filterer in filterers:
-                if not filterer(filename):
-                    excluded = True
-                    break
 
-            if excluded:
-                continue
+def _path_components(directory):
+    return os.path.normpath(directory).split(os.sep)
 
-            ctl_transform = os.path.join(directory, filename)
-            logging.info(f'"{ctl_transform}" CTL transform was found!')
 
-            ctl_transforms[directory].append(ctl_transform)
+def _classify_components(components):
+    category, *classifiers = [
+        ACES_CTL_TRANSFORM_ROOT_CATEGORIES.get(classifier, classifier)
+        for classifier in components
+        if classifier not in EXCLUDED_CLASSIFIERS
+    ] or ['base']
 
-    return ctl_transforms
+    if not classifiers:
+        classifiers = 'base'
+    else:
+        classifiers = '/'.join(classifiers)
 
+    return category, classifiers
 
-def classify_aces_ctl_transforms(unclassified_ctl_transforms):
-    classified_ctl_transforms = defaultdict(lambda: defaultdict(dict))
 
-    separator = os.sep
-    root_directory = paths_common_ancestor(
-        *itertools.chain.from_iterable(unclassified_ctl_transforms.values()))
+def _classify_directory(directory, root_directory):
+    with timer('classification'):
+        components = _path_components(directory)
+        root_components = _path_components(root_directory)
+
+        return _classify_components(components[len(root_components):])
+
+
+class _DirectoryTrieNode:
+    __slots__ = ('children', 'is_directory', 'is_root')
+
+    def __init__(self):
+        self.children = {}
+        self.is_directory = False
+        self.is_root = False
+
+
+class DirectoryTrie:
+    """
+    Path trie of the directories containing *CTL* transforms classifying them
+    into a category and classifiers relative to their root directory, with
+    :attr:`ACES_CTL_TRANSFORM_ROOT_CATEGORIES` and
+    :attr:`EXCLUDED_CLASSIFIERS` attributes.
+
+    Each directory is inserted once and classified in time linear in its
+    component count. When root directories are given, e.g. several
+    *aces-dev* checkouts or a studio overlay and its base, each directory is
+    classified relative to the deepest root containing it. Otherwise the
+    root directory is the deepest common ancestor of the directories, or its
+    parent if it contains *CTL* transforms itself or is a category
+    directory, e.g. when only the *odt* category was discovered.
+
+    Parameters
+    ----------
+    directories : array_like, optional
+        Directories to insert.
+    root_directories : unicode or array_like, optional
+        Root directory or directories, inferred if *None*.
+
+    Examples
+    --------
+    >>> trie = DirectoryTrie(['/aces/ctl/odt/rec709', '/aces/ctl/idt/sony'])
+    >>> trie.classify('/aces/ctl/odt/rec709')
+    ('output_transform', 'rec709')
+    """
+
+    def __init__(self, directories=None, root_directories=None):
+        self._root = _DirectoryTrieNode()
+        self._components = {}
+        self._inferred_root_directory = None
+
+        if isinstance(root_directories, str):
+            root_directories = [root_directories]
+
+        self._root_directories = []
+        for root_directory in root_directories or []:
+            root_directory = os.path.normpath(
+                os.path.expandvars(root_directory))
+            self._node(_path_components(root_directory)).is_root = True
+            self._root_directories.append(root_directory)
+
+        for directory in directories or []:
+            self.add(directory)
+
+    @property
+    def root_directories(self):
+        return list(self._root_directories)
+
+    def _node(self, components):
+        node = self._root
+        for component in components:
+            child = node.children.get(component)
+            if child is None:
+                child = node.children[component] = _DirectoryTrieNode()
+
+            node = child
+
+        return node
+
+    def add(self, directory):
+        """
+        Inserts given directory.
+
+        Parameters
+        ----------
+        directory : unicode
+            Directory containing *CTL* transforms.
+        """
+
+        components = self._components[directory] = _path_components(
+            directory)
+        self._node(components).is_directory = True
+        self._inferred_root_directory = None
+
+    def _infer_root_directory(self):
+        components = []
+        node = self._root
+        while len(node.children) == 1 and not node.is_directory:
+            component, node = next(iter(node.children.items()))
+            components.append(component)
+
+        if node.is_directory and components:
+            components.pop()
+
+        while (components and
+               components[-1] in ACES_CTL_TRANSFORM_ROOT_CATEGORIES):
+            components.pop()
+
+        return components
+
+    def root_directory(self, directory):
+        """
+        Returns the root directory of given directory.
+
+        Parameters
+        ----------
+        directory : unicode
+            Directory.
+
+        Returns
+        -------
+        unicode
+            Root directory.
+
+        Raises
+        ------
+        ValueError
+            If root directories were given and none contains given directory.
+        """
+
+        components = self._components.get(directory)
+        if components is None:
+            components = _path_components(directory)
+
+        return os.sep.join(self._root_components(components)) or os.sep
+
+    def _root_components(self, components):
+        if not self._root_directories:
+            if self._inferred_root_directory is None:
+                self._inferred_root_directory = self._infer_root_directory()
+
+            return self._inferred_root_directory
+
+        root_length = None
+        node = self._root
+        for length, component in enumerate(components, 1):
+            node = node.children.get(component)
+            if node is None:
+                break
+
+            if node.is_root:
+                root_length = length
+
+        if root_length is None:
+            raise ValueError(
+                f'"{os.sep.join(components)}" directory is not under any of '
+                f'the {self._root_directories} root directories!')
+
+        return components[:root_length]
+
+    def classify(self, directory):
+        """
+        Returns the category and classifiers of given directory.
+
+        Parameters
+        ----------
+        directory : unicode
+            Directory.
+
+        Returns
+        -------
+        tuple
+            Category and classifiers, *base* if the directory has no
+            classifiers.
+        """
+
+        with timer('classification'):
+            components = self._components.get(directory)
+            if components is None:
+                components = _path_components(directory)
+
+            return _classify_components(
+                components[len(self._root_components(components)):])
+
+
+def classify_ctl_transform_paths(unclassified_ctl_transforms,
+                                 root_directory=None):
+    trie = DirectoryTrie(unclassified_ctl_transforms.keys(), root_directory)
+
     for directory, ctl_transforms in unclassified_ctl_transforms.items():
-        sub_directory = directory.replace(f'{root_directory}{separator}', '')
-        category, *classifiers = [
-            ACES_CTL_TRANSFORM_ROOT_CATEGORIES.get(classifier, classifier)
-            for classifier in sub_directory.split(separator)
-            if classifier not in EXCLUDED_CLASSIFIERS
-        ]
-
-        if not classifiers:
-            classifiers = 'base'
-        else:
-            classifiers = '/'.join(classifiers)
+        category, classifiers = trie.classify(directory)
 
         for basename, pairs in find_transform_pairs(ctl_transforms).items():
-            if len(pairs) == 1:
-                ctl_transform = CTLTransform(list(pairs.values())[0])
+            yield category, classifiers, basename, pairs
 
-                logging.info(
-                    f'Classifying "{ctl_transform}" under "{classifiers}".')
 
-                classified_ctl_transforms[category][classifiers][basename] = (
-                    ctl_transform)
+def parse_ctl_transforms(paths, executor=None, workers=None):
+    """
+    Parses given *CTL* transform paths, optionally fanning out the parsing
+    across the workers of an executor.
 
-            elif len(pairs) == 2:
-                forward_ctl_transform = CTLTransform(
-                    pairs['forward_transform'])
-                inverse_ctl_transform = CTLTransform(
-                    pairs['inverse_transform'])
+    Parameters
+    ----------
+    paths : array_like
+        *CTL* transform paths.
+    executor : unicode or Executor, optional
+        {None, 'thread', 'process'} or :class:`concurrent.futures.Executor`
+        class instance, the *CTL* transforms are parsed serially if *None*.
+    workers : int, optional
+        Worker count of the executor created for the *thread* and *process*
+        executors, defaults to the processor count.
 
-                ctl_transform = CTLTransformPair(forward_ctl_transform,
-                                                 inverse_ctl_transform)
+    Returns
+    -------
+    list
+        :class:`discover_aces_dev.CTLTransform` class instances in the same
+        order as given paths.
+    """
 
-                logging.info(
-                    f'Classifying "{ctl_transform}" under "{classifiers}".')
+    paths = list(paths)
 
-                classified_ctl_transforms[category][classifiers][basename] = (
-                    ctl_transform)
+    if executor is None or len(paths) < 2:
+        return [CTLTransform(path) for path in paths]
+
+    if isinstance(executor, Executor):
+        return list(executor.map(CTLTransform, paths))
+
+    if executor not in CTL_TRANSFORM_PARSING_EXECUTORS:
+        raise ValueError(
+            f'"{executor}" executor is invalid, it must be one of '
+            f'{sorted(CTL_TRANSFORM_PARSING_EXECUTORS)} or an "Executor" '
+            f'class instance!')
+
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, len(paths) // (workers * 4))
+    with CTL_TRANSFORM_PARSING_EXECUTORS[executor](workers) as pool:
+        return list(pool.map(CTLTransform, paths, chunksize=chunk_size))
+
+
+def _assemble_ctl_transform(pairs, ctl_transforms):
+    if len(pairs) == 1:
+        return ctl_transforms[list(pairs.values())[0]]
+
+    return CTLTransformPair(ctl_transforms[pairs['forward_transform']],
+                            ctl_transforms[pairs['inverse_transform']])
+
+
+def classify_aces_ctl_transforms(unclassified_ctl_transforms,
+                                 cache=None,
+                                 executor=None,
+                                 workers=None,
+                                 index=None):
+    if cache is not None:
+        classified_ctl_transforms = cache.classify_aces_ctl_transforms(
+            unclassified_ctl_transforms)
+
+        if index is not None:
+            index.update(classified_ctl_transforms)
+
+        return classified_ctl_transforms
+
+    classified_paths = list(
+        classify_ctl_transform_paths(unclassified_ctl_transforms))
+    paths = _classified_paths_to_paths(classified_paths)
+    ctl_transforms = dict(
+        zip(paths, parse_ctl_transforms(paths, executor, workers)))
+
+    return _classify_ctl_transforms(classified_paths, ctl_transforms, index)
+
+
+def _classified_paths_to_paths(classified_paths):
+    return [
+        path for _category, _classifiers, _basename, pairs in classified_paths
+        for path in pairs.values()
+    ]
+
+
+def _classify_ctl_transforms(classified_paths, ctl_transforms, index=None):
+    classified_ctl_transforms = defaultdict(lambda: defaultdict(dict))
+
+    for category, classifiers, basename, pairs in classified_paths:
+        ctl_transform = _assemble_ctl_transform(pairs, ctl_transforms)
+
+        logging.info('Classifying "%s" under "%s".', ctl_transform,
+                     classifiers)
+
+        classified_ctl_transforms[category][classifiers][basename] = (
+            ctl_transform)
+
+        if index is not None:
+            index.add(ctl_transform, category, classifiers, basename)
 
     return vivified_to_dict(classified_ctl_transforms)
 
 
+def iter_classified_aces_ctl_transforms(root_directory,
+                                        filterers=None,
+                                        rules=None):
+    """
+    Discovers, parses and classifies the *CTL* transforms under given root
+    directory, yielding them as soon as their directory is scanned.
+
+    Unlike :func:`classify_aces_ctl_transforms` definition, the root directory
+    the classification is relative to is explicit rather than inferred from
+    the common ancestor of all the discovered paths, thus nothing needs to be
+    materialised upfront.
+
+    Parameters
+    ----------
+    root_directory : unicode
+        Root directory to discover the *CTL* transforms from, its immediate
+        sub-directories being the categories, e.g. *transforms/ctl*.
+    filterers : array_like, optional
+        Callables receiving a filename and returning whether the file should
+        be kept.
+    rules : DiscoveryRules, optional
+        Declarative rules pruning the directories before they are walked and
+        excluding *CTL* transforms.
+
+    Yields
+    ------
+    tuple
+        Category, classifiers, basename and
+        :class:`discover_aces_dev.CTLTransform` or
+        :class:`discover_aces_dev.CTLTransformPair` class instance.
+    """
+
+    root_directory = os.path.normpath(os.path.expandvars(root_directory))
+
+    for directory, paths in iter_aces_ctl(root_directory, filterers, rules):
+        category, classifiers = _classify_directory(directory, root_directory)
+
+        for basename, pairs in find_transform_pairs(paths).items():
+            ctl_transforms = {
+                path: CTLTransform(path)
+                for path in pairs.values()
+            }
+            ctl_transform = _assemble_ctl_transform(pairs, ctl_transforms)
+
+            logging.info('Classifying "%s" under "%s".', ctl_transform,
+                         classifiers)
+
+            yield category, classifiers, basename, ctl_transform
+
+
 if __name__ == '__main__':
     from pprint import pprint
     from rich.logging import RichHandler
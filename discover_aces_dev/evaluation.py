@@ -0,0 +1,1151 @@
+# -*- coding: utf-8 -*-
+
+import functools
+import math
+import os
+import threading
+
+from discover_aces_dev.common import is_numpy_installed
+from discover_aces_dev.ctl_parser import (
+    Assignment, Binary, Block, Call, Conditional, Declaration,
+    ExpressionStatement, Field, For, Function, If, Increment, Index,
+    InitializerList, Literal, Member, Name, Return, Struct, Unary, While,
+    parse_ctl)
+
+if is_numpy_installed():  # pragma: no cover
+    import numpy as np
+
+__all__ = [
+    'CTLEvaluationError', 'CTL_CONSTANTS', 'CTLFunction', 'find_ctl_module',
+    'compile_ctl_transform', 'clear_compiled_ctl_transforms',
+    'evaluate_ctl_transform'
+]
+
+
+class CTLEvaluationError(RuntimeError):
+    """
+    Exception raised when *CTL* code cannot be evaluated.
+    """
+
+
+CTL_CONSTANTS = {
+    'M_E': math.e,
+    'M_PI': math.pi,
+    'FLT_MAX': 3.402823466e+38,
+    'FLT_MIN': 1.175494351e-38,
+    'FLT_EPSILON': 1.192092896e-07,
+    'FLT_POS_INF': float('inf'),
+    'FLT_NEG_INF': float('-inf'),
+    'FLT_NAN': float('nan'),
+    'HALF_MAX': 65504.0,
+    'HALF_MIN': 5.96046448e-08,
+    'HALF_NRM_MIN': 6.10351562e-05,
+    'HALF_EPSILON': 0.00097656,
+    'HALF_POS_INF': float('inf'),
+    'HALF_NEG_INF': float('-inf'),
+    'HALF_NAN': float('nan'),
+    'INT_MAX': 2147483647,
+    'INT_MIN': -2147483648,
+    'UINT_MAX': 4294967295,
+}
+"""
+Constants of the *CTL* standard library.
+"""
+
+_CHROMATICITIES = Struct('Chromaticities', [
+    Field('float', primary, [Literal(2)])
+    for primary in ('red', 'green', 'blue', 'white')
+])
+
+_FLOAT_TYPES = ('float', 'half')
+
+_INTEGER_TYPES = ('int', 'unsigned')
+
+_MAXIMUM_ITERATIONS = 1000000
+
+_COMPILED_CTL_TRANSFORMS = {}
+
+_COMPILED_CTL_TRANSFORMS_LOCK = threading.Lock()
+
+_PARSED_CTL_FILES = {}
+
+_PARSED_CTL_FILES_LOCK = threading.Lock()
+
+
+def _gather(array, index):
+    # Gathers the elements of the last axis of given array at given index,
+    # broadcasting the leading axes.
+    index = np.clip(index, 0, array.shape[-1] - 1)[..., np.newaxis]
+    shape = np.broadcast_shapes(array.shape[:-1], index.shape[:-1])
+    array = np.broadcast_to(array, shape + array.shape[-1:])
+    index = np.broadcast_to(index, shape + (1, ))
+
+    return np.take_along_axis(array, index, axis=-1)[..., 0]
+
+
+def _RGB_to_XYZ(chromaticities, Y):
+    red, green, blue, white = np.broadcast_arrays(
+        chromaticities['red'], chromaticities['green'],
+        chromaticities['blue'], chromaticities['white'])
+
+    x, y = np.stack([red, green, blue], axis=-2).transpose(
+        (-1, ) + tuple(range(red.ndim - 1)) + (-2, ))
+    primaries = np.stack([x, y, 1 - x - y], axis=-1)
+
+    Y = np.asarray(Y, dtype=np.float64)
+    W = np.stack(
+        np.broadcast_arrays(white[..., 0] * Y / white[..., 1], Y,
+                            (1 - white[..., 0] - white[..., 1]) * Y /
+                            white[..., 1]),
+        axis=-1)
+    S = np.einsum('...i,...ij->...j', W, np.linalg.inv(primaries))
+
+    M = np.zeros(S.shape[:-1] + (4, 4))
+    M[..., :3, :3] = S[..., np.newaxis] * primaries
+    M[..., 3, 3] = 1
+
+    return M
+
+
+def _mult_f3_f44(X, M):
+    H = (np.einsum('...i,...ij->...j', X, M[..., :3, :]) + M[..., 3, :])
+
+    return H[..., :3] / H[..., 3:]
+
+
+def _lookup1D(table, p_min, p_max, p):
+    size = table.shape[-1]
+    if size == 1:
+        return table[..., 0] * np.ones_like(p)
+
+    t = np.clip((p - p_min) / (p_max - p_min) * (size - 1), 0, size - 1)
+    i = np.clip(np.floor(t).astype(np.int64), 0, size - 2)
+    s = t - i
+
+    return _gather(table, i) * (1 - s) + _gather(table, i + 1) * s
+
+
+def _interpolate1D(table, p):
+    x, y = table[..., 0], table[..., 1]
+    size = x.shape[-1]
+    if size == 1:
+        return y[..., 0] * np.ones_like(p)
+
+    p = np.asarray(p, dtype=np.float64)
+    i = np.clip(
+        np.sum(x <= p[..., np.newaxis], axis=-1) - 1, 0, size - 2)
+    x_0, x_1 = _gather(x, i), _gather(x, i + 1)
+    y_0, y_1 = _gather(y, i), _gather(y, i + 1)
+    s = np.clip((p - x_0) / (x_1 - x_0), 0, 1)
+
+    return y_0 + (y_1 - y_0) * s
+
+
+def _no_operation(*args):
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _builtins():
+    builtins = {
+        'acos': np.arccos,
+        'asin': np.arcsin,
+        'atan': np.arctan,
+        'atan2': np.arctan2,
+        'cos': np.cos,
+        'sin': np.sin,
+        'tan': np.tan,
+        'cosh': np.cosh,
+        'sinh': np.sinh,
+        'tanh': np.tanh,
+        'exp': np.exp,
+        'log': np.log,
+        'log10': np.log10,
+        'pow': np.power,
+        'pow10': lambda x: np.power(10.0, x),
+        'sqrt': np.sqrt,
+        'fabs': np.abs,
+        'floor': np.floor,
+        'ceil': np.ceil,
+        'trunc': np.trunc,
+        'fmod': np.fmod,
+        'hypot': np.hypot,
+        'isfinite': np.isfinite,
+        'isnormal': lambda x: np.isfinite(x) & (np.abs(x) >= np.finfo(
+            np.float32).tiny),
+        'isnan': np.isnan,
+        'isinf': np.isinf,
+        'mult_f_f3': lambda f, X: f[..., np.newaxis] * X,
+        'mult_f_f33': lambda f, M: f[..., np.newaxis, np.newaxis] * M,
+        'mult_f_f44': lambda f, M: f[..., np.newaxis, np.newaxis] * M,
+        'mult_f3_f33': lambda X, M: np.einsum('...i,...ij->...j', X, M),
+        'mult_f3_f44': _mult_f3_f44,
+        'mult_f33_f33': np.matmul,
+        'mult_f44_f44': np.matmul,
+        'add_f3_f3': np.add,
+        'sub_f3_f3': np.subtract,
+        'add_f33_f33': np.add,
+        'add_f44_f44': np.add,
+        'invert_f33': np.linalg.inv,
+        'invert_f44': np.linalg.inv,
+        'transpose_f33': lambda M: np.swapaxes(M, -1, -2),
+        'transpose_f44': lambda M: np.swapaxes(M, -1, -2),
+        'dot_f3_f3': lambda X, Y: np.sum(X * Y, axis=-1),
+        'length_f3': lambda X: np.sqrt(np.sum(X * X, axis=-1)),
+        'cross_f3_f3': lambda X, Y: np.cross(X, Y, axis=-1),
+        'RGBtoXYZ': _RGB_to_XYZ,
+        'XYZtoRGB': lambda chromaticities, Y: np.linalg.inv(
+            _RGB_to_XYZ(chromaticities, Y)),
+        'lookup1D': _lookup1D,
+        'interpolate1D': _interpolate1D,
+        'assert': _no_operation,
+    }
+
+    for name in ('exp', 'log', 'log10', 'pow', 'pow10'):
+        builtins[f'{name}_h'] = builtins[name]
+
+    for name in ('isfinite', 'isnormal', 'isnan', 'isinf'):
+        builtins[f'{name}_f'] = builtins[f'{name}_h'] = builtins.pop(name)
+
+    for name in ('print', 'print_bool', 'print_int', 'print_unsigned_int',
+                 'print_half', 'print_float', 'print_string'):
+        builtins[name] = _no_operation
+
+    return builtins
+
+
+class _Variable:
+    __slots__ = ('value', 'type', 'level')
+
+    def __init__(self, value, type_, level):
+        self.value = value
+        self.type = type_
+        self.level = level
+
+
+class _Frame:
+    # Execution state of a function call: "depth" is the nesting level of the
+    # varying, i.e. masked, control flow and "returned" the mask of the lanes
+    # that have already returned.
+    __slots__ = ('scopes', 'depth', 'returned', 'result')
+
+    def __init__(self, scopes):
+        self.scopes = scopes
+        self.depth = 0
+        self.returned = False
+        self.result = None
+
+
+class _Evaluator:
+    # Interprets the *CTL* abstract syntax tree on *NumPy* arrays whose
+    # leading axes are the batch axes, e.g. the image height and width, and
+    # the trailing axes the *CTL* array dimensions. Uniform values have
+    # singleton batch axes. Varying control flow executes both branches under
+    # complementary masks, assignments being merged with "np.where".
+
+    def __init__(self, definitions, batch_dimensions):
+        self._batch_dimensions = batch_dimensions
+
+        self._functions = {}
+        self._structs = {'Chromaticities': _CHROMATICITIES}
+        self._globals = {}
+        self._constants = {
+            name: self._lift(value)
+            for name, value in CTL_CONSTANTS.items()
+        }
+
+        frame = _Frame([self._globals])
+        for definition in definitions:
+            if isinstance(definition, Function):
+                self._functions[definition.name] = definition
+            elif isinstance(definition, Struct):
+                self._structs[definition.name] = definition
+            else:
+                self._execute(definition, frame, True)
+
+        for variable in self._globals.values():
+            variable.level = -1
+
+    @property
+    def functions(self):
+        return self._functions
+
+    def _lift(self, value, dtype=None):
+        array = np.asarray(value, dtype=dtype)
+
+        return array.reshape((1, ) * self._batch_dimensions + array.shape)
+
+    def _rank(self, value):
+        return value.ndim - self._batch_dimensions
+
+    def _expand(self, mask, rank):
+        return mask.reshape(mask.shape + (1, ) * rank)
+
+    def _truth(self, value):
+        return np.asarray(value, dtype=np.bool_)
+
+    def _cast(self, value, type_):
+        base_type = type_[0]
+        if base_type in self._structs or value is None:
+            return value
+
+        value = np.asarray(value)
+        if base_type in _INTEGER_TYPES:
+            if value.dtype.kind == 'f':
+                value = np.nan_to_num(
+                    np.trunc(value), nan=0, posinf=0, neginf=0)
+
+            return value.astype(np.int64, copy=False)
+        elif base_type == 'bool':
+            return value.astype(np.bool_, copy=False)
+        elif base_type in _FLOAT_TYPES:
+            return value.astype(np.float64, copy=False)
+
+        return value
+
+    def _merge(self, old, new, mask):
+        if isinstance(old, dict):
+            return {
+                field: self._merge(old[field], new[field], mask)
+                for field in old
+            }
+
+        if old is None:
+            return new
+
+        rank = max(self._rank(np.asarray(old)), self._rank(np.asarray(new)))
+
+        return np.where(self._expand(mask, rank), new, old)
+
+    def _active(self, frame, mask):
+        returned = frame.returned
+        if returned is False:
+            return mask
+
+        if returned is True:
+            return None
+
+        active = ~returned if mask is True else mask & ~returned
+
+        return active if active.any() else None
+
+    def _split(self, mask, condition):
+        if mask is True:
+            return condition, ~condition
+
+        return mask & condition, mask & ~condition
+
+    def _lookup(self, name, frame):
+        for scope in reversed(frame.scopes):
+            variable = scope.get(name)
+            if variable is not None:
+                return variable
+
+        return self._globals.get(name)
+
+    def _default(self, type_, dimensions, frame):
+        struct = self._structs.get(type_)
+        if struct is not None and not dimensions:
+            return {
+                field.name: self._default(field.type, field.dimensions, frame)
+                for field in struct.fields
+            }
+
+        shape = tuple(
+            int(self._evaluate(dimension, frame, True).reshape(-1)[0])
+            if dimension is not None else 0 for dimension in dimensions)
+        dtype = (np.int64 if type_ in _INTEGER_TYPES else
+                 np.bool_ if type_ == 'bool' else np.float64)
+
+        return self._lift(np.zeros(shape, dtype=dtype))
+
+    def _initialise(self, type_, dimensions, initializer, frame, mask):
+        if not isinstance(initializer, InitializerList):
+            return self._evaluate(initializer, frame, mask)
+
+        if dimensions:
+            elements = [
+                self._initialise(type_, dimensions[1:], element, frame, mask)
+                for element in initializer.elements
+            ]
+
+            return self._stack(elements)
+
+        struct = self._structs.get(type_)
+        if struct is None:
+            raise CTLEvaluationError(
+                f'"{type_}" type cannot be initialised with a list!')
+
+        return {
+            field.name: self._cast(
+                self._initialise(field.type, field.dimensions, element, frame,
+                                 mask), (field.type, len(field.dimensions)))
+            for field, element in zip(struct.fields, initializer.elements)
+        }
+
+    def _stack(self, elements):
+        if any(isinstance(element, dict) for element in elements):
+            raise CTLEvaluationError('Arrays of structs are not supported!')
+
+        elements = [np.asarray(element) for element in elements]
+        batch_dimensions = self._batch_dimensions
+        shape = np.broadcast_shapes(
+            *[element.shape[:batch_dimensions] for element in elements])
+        elements = [
+            np.broadcast_to(element, shape + element.shape[batch_dimensions:])
+            for element in elements
+        ]
+
+        return np.stack(elements, axis=batch_dimensions)
+
+    def _index(self, value, index):
+        if isinstance(value, dict):
+            raise CTLEvaluationError('Structs cannot be indexed!')
+
+        batch_dimensions = self._batch_dimensions
+        size = value.shape[batch_dimensions]
+        index = np.clip(self._cast(index, ('int', 0)), 0, size - 1)
+
+        if index.size == 1:
+            return value.take(int(index.reshape(-1)[0]), axis=batch_dimensions)
+
+        rank = self._rank(value) - 1
+        index = index.reshape(index.shape + (1, ) * (rank + 1))
+        shape = np.broadcast_shapes(value.shape[:batch_dimensions],
+                                    index.shape[:batch_dimensions])
+        value = np.broadcast_to(value, shape + value.shape[batch_dimensions:])
+        index = np.broadcast_to(
+            index, shape + (1, ) + value.shape[batch_dimensions + 1:])
+
+        return np.take_along_axis(
+            value, index, axis=batch_dimensions).squeeze(batch_dimensions)
+
+    def _set_index(self, value, index, element, mask):
+        batch_dimensions = self._batch_dimensions
+        size = value.shape[batch_dimensions]
+        index = np.clip(self._cast(index, ('int', 0)), 0, size - 1)
+        element = np.asarray(element).astype(value.dtype, copy=False)
+        rank = self._rank(value) - 1
+
+        if index.size == 1:
+            index = int(index.reshape(-1)[0])
+            shapes = [value.shape[:batch_dimensions],
+                      element.shape[:batch_dimensions]]
+            if mask is not None:
+                shapes.append(mask.shape)
+            shape = np.broadcast_shapes(*shapes)
+
+            value = np.array(
+                np.broadcast_to(value,
+                                shape + value.shape[batch_dimensions:]))
+            slice_ = (slice(None), ) * batch_dimensions + (index, )
+            if mask is not None:
+                element = np.where(
+                    self._expand(mask, rank), element, value[slice_])
+            value[slice_] = element
+
+            return value
+
+        selection = (np.arange(size).reshape((1, ) * batch_dimensions +
+                                             (size, )) == index[...,
+                                                                np.newaxis])
+        if mask is not None:
+            selection = selection & mask[..., np.newaxis]
+
+        return np.where(
+            self._expand(selection, rank),
+            np.expand_dims(element, batch_dimensions), value)
+
+    def _set_path(self, value, steps, element, mask, frame, evaluation_mask):
+        step, steps = steps[0], steps[1:]
+
+        if isinstance(step, Member):
+            if not isinstance(value, dict):
+                raise CTLEvaluationError(
+                    f'"{step.name}" member cannot be assigned!')
+
+            child = value[step.name]
+            if steps:
+                child = self._set_path(child, steps, element, mask, frame,
+                                       evaluation_mask)
+            else:
+                child = (element if mask is None else self._merge(
+                    child, element, mask))
+
+            value = dict(value)
+            value[step.name] = child
+
+            return value
+
+        index = self._evaluate(step.index, frame, evaluation_mask)
+        if steps:
+            element = self._set_path(
+                self._index(value, index), steps, element, mask, frame,
+                evaluation_mask)
+
+        return self._set_index(value, index, element, mask)
+
+    def _assign(self, target, value, frame, mask):
+        steps = []
+        while isinstance(target, (Index, Member)):
+            steps.append(target)
+            target = target.value
+        steps.reverse()
+
+        if not isinstance(target, Name):
+            raise CTLEvaluationError('Invalid assignment target!')
+
+        variable = self._lookup(target.name, frame)
+        if variable is None:
+            raise CTLEvaluationError(f'"{target.name}" is not defined!')
+
+        # Variables declared at the current varying depth can be overwritten
+        # as the inactive lanes are out of their scope.
+        mask = None if mask is True or variable.level == frame.depth else mask
+
+        if not steps:
+            value = self._cast(value, variable.type)
+            variable.value = (value if mask is None else self._merge(
+                variable.value, value, mask))
+        else:
+            if variable.type[0] not in self._structs:
+                value = self._cast(value, (variable.type[0], 0))
+
+            variable.value = self._set_path(variable.value, steps, value, mask,
+                                            frame, True if mask is None else
+                                            mask)
+
+    def _call(self, function, values, mask):
+        scope = {}
+        global_frame = _Frame([])
+        for index, parameter in enumerate(function.parameters):
+            value = values[index] if index < len(values) else None
+            if value is None:
+                if parameter.default is None:
+                    raise CTLEvaluationError(
+                        f'"{function.name}" function "{parameter.name}" '
+                        f'argument is missing!')
+
+                value = self._evaluate(parameter.default, global_frame, True)
+
+            type_ = (parameter.type, len(parameter.dimensions))
+            scope[parameter.name] = _Variable(
+                self._cast(value, type_), type_, 0)
+
+        frame = _Frame([scope])
+        self._execute_statements(function.body.statements, frame, mask)
+
+        result = self._cast(
+            frame.result,
+            (function.return_type, len(function.return_dimensions)))
+
+        return result, scope
+
+    def call(self, name, values):
+        function = self._functions.get(name)
+        if function is None:
+            raise CTLEvaluationError(f'"{name}" function is not defined!')
+
+        return self._call(function, values, True)
+
+    def _execute_statements(self, statements, frame, mask):
+        frame.scopes.append({})
+        try:
+            for statement in statements:
+                active = self._active(frame, mask)
+                if active is None:
+                    break
+
+                self._execute(statement, frame, active)
+        finally:
+            frame.scopes.pop()
+
+    def _execute(self, statement, frame, mask):
+        if isinstance(statement, ExpressionStatement):
+            self._evaluate(statement.expression, frame, mask)
+        elif isinstance(statement, Declaration):
+            for declarator in statement.declarators:
+                type_ = (statement.type, len(declarator.dimensions))
+                if declarator.initializer is None:
+                    value = self._default(statement.type,
+                                          declarator.dimensions, frame)
+                else:
+                    value = self._initialise(
+                        statement.type, declarator.dimensions,
+                        declarator.initializer, frame, mask)
+
+                frame.scopes[-1][declarator.name] = _Variable(
+                    self._cast(value, type_), type_, frame.depth)
+        elif isinstance(statement, Block):
+            self._execute_statements(statement.statements, frame, mask)
+        elif isinstance(statement, If):
+            self._execute_if(statement, frame, mask)
+        elif isinstance(statement, (For, While)):
+            self._execute_loop(statement, frame, mask)
+        elif isinstance(statement, Return):
+            self._execute_return(statement, frame, mask)
+        else:
+            raise CTLEvaluationError(
+                f'"{type(statement).__name__}" statement is not supported!')
+
+    def _execute_if(self, statement, frame, mask):
+        condition = self._truth(
+            self._evaluate(statement.condition, frame, mask))
+
+        if condition.size == 1:
+            branch = (statement.then
+                      if condition.reshape(-1)[0] else statement.otherwise)
+            if branch is not None:
+                self._execute(branch, frame, mask)
+
+            return
+
+        mask_then, mask_otherwise = self._split(mask, condition)
+        frame.depth += 1
+        try:
+            if mask_then.any():
+                self._execute(statement.then, frame, mask_then)
+
+            if statement.otherwise is not None:
+                mask_otherwise = self._active(frame, mask_otherwise)
+                if mask_otherwise is not None and np.any(mask_otherwise):
+                    self._execute(statement.otherwise, frame, mask_otherwise)
+        finally:
+            frame.depth -= 1
+
+    def _execute_loop(self, statement, frame, mask):
+        frame.scopes.append({})
+        depth = frame.depth
+        try:
+            if isinstance(statement, For):
+                if statement.initialisation is not None:
+                    self._execute(statement.initialisation, frame, mask)
+                step = statement.step
+            else:
+                step = None
+
+            for _iteration in range(_MAXIMUM_ITERATIONS):
+                mask = self._active(frame, mask)
+                if mask is None:
+                    break
+
+                if statement.condition is not None:
+                    condition = self._truth(
+                        self._evaluate(statement.condition, frame, mask))
+
+                    if condition.size == 1:
+                        if not condition.reshape(-1)[0]:
+                            break
+                    else:
+                        mask = self._split(mask, condition)[0]
+                        if not mask.any():
+                            break
+
+                        frame.depth = depth + 1
+
+                self._execute(statement.body, frame, mask)
+
+                if step is not None:
+                    active = self._active(frame, mask)
+                    if active is None:
+                        break
+
+                    self._evaluate(step, frame, active)
+            else:
+                raise CTLEvaluationError(
+                    f'Loop exceeded {_MAXIMUM_ITERATIONS} iterations!')
+        finally:
+            frame.depth = depth
+            frame.scopes.pop()
+
+    def _execute_return(self, statement, frame, mask):
+        if statement.value is not None:
+            value = self._evaluate(statement.value, frame, mask)
+            frame.result = (value if mask is True or frame.result is None else
+                            self._merge(frame.result, value, mask))
+
+        if mask is True:
+            frame.returned = True
+        elif frame.returned is False:
+            frame.returned = mask
+        else:
+            frame.returned = frame.returned | mask
+
+    def _evaluate(self, expression, frame, mask):
+        if isinstance(expression, Literal):
+            if isinstance(expression.value, str):
+                return expression.value
+
+            return self._lift(expression.value)
+        elif isinstance(expression, Name):
+            variable = self._lookup(expression.name, frame)
+            if variable is not None:
+                return variable.value
+
+            constant = self._constants.get(expression.name)
+            if constant is not None:
+                return constant
+
+            raise CTLEvaluationError(f'"{expression.name}" is not defined!')
+        elif isinstance(expression, Binary):
+            return self._evaluate_binary(expression, frame, mask)
+        elif isinstance(expression, Unary):
+            operand = self._evaluate(expression.operand, frame, mask)
+            if expression.operator == '-':
+                return np.negative(operand)
+            elif expression.operator == '!':
+                return np.logical_not(operand)
+
+            return operand
+        elif isinstance(expression, Call):
+            return self._evaluate_call(expression, frame, mask)
+        elif isinstance(expression, Index):
+            return self._index(
+                self._evaluate(expression.value, frame, mask),
+                self._evaluate(expression.index, frame, mask))
+        elif isinstance(expression, Member):
+            value = self._evaluate(expression.value, frame, mask)
+            if not isinstance(value, dict) or expression.name not in value:
+                raise CTLEvaluationError(
+                    f'"{expression.name}" member is not defined!')
+
+            return value[expression.name]
+        elif isinstance(expression, Assignment):
+            value = self._evaluate(expression.value, frame, mask)
+            if expression.operator != '=':
+                value = self._binary(expression.operator[0],
+                                     self._evaluate(expression.target, frame,
+                                                    mask), value)
+
+            self._assign(expression.target, value, frame, mask)
+
+            return value
+        elif isinstance(expression, Increment):
+            value = self._evaluate(expression.target, frame, mask)
+            incremented_value = self._binary(expression.operator[0], value,
+                                             self._lift(1))
+            self._assign(expression.target, incremented_value, frame, mask)
+
+            return incremented_value if expression.prefix else value
+        elif isinstance(expression, Conditional):
+            condition = self._truth(
+                self._evaluate(expression.condition, frame, mask))
+            if condition.size == 1:
+                return self._evaluate(
+                    expression.consequent if condition.reshape(-1)[0] else
+                    expression.alternative, frame, mask)
+
+            consequent = self._evaluate(expression.consequent, frame, mask)
+            alternative = self._evaluate(expression.alternative, frame, mask)
+
+            return self._merge(alternative, consequent, condition)
+        elif isinstance(expression, InitializerList):
+            return self._stack([
+                self._evaluate(element, frame, mask)
+                for element in expression.elements
+            ])
+
+        raise CTLEvaluationError(
+            f'"{type(expression).__name__}" expression is not supported!')
+
+    def _binary(self, operator, left, right):
+        if operator == '+':
+            return np.add(left, right)
+        elif operator == '-':
+            return np.subtract(left, right)
+        elif operator == '*':
+            return np.multiply(left, right)
+        elif operator == '/':
+            if left.dtype.kind in 'iu' and right.dtype.kind in 'iu':
+                return self._cast(np.true_divide(left, right), ('int', 0))
+
+            return np.true_divide(left, right)
+        elif operator == '%':
+            return np.fmod(left, right)
+        elif operator == '==':
+            return np.equal(left, right)
+        elif operator == '!=':
+            return np.not_equal(left, right)
+        elif operator == '<':
+            return np.less(left, right)
+        elif operator == '>':
+            return np.greater(left, right)
+        elif operator == '<=':
+            return np.less_equal(left, right)
+        elif operator == '>=':
+            return np.greater_equal(left, right)
+
+        raise CTLEvaluationError(f'"{operator}" operator is not supported!')
+
+    def _evaluate_binary(self, expression, frame, mask):
+        operator = expression.operator
+        left = self._evaluate(expression.left, frame, mask)
+
+        if operator in ('&&', '||'):
+            left = self._truth(left)
+            # Uniform operands short-circuit as in "C".
+            if left.size == 1 and bool(
+                    left.reshape(-1)[0]) == (operator == '||'):
+                return left
+
+            right = self._truth(self._evaluate(expression.right, frame, mask))
+
+            return (np.logical_and(left, right)
+                    if operator == '&&' else np.logical_or(left, right))
+
+        return self._binary(operator, left,
+                            self._evaluate(expression.right, frame, mask))
+
+    def _evaluate_call(self, expression, frame, mask):
+        function = self._functions.get(expression.name)
+        if function is None:
+            builtin = _builtins().get(expression.name)
+            if builtin is None:
+                raise CTLEvaluationError(
+                    f'"{expression.name}" function is not defined!')
+
+            return builtin(*[
+                self._evaluate(argument, frame, mask)
+                for argument in expression.arguments
+            ])
+
+        values = []
+        for parameter, argument in zip(function.parameters,
+                                       expression.arguments):
+            if isinstance(argument, InitializerList):
+                values.append(
+                    self._initialise(parameter.type, parameter.dimensions,
+                                     argument, frame, mask))
+            else:
+                values.append(self._evaluate(argument, frame, mask))
+
+        result, scope = self._call(function, values, mask)
+
+        for parameter, argument in zip(function.parameters,
+                                       expression.arguments):
+            if 'output' in parameter.qualifiers:
+                self._assign(argument, scope[parameter.name].value, frame,
+                             mask)
+
+        return result
+
+
+class CTLFunction:
+    """
+    Vectorised *NumPy* evaluator of a *CTL* program *main* function.
+
+    The varying input parameters of *main*, e.g. *rIn*, *gIn*, *bIn* and
+    *aIn*, are fed from the channels of an array of shape (..., 3) and the
+    first three varying output parameters are returned as an array of the
+    same shape. Data dependent control flow is evaluated with masks so that
+    whole images are processed at once.
+
+    Parameters
+    ----------
+    definitions : array_like
+        Definitions of the program and of the modules it imports, in
+        dependency order.
+    name : unicode, optional
+        Name of the program.
+    """
+
+    def __init__(self, definitions, name=None):
+        self._definitions = list(definitions)
+        self._name = name
+        self._evaluators = {}
+        self._lock = threading.Lock()
+
+        main = [
+            definition for definition in self._definitions
+            if isinstance(definition, Function) and definition.name == 'main'
+        ]
+        if not main:
+            raise CTLEvaluationError(f'"{name}" has no "main" function!')
+
+        self._main = main[-1]
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def parameters(self):
+        return self._main.parameters
+
+    def _evaluator(self, batch_dimensions):
+        with self._lock:
+            evaluator = self._evaluators.get(batch_dimensions)
+            if evaluator is None:
+                evaluator = self._evaluators[batch_dimensions] = _Evaluator(
+                    self._definitions, batch_dimensions)
+
+        return evaluator
+
+    def __call__(self, RGB, alpha=None, **kwargs):
+        """
+        Evaluates the program on given *RGB* array.
+
+        Parameters
+        ----------
+        RGB : array_like
+            *RGB* array of shape (..., 3).
+        alpha : array_like, optional
+            Alpha channel fed to the fourth varying input, defaults to 1.
+
+        Other Parameters
+        ----------------
+        \\**kwargs : dict, optional
+            Values of the uniform input parameters of *main*, the default
+            values declared by the program are used otherwise.
+
+        Returns
+        -------
+        ndarray
+            Output *RGB* array of shape (..., 3).
+        """
+
+        is_numpy_installed(raise_exception=True)
+
+        RGB = np.asarray(RGB, dtype=np.float64)
+        if RGB.shape[-1:] != (3, ):
+            raise ValueError('"RGB" array must have a (..., 3) shape!')
+
+        batch_shape = RGB.shape[:-1]
+        channels = [RGB[..., 0], RGB[..., 1], RGB[..., 2]]
+        channels.append(
+            np.ones(batch_shape) if alpha is None else np.broadcast_to(
+                np.asarray(alpha, dtype=np.float64), batch_shape))
+
+        evaluator = self._evaluator(len(batch_shape))
+
+        values, outputs = [], []
+        for parameter in self._main.parameters:
+            if 'output' in parameter.qualifiers:
+                values.append(
+                    evaluator._default(parameter.type, parameter.dimensions,
+                                       _Frame([])))
+                if 'varying' in parameter.qualifiers:
+                    outputs.append(parameter.name)
+            elif 'varying' in parameter.qualifiers:
+                if not channels:
+                    raise CTLEvaluationError(
+                        'Only 4 varying input parameters are supported!')
+
+                values.append(channels.pop(0))
+            elif parameter.name in kwargs:
+                values.append(evaluator._lift(kwargs.pop(parameter.name)))
+            else:
+                values.append(None)
+
+        if kwargs:
+            raise TypeError(f'Unexpected uniform parameters: {list(kwargs)}!')
+
+        with np.errstate(all='ignore'):
+            _result, scope = evaluator.call('main', values)
+
+        return np.stack(
+            [
+                np.broadcast_to(scope[name].value, batch_shape)
+                for name in outputs[:3]
+            ],
+            axis=-1)
+
+
+def _parse_ctl_file(path, modification_time):
+    # The abstract syntax trees are cached per path, a modified file replaces
+    # its previous tree so that the cache does not grow with the edits.
+    with _PARSED_CTL_FILES_LOCK:
+        cached_modification_time, program = _PARSED_CTL_FILES.get(
+            path, (None, None))
+
+    if cached_modification_time == modification_time:
+        return program
+
+    with open(path) as ctl_file:
+        program = parse_ctl(ctl_file.read())
+
+    with _PARSED_CTL_FILES_LOCK:
+        _PARSED_CTL_FILES[path] = (modification_time, program)
+
+    return program
+
+
+def _modification_time(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def find_ctl_module(module, search_directories):
+    """
+    Finds the file of given *CTL* module, e.g. *ACESlib.Utilities*.
+
+    Parameters
+    ----------
+    module : unicode
+        *CTL* module name.
+    search_directories : array_like
+        Directories to search.
+
+    Returns
+    -------
+    unicode
+        *CTL* module path.
+
+    Raises
+    ------
+    CTLEvaluationError
+        If the module cannot be found.
+    """
+
+    for directory in search_directories:
+        path = os.path.join(directory, f'{module}.ctl')
+        if os.path.isfile(path):
+            return path
+
+    raise CTLEvaluationError(f'"{module}" CTL module cannot be found!')
+
+
+def _search_directories(path, library_directories):
+    directories = list(library_directories or [])
+
+    directory = os.path.dirname(os.path.abspath(path))
+    directories.append(directory)
+    while True:
+        directories.append(os.path.join(directory, 'lib'))
+        parent_directory = os.path.dirname(directory)
+        if parent_directory == directory:
+            break
+        directory = parent_directory
+
+    return directories
+
+
+def _link(path, library_directories, definitions, linked_paths):
+    # The modification times of the linked files are stored so that the
+    # compiled transforms are recompiled when any of them changes.
+    if path in linked_paths:
+        return
+
+    linked_paths[path] = os.stat(path).st_mtime_ns
+
+    program = _parse_ctl_file(path, linked_paths[path])
+    search_directories = _search_directories(path, library_directories)
+    for import_ in program.imports:
+        _link(
+            find_ctl_module(import_.module, search_directories),
+            library_directories, definitions, linked_paths)
+
+    definitions.extend(program.definitions)
+
+
+def compile_ctl_transform(ctl_transform, library_directories=None):
+    """
+    Compiles given *CTL* transform and the modules it imports into a
+    vectorised *NumPy* function.
+
+    The compiled functions are cached per transform path and library
+    directories, and are compiled again when the transform or any of the
+    modules it imports is modified.
+
+    Parameters
+    ----------
+    ctl_transform : CTLTransform
+        *CTL* transform to compile.
+    library_directories : array_like, optional
+        Directories to search the imported modules, e.g. *ACESlib.Utilities*,
+        into before the transform directory and the *lib* directories of its
+        ancestors.
+
+    Returns
+    -------
+    CTLFunction
+        Compiled function.
+
+    Examples
+    --------
+    >>> from discover_aces_dev.discover import CTLTransform
+    >>> import numpy as np
+    >>> ctl_transform = CTLTransform('ACEScsc.Academy.ACES_to_ACEScg.ctl')
+    ... # doctest: +SKIP
+    >>> compile_ctl_transform(ctl_transform)(np.ones([1080, 1920, 3])).shape
+    ... # doctest: +SKIP
+    (1080, 1920, 3)
+    """
+
+    path = os.path.abspath(ctl_transform.path)
+    key = (path, tuple(library_directories or ()))
+    with _COMPILED_CTL_TRANSFORMS_LOCK:
+        linked_paths, ctl_function = _COMPILED_CTL_TRANSFORMS.get(
+            key, (None, None))
+
+    if ctl_function is not None and all(
+            _modification_time(linked_path) == modification_time
+            for linked_path, modification_time in linked_paths):
+        return ctl_function
+
+    # The transform is compiled without holding the lock so that compiling a
+    # transform does not block the other ones, concurrent compilations of the
+    # same files keep the first inserted function.
+    definitions, linked_paths = [], {}
+    _link(path, library_directories, definitions, linked_paths)
+    linked_paths = tuple(linked_paths.items())
+    ctl_function = CTLFunction(definitions, ctl_transform.id or
+                               ctl_transform.path)
+
+    with _COMPILED_CTL_TRANSFORMS_LOCK:
+        cached_linked_paths, cached_ctl_function = (
+            _COMPILED_CTL_TRANSFORMS.get(key, (None, None)))
+        if cached_linked_paths == linked_paths:
+            return cached_ctl_function
+
+        _COMPILED_CTL_TRANSFORMS[key] = (linked_paths, ctl_function)
+
+    return ctl_function
+
+
+def clear_compiled_ctl_transforms():
+    """
+    Clears the compiled *CTL* transforms cache.
+    """
+
+    with _COMPILED_CTL_TRANSFORMS_LOCK:
+        _COMPILED_CTL_TRANSFORMS.clear()
+
+    with _PARSED_CTL_FILES_LOCK:
+        _PARSED_CTL_FILES.clear()
+
+
+def evaluate_ctl_transform(ctl_transform,
+                           RGB,
+                           alpha=None,
+                           library_directories=None,
+                           **kwargs):
+    """
+    Evaluates given *CTL* transform on given *RGB* array.
+
+    Parameters
+    ----------
+    ctl_transform : CTLTransform
+        *CTL* transform to evaluate.
+    RGB : array_like
+        *RGB* array of shape (..., 3).
+    alpha : array_like, optional
+        Alpha channel, defaults to 1.
+    library_directories : array_like, optional
+        Directories to search the imported modules into.
+
+    Other Parameters
+    ----------------
+    \\**kwargs : dict, optional
+        Values of the uniform input parameters of the transform.
+
+    Returns
+    -------
+    ndarray
+        Output *RGB* array of shape (..., 3).
+    """
+
+    return compile_ctl_transform(ctl_transform,
+                                 library_directories)(RGB, alpha, **kwargs)
@@ -1,16 +1,33 @@
 # -*- coding: utf-8 -*-
 
+import functools
+import hashlib
 import logging
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+import threading
 
 from discover_aces_dev.common import is_networkx_installed
-from discover_aces_dev.discover import (CTLTransform, CTLTransformPair,
-                                        classify_aces_ctl_transforms,
-                                        discover_aces_ctl)
+from discover_aces_dev.compact_graph import CompactGraph
+from discover_aces_dev.discover import (
+    REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT, CTLTransform, CTLTransformPair,
+    classify_aces_ctl_transforms, discover_aces_ctl)
+from discover_aces_dev.instrumentation import count, timer
+from discover_aces_dev.ranking import WEIGHTING_POLICIES, KShortestPathsTable
 
-if is_networkx_installed():  # pragma: no cover
-    import networkx as nx
-
-__all__ = []
+__all__ = [
+    'CONVERSION_GRAPH_FILTERERS', 'get_compact_conversion_graph',
+    'get_conversion_graph', 'invalidate_conversion_graph', 'conversion_path',
+    'ranked_conversion_paths',
+    'CONVERSION_GRAPH_NODE_ATTRIBUTES', 'CONVERSION_GRAPH_EDGE_ATTRIBUTES',
+    'CONVERSION_GRAPH_HUBS', 'CONVERSION_GRAPH_HUB_ATTRIBUTES',
+    'CONVERSION_GRAPH_CLUSTERS', 'CONVERSION_GRAPH_PLOT_CACHE_DIRECTORY',
+    'conversion_graph_to_dot', 'plot_automatic_colour_conversion_graph',
+    'render_automatic_colour_conversion_graph'
+]
 
 
 def _exclusion_filterer_ARRIIDT(filename):
@@ -23,11 +40,67 @@ def _exclusion_filterer_ARRIIDT(filename):
     return False
 
 
-def _build_graph():
-    unclassified_ctl_transforms = []
-    classified_ctl_transforms = classify_aces_ctl_transforms(
-        discover_aces_ctl(filterers=[_exclusion_filterer_ARRIIDT]))
+CONVERSION_GRAPH_FILTERERS = [_exclusion_filterer_ARRIIDT]
+
+CONVERSION_GRAPH_NODE_ATTRIBUTES = {
+    'fontname': 'Helvetica',
+    'fontsize': 20,
+    'shape': 'circle',
+    'style': 'filled',
+}
+"""
+Default *Graphviz* attributes of the automatic colour conversion graph nodes.
+"""
+
+CONVERSION_GRAPH_EDGE_ATTRIBUTES = {'color': '#26323870'}
+"""
+Default *Graphviz* attributes of the automatic colour conversion graph edges.
+"""
+
+CONVERSION_GRAPH_HUBS = ('ACES2065-1', 'OCES')
+"""
+Automatic colour conversion graph nodes most conversions go through.
+"""
+
+CONVERSION_GRAPH_HUB_ATTRIBUTES = {
+    'color': '#673AB7FF',
+    'fillcolor': '#673AB770',
+    'fontsize': 30,
+    'shape': 'doublecircle',
+}
+"""
+*Graphviz* attributes of the automatic colour conversion graph hubs.
+"""
+
+CONVERSION_GRAPH_CLUSTERS = {
+    'ACEScsc': (('ACEScsc', ), '#00BCD4FF', '#00BCD470'),
+    'IDT': (('IDT', ), '#B3BC6D', '#E6EE9C'),
+    'ODT': (('ODT', 'InvODT'), '#CA9B52', '#FFCC80'),
+    'OutputTransform': (('RRTODT', 'InvRRTODT'), '#C88719', '#FFB74D'),
+    'LMT': (('LMT', ), '#4BA3C7', '#81D4FA'),
+}
+"""
+Automatic colour conversion graph clusters as *(node_types, color,
+fillcolor)* tuples keyed by name.
+"""
 
+CONVERSION_GRAPH_PLOT_CACHE_DIRECTORY = os.path.join(
+    tempfile.gettempdir(), 'discover-aces-dev', 'plots')
+"""
+Default cache directory of the automatic colour conversion graph renders.
+"""
+
+_CONVERSION_GRAPHS = {}
+
+_COMPACT_CONVERSION_GRAPHS = {}
+
+_K_SHORTEST_PATHS_TABLES = {}
+
+_CONVERSION_GRAPHS_LOCK = threading.RLock()
+
+
+def _unclassify_ctl_transforms(classified_ctl_transforms):
+    unclassified_ctl_transforms = []
     for category, classifiers in classified_ctl_transforms.items():
         for classifier, ctl_transforms in classifiers.items():
             for name, ctl_transform in ctl_transforms.items():
@@ -39,85 +112,565 @@ def _build_graph():
                     unclassified_ctl_transforms.append(
                         ctl_transform.inverse_transform)
 
-    graph = nx.DiGraph()
+    return unclassified_ctl_transforms
 
-    for ctl_transform in unclassified_ctl_transforms:
-        source = ctl_transform.source
-        target = ctl_transform.target
 
-        if source is None or target is None:
-            continue
+def _build_compact_graph(
+        root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
+        filterers=None):
+    if filterers is None:
+        filterers = CONVERSION_GRAPH_FILTERERS
+
+    classified_ctl_transforms = classify_aces_ctl_transforms(
+        discover_aces_ctl(root_directory, filterers))
+
+    with timer('graph_build'):
+        return CompactGraph.from_ctl_transforms(
+            _unclassify_ctl_transforms(classified_ctl_transforms))
+
+
+def _build_graph(root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
+                 filterers=None):
+    return get_compact_conversion_graph(root_directory,
+                                        filterers).to_networkx()
+
+
+def _conversion_graph_key(root_directory, filterers):
+    if filterers is None:
+        filterers = CONVERSION_GRAPH_FILTERERS
+
+    return (os.path.normpath(os.path.expandvars(root_directory)),
+            tuple(filterers))
+
+
+def get_compact_conversion_graph(
+        root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
+        filterers=None):
+    """
+    Returns the automatic colour conversion graph for given transforms root
+    directory and filterers as a :class:`discover_aces_dev.CompactGraph`
+    class instance, *NetworkX* is not required.
+
+    The graph is built on first request and memoized per root directory and
+    filterers combination until :func:`invalidate_conversion_graph`
+    definition is called.
+
+    Parameters
+    ----------
+    root_directory : unicode, optional
+        Transforms root directory.
+    filterers : array_like, optional
+        Filterers passed to :func:`discover_aces_dev.discover_aces_ctl`
+        definition, defaults to :attr:`CONVERSION_GRAPH_FILTERERS`.
+
+    Returns
+    -------
+    CompactGraph
+        Automatic colour conversion graph.
+    """
+
+    key = _conversion_graph_key(root_directory, filterers)
+    with _CONVERSION_GRAPHS_LOCK:
+        graph = _COMPACT_CONVERSION_GRAPHS.get(key)
+        if graph is None:
+            graph = _COMPACT_CONVERSION_GRAPHS[key] = _build_compact_graph(
+                *key)
 
-        graph.add_node(source, ctl_transform_type=ctl_transform.type)
-        graph.add_node(target, ctl_transform_type=ctl_transform.type)
+    return graph
+
+
+def get_conversion_graph(
+        root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
+        filterers=None):
+    """
+    Returns the automatic colour conversion graph for given transforms root
+    directory and filterers as a *NetworkX* directed graph.
+
+    The graph is built on first request and memoized per root directory and
+    filterers combination until :func:`invalidate_conversion_graph`
+    definition is called.
 
-        graph.add_edge(source, target)
+    Parameters
+    ----------
+    root_directory : unicode, optional
+        Transforms root directory.
+    filterers : array_like, optional
+        Filterers passed to :func:`discover_aces_dev.discover_aces_ctl`
+        definition, defaults to :attr:`CONVERSION_GRAPH_FILTERERS`.
+
+    Returns
+    -------
+    DiGraph
+        Automatic colour conversion graph.
+    """
+
+    is_networkx_installed(raise_exception=True)
+
+    key = _conversion_graph_key(root_directory, filterers)
+    with _CONVERSION_GRAPHS_LOCK:
+        graph = _CONVERSION_GRAPHS.get(key)
+        if graph is None:
+            graph = _CONVERSION_GRAPHS[key] = _build_graph(*key)
 
     return graph
 
 
-CONVERSION_GRAPH = _build_graph() if is_networkx_installed() else None
+def invalidate_conversion_graph(root_directory=None, filterers=None):
+    """
+    Invalidates the memoized automatic colour conversion graphs.
+
+    Parameters
+    ----------
+    root_directory : unicode, optional
+        Transforms root directory of the graph to invalidate, all the graphs
+        are invalidated if *None*.
+    filterers : array_like, optional
+        Filterers of the graph to invalidate, defaults to
+        :attr:`CONVERSION_GRAPH_FILTERERS`.
+    """
+
+    with _CONVERSION_GRAPHS_LOCK:
+        if root_directory is None:
+            _CONVERSION_GRAPHS.clear()
+            _COMPACT_CONVERSION_GRAPHS.clear()
+            _K_SHORTEST_PATHS_TABLES.clear()
+        else:
+            key = _conversion_graph_key(root_directory, filterers)
+            _CONVERSION_GRAPHS.pop(key, None)
+            _COMPACT_CONVERSION_GRAPHS.pop(key, None)
+            for table_key in list(_K_SHORTEST_PATHS_TABLES):
+                if table_key[0] == key:
+                    del _K_SHORTEST_PATHS_TABLES[table_key]
+
+        _conversion_path.cache_clear()
+
+
+def __getattr__(attribute):
+    # "CONVERSION_GRAPH" is built lazily on first access rather than at import
+    # time.
+    if attribute == 'CONVERSION_GRAPH':
+        return get_conversion_graph() if is_networkx_installed() else None
+
+    raise AttributeError(
+        f'module {__name__!r} has no attribute {attribute!r}')
+
+
+@functools.lru_cache(maxsize=4096)
+def _conversion_path(source, target, key):
+    graph = get_compact_conversion_graph(*key)
+
+    with _CONVERSION_GRAPHS_LOCK:
+        graph.precompute_shortest_paths()
+
+    path = None
+    if source in graph and target in graph:
+        path = graph.shortest_path(source, target)
+
+    if path is None:
+        raise ValueError(
+            f'No conversion path exists from "{source}" to "{target}"!')
+
+    return tuple(graph.path_edge_data(path))
+
+
+def conversion_path(source,
+                    target,
+                    root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
+                    filterers=None):
+    """
+    Returns the chain of *CTL* transforms converting from given source to
+    given target colourspace.
+
+    The shortest paths between all the nodes of the automatic colour
+    conversion graph are computed once on first request and the queries are
+    cached. *NetworkX* is not required.
+
+    Parameters
+    ----------
+    source : unicode
+        Source colourspace, e.g. *ACEScg* or an *IDT* name.
+    target : unicode
+        Target colourspace, e.g. an *ODT* name.
+    root_directory : unicode, optional
+        Transforms root directory.
+    filterers : array_like, optional
+        Filterers passed to :func:`discover_aces_dev.discover_aces_ctl`
+        definition, defaults to :attr:`CONVERSION_GRAPH_FILTERERS`.
+
+    Returns
+    -------
+    list
+        Ordered :class:`discover_aces_dev.CTLTransform` class instances.
+
+    Raises
+    ------
+    ValueError
+        If no conversion path exists between the source and target.
+
+    Examples
+    --------
+    >>> conversion_path('ACEScg', 'Rec709_100nits_dim')  # doctest: +SKIP
+    [CTLTransform('ACEScg_to_ACES', 'ACEScsc.Academy.ACEScg_to_ACES.ctl'), \
+CTLTransform('None', 'RRT.ctl'), \
+CTLTransform('Rec709_100nits_dim', 'ODT.Academy.Rec709_100nits_dim.ctl')]
+    """
+
+    return list(
+        _conversion_path(source, target,
+                         _conversion_graph_key(root_directory, filterers)))
+
+
+def ranked_conversion_paths(
+        source,
+        target,
+        k=3,
+        policy='default',
+        root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
+        filterers=None):
+    """
+    Returns the *k* best chains of *CTL* transforms converting from given
+    source to given target colourspace, ranked by their total weight under
+    given weighting policy.
+
+    The *k* best paths between all the nodes of the automatic colour
+    conversion graph are computed once per weighting policy into a
+    :class:`discover_aces_dev.KShortestPathsTable` class instance, until
+    :func:`invalidate_conversion_graph` definition is called. *NetworkX* is
+    not required.
+
+    Parameters
+    ----------
+    source : unicode
+        Source colourspace, e.g. *ACEScg* or an *IDT* name.
+    target : unicode
+        Target colourspace, e.g. an *ODT* name.
+    k : int, optional
+        Maximum path count.
+    policy : WeightingPolicy or unicode, optional
+        Weighting policy or name of a
+        :attr:`discover_aces_dev.WEIGHTING_POLICIES` attribute policy.
+    root_directory : unicode, optional
+        Transforms root directory.
+    filterers : array_like, optional
+        Filterers passed to :func:`discover_aces_dev.discover_aces_ctl`
+        definition, defaults to :attr:`CONVERSION_GRAPH_FILTERERS`.
+
+    Returns
+    -------
+    list
+        *(weight, ctl_transforms)* tuples sorted by increasing total weight,
+        where *ctl_transforms* is the ordered list of
+        :class:`discover_aces_dev.CTLTransform` class instances.
+
+    Raises
+    ------
+    ValueError
+        If no conversion path exists between the source and target.
+
+    Examples
+    --------
+    >>> [(weight, [ctl_transform.type for ctl_transform in ctl_transforms])
+    ...  for weight, ctl_transforms in ranked_conversion_paths(
+    ...      'ACES2065-1', 'Rec709_100nits_dim', 1)]  # doctest: +SKIP
+    [(3.0, ['RRT', 'ODT'])]
+    """
+
+    if isinstance(policy, str):
+        policy = WEIGHTING_POLICIES[policy]
+
+    graph_key = _conversion_graph_key(root_directory, filterers)
+    key = (graph_key, policy, k)
+    with _CONVERSION_GRAPHS_LOCK:
+        table = _K_SHORTEST_PATHS_TABLES.get(key)
+        if table is None:
+            table = _K_SHORTEST_PATHS_TABLES[key] = KShortestPathsTable(
+                get_compact_conversion_graph(*graph_key), k, policy)
+
+    paths = table.paths(source, target)
+    if not paths:
+        raise ValueError(
+            f'No conversion path exists from "{source}" to "{target}"!')
+
+    return paths
+
+
+def _quote(identifier):
+    identifier = str(identifier).replace('\\', '\\\\').replace('"', '\\"')
+
+    return f'"{identifier}"'
+
+
+def _attributes(attributes):
+    return ', '.join(f'{attribute}={_quote(value)}'
+                     for attribute, value in attributes.items())
+
+
+def conversion_graph_to_dot(graph=None, node=None, radius=1, cluster=None):
+    """
+    Writes given automatic colour conversion graph, or the subgraph around
+    given node or of given cluster, to the *DOT* language with the same style
+    as :func:`plot_automatic_colour_conversion_graph` definition, neither
+    *NetworkX* nor *PyGraphviz* are required.
+
+    Parameters
+    ----------
+    graph : CompactGraph, optional
+        Automatic colour conversion graph, defaults to the graph returned by
+        :func:`get_compact_conversion_graph` definition.
+    node : unicode, optional
+        Colourspace whose neighbourhood is written.
+    radius : int, optional
+        Maximum edge count between given node and the written nodes.
+    cluster : unicode, optional
+        {'ACEScsc', 'IDT', 'ODT', 'OutputTransform', 'LMT'}, cluster whose
+        nodes are written along with their direct neighbours.
+
+    Returns
+    -------
+    unicode
+        *DOT* source, identical graphs and styles yielding identical sources.
+
+    Raises
+    ------
+    ValueError
+        If the cluster is invalid.
+
+    Examples
+    --------
+    >>> print(conversion_graph_to_dot(node='ACEScg'))  # doctest: +SKIP
+    digraph {
+    ...
+    """
+
+    if graph is None:
+        graph = get_compact_conversion_graph()
+
+    nodes = None
+    if node is not None:
+        nodes = graph.neighbourhood(node, radius)
+
+    if cluster is not None:
+        if cluster not in CONVERSION_GRAPH_CLUSTERS:
+            raise ValueError(f'"{cluster}" cluster is invalid, it must be one '
+                             f'of {list(CONVERSION_GRAPH_CLUSTERS)}!')
+
+        node_types = CONVERSION_GRAPH_CLUSTERS[cluster][0]
+        cluster_nodes = graph.neighbourhood([
+            cluster_node
+            for cluster_node, node_type in zip(graph.nodes, graph.node_types)
+            if node_type in node_types
+        ], 1)
+
+        nodes = (cluster_nodes
+                 if nodes is None else nodes.intersection(cluster_nodes))
+
+    if nodes is not None:
+        graph = graph.subgraph(nodes)
+
+    lines = [
+        'digraph {',
+        f'\tnode [{_attributes(CONVERSION_GRAPH_NODE_ATTRIBUTES)}];',
+        f'\tedge [{_attributes(CONVERSION_GRAPH_EDGE_ATTRIBUTES)}];',
+    ]
+
+    clusters = {cluster: [] for cluster in CONVERSION_GRAPH_CLUSTERS}
+    for node, node_type in zip(graph.nodes, graph.node_types):
+        attributes = {}
+        if node in CONVERSION_GRAPH_HUBS:
+            attributes = CONVERSION_GRAPH_HUB_ATTRIBUTES
+        else:
+            for cluster, (node_types, color,
+                          fillcolor) in CONVERSION_GRAPH_CLUSTERS.items():
+                if node_type in node_types:
+                    attributes = {'color': color, 'fillcolor': fillcolor}
+                    clusters[cluster].append(node)
+                    break
+
+        lines.append(f'\t{_quote(node)} [{_attributes(attributes)}];')
+
+    for cluster, cluster_nodes in clusters.items():
+        if not cluster_nodes:
+            continue
+
+        lines.append(f'\tsubgraph {_quote(f"cluster_{cluster}")} {{')
+        lines.append(f'\t\tgraph [color='
+                     f'{_quote(CONVERSION_GRAPH_CLUSTERS[cluster][1])}];')
+        lines.extend(f'\t\t{_quote(node)};' for node in cluster_nodes)
+        lines.append('\t}')
+
+    # Parallel edges are merged as in the "NetworkX" directed graph.
+    edges = dict.fromkeys(
+        (source, target) for source, target, _data in graph.edges())
+    lines.extend(f'\t{_quote(source)} -> {_quote(target)};'
+                 for source, target in edges)
+    lines.append('}')
+
+    return '\n'.join(lines) + '\n'
 
 
 def plot_automatic_colour_conversion_graph(filename, prog='dot', args=''):
+    """
+    Plots the automatic colour conversion graph to given file with
+    *PyGraphviz*.
+
+    See :func:`render_automatic_colour_conversion_graph` definition to plot
+    the graph without *PyGraphviz* and cache the renders.
+
+    Parameters
+    ----------
+    filename : unicode
+        Output filename.
+    prog : unicode, optional
+        *Graphviz* layout program, e.g. *dot*, *neato* or *sfdp*.
+    args : unicode, optional
+        Additional *Graphviz* arguments.
+
+    Returns
+    -------
+    AGraph
+        *PyGraphviz* graph.
+
+    Examples
+    --------
+    >>> plot_automatic_colour_conversion_graph('graph.png')  # doctest: +SKIP
+    """
+
     if is_networkx_installed(raise_exception=True):
-        agraph = nx.nx_agraph.to_agraph(CONVERSION_GRAPH)
+        import networkx as nx
 
-        agraph.node_attr.update(
-            style='filled',
-            shape='circle',
-            fontname='Helvetica',
-            fontsize=20)
+        agraph = nx.nx_agraph.to_agraph(get_conversion_graph())
 
-        ctl_transforms_csc = []
-        ctl_transforms_idt = []
-        ctl_transforms_odt = []
-        ctl_transforms_output_transform = []
-        ctl_transforms_lmt = []
+        agraph.node_attr.update(CONVERSION_GRAPH_NODE_ATTRIBUTES)
 
+        clusters = {cluster: [] for cluster in CONVERSION_GRAPH_CLUSTERS}
         for node in agraph.nodes():
             ctl_transform_type = node.attr['ctl_transform_type']
-            if node in ('ACES2065-1', 'OCES'):
-                node.attr.update(
-                    shape='doublecircle',
-                    color='#673AB7FF',
-                    fillcolor='#673AB770',
-                    fontsize=30)
-            elif ctl_transform_type == 'ACEScsc':
-                node.attr.update(color='#00BCD4FF', fillcolor='#00BCD470')
-                ctl_transforms_csc.append(node)
-            elif ctl_transform_type == 'IDT':
-                node.attr.update(color='#B3BC6D', fillcolor='#E6EE9C')
-                ctl_transforms_idt.append(node)
-            elif ctl_transform_type in ('ODT', 'InvODT'):
-                node.attr.update(color='#CA9B52', fillcolor='#FFCC80')
-                ctl_transforms_odt.append(node)
-            elif ctl_transform_type in ('RRTODT', 'InvRRTODT'):
-                node.attr.update(color='#C88719', fillcolor='#FFB74D')
-                ctl_transforms_output_transform.append(node)
-            elif ctl_transform_type == 'LMT':
-                node.attr.update(color='#4BA3C7', fillcolor='#81D4FA')
-                ctl_transforms_lmt.append(node)
-
-        agraph.add_subgraph(
-            ctl_transforms_csc, name='cluster_ACEScsc', color='#00BCD4FF')
-        agraph.add_subgraph(
-            ctl_transforms_idt, name='cluster_IDT', color='#B3BC6D')
-        agraph.add_subgraph(
-            ctl_transforms_odt, name='cluster_ODT', color='#CA9B52')
-        agraph.add_subgraph(
-            ctl_transforms_output_transform,
-            name='cluster_OutputTransform',
-            color='#C88719')
-        agraph.add_subgraph(
-            ctl_transforms_lmt, name='cluster_LMT', color='#4BA3C7')
-
-        agraph.edge_attr.update(color='#26323870')
+            if node in CONVERSION_GRAPH_HUBS:
+                node.attr.update(CONVERSION_GRAPH_HUB_ATTRIBUTES)
+                continue
+
+            for cluster, (node_types, color,
+                          fillcolor) in CONVERSION_GRAPH_CLUSTERS.items():
+                if ctl_transform_type in node_types:
+                    node.attr.update(color=color, fillcolor=fillcolor)
+                    clusters[cluster].append(node)
+                    break
+
+        for cluster, cluster_nodes in clusters.items():
+            agraph.add_subgraph(
+                cluster_nodes,
+                name=f'cluster_{cluster}',
+                color=CONVERSION_GRAPH_CLUSTERS[cluster][1])
+
+        agraph.edge_attr.update(CONVERSION_GRAPH_EDGE_ATTRIBUTES)
         agraph.draw(filename, prog=prog, args=args)
 
         return agraph
 
 
+def render_automatic_colour_conversion_graph(
+        filename,
+        prog='dot',
+        args='',
+        node=None,
+        radius=1,
+        cluster=None,
+        cache_directory=CONVERSION_GRAPH_PLOT_CACHE_DIRECTORY):
+    """
+    Plots the automatic colour conversion graph, or the subgraph around given
+    node or of given cluster, to given file with *Graphviz*.
+
+    Unlike :func:`plot_automatic_colour_conversion_graph` definition, the
+    *DOT* source is written by :func:`conversion_graph_to_dot` definition and
+    rendered by the *Graphviz* executable, *PyGraphviz* is not required. The
+    renders are cached under given directory, keyed by the fingerprint of the
+    *DOT* source, i.e. of the graph and its style, the layout program, its
+    arguments and the output format, so that plotting an unchanged graph
+    again only copies the cached render.
+
+    Parameters
+    ----------
+    filename : unicode
+        Output filename, its extension is the output format, e.g. *png* or
+        *svg*. The *DOT* source is written without rendering for the *dot*
+        and *gv* extensions.
+    prog : unicode, optional
+        *Graphviz* layout program, e.g. *dot*, *neato* or *sfdp*.
+    args : unicode, optional
+        Additional *Graphviz* arguments.
+    node : unicode, optional
+        Colourspace whose neighbourhood is plotted.
+    radius : int, optional
+        Maximum edge count between given node and the plotted nodes.
+    cluster : unicode, optional
+        {'ACEScsc', 'IDT', 'ODT', 'OutputTransform', 'LMT'}, cluster whose
+        nodes are plotted along with their direct neighbours.
+    cache_directory : unicode, optional
+        Renders cache directory, the renders are not cached if *None*.
+
+    Returns
+    -------
+    unicode
+        *DOT* source.
+
+    Examples
+    --------
+    >>> render_automatic_colour_conversion_graph(
+    ...     'IDT.svg', cluster='IDT')  # doctest: +SKIP
+    """
+
+    dot = conversion_graph_to_dot(node=node, radius=radius, cluster=cluster)
+
+    extension = os.path.splitext(filename)[-1][1:].lower() or 'png'
+    if extension in ('dot', 'gv'):
+        with open(filename, 'w') as dot_file:
+            dot_file.write(dot)
+
+        return dot
+
+    arguments = [prog, f'-T{extension}'] + shlex.split(args)
+
+    cache_path = None
+    if cache_directory is not None:
+        fingerprint = hashlib.sha256(
+            '\0'.join([dot] + arguments).encode('utf-8')).hexdigest()
+        cache_path = os.path.join(cache_directory,
+                                  f'{fingerprint}.{extension}')
+
+        if os.path.exists(cache_path):
+            count('plot_cache_hits')
+            shutil.copyfile(cache_path, filename)
+
+            return dot
+
+        os.makedirs(cache_directory, exist_ok=True)
+
+    with timer('plot_layout'):
+        render = subprocess.run(
+            arguments,
+            input=dot.encode('utf-8'),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True).stdout
+
+    with open(filename, 'wb') as plot_file:
+        plot_file.write(render)
+
+    if cache_path is not None:
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=cache_directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as cache_file:
+                cache_file.write(render)
+
+            os.replace(temporary_path, cache_path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    return dot
+
+
 if __name__ == '__main__':
     from rich.logging import RichHandler
 
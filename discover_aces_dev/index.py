@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from collections import defaultdict
+
+from discover_aces_dev.discover import CTLTransformPair
+
+__all__ = ['TRANSFORM_INDEX_ATTRIBUTES', 'TransformIndex']
+
+TRANSFORM_INDEX_ATTRIBUTES = [
+    'type', 'namespace', 'name', 'source', 'target', 'version', 'user_name',
+    'category', 'classifiers'
+]
+"""
+Attributes the :class:`TransformIndex` class builds a secondary index for,
+the *id* being indexed as a primary key.
+"""
+
+
+def _version(ctl_transform):
+    version = (ctl_transform.major_version_number,
+               ctl_transform.minor_version_number,
+               ctl_transform.patch_version_number)
+
+    return '.'.join(
+        component for component in version if component is not None) or None
+
+
+class TransformIndex:
+    """
+    Secondary indexes over classified *CTL* transforms giving constant time
+    lookups by id, type, namespace, name, source, target, version, user name,
+    category and classifiers, and combined filters.
+
+    The version of a *CTL* transform is the dot-joined version numbers of its
+    id, e.g. *a1.0.3*. The forward and inverse *CTL* transforms of the pairs
+    are indexed individually.
+
+    Parameters
+    ----------
+    classified_ctl_transforms : dict, optional
+        Classified *CTL* transforms to index as returned by
+        :func:`discover_aces_dev.classify_aces_ctl_transforms` definition.
+        The index can also be populated during the classification by passing
+        it to that definition.
+
+    Examples
+    --------
+    >>> from discover_aces_dev.discover import (
+    ...     classify_aces_ctl_transforms, discover_aces_ctl)
+    >>> index = TransformIndex()
+    >>> classified_ctl_transforms = classify_aces_ctl_transforms(
+    ...     discover_aces_ctl(), index=index)  # doctest: +SKIP
+    >>> index.query(type='ODT', target='Rec709_100nits_dim')  # doctest: +SKIP
+    [CTLTransform('Rec709_100nits_dim', 'ODT.Academy.Rec709_100nits_dim.ctl')]
+    """
+
+    def __init__(self, classified_ctl_transforms=None):
+        self._ctl_transforms = []
+        self._classifications = []
+        self._ids = {}
+        self._positions = {}
+        self._indexes = {
+            attribute: defaultdict(list)
+            for attribute in TRANSFORM_INDEX_ATTRIBUTES
+        }
+        self._lock = threading.Lock()
+
+        if classified_ctl_transforms is not None:
+            self.update(classified_ctl_transforms)
+
+    def __len__(self):
+        return len(self._ctl_transforms)
+
+    def __iter__(self):
+        return iter(list(self._ctl_transforms))
+
+    def __contains__(self, id_):
+        return id_ in self._ids
+
+    def add(self, ctl_transform, category=None, classifiers=None,
+            basename=None):
+        """
+        Indexes given *CTL* transform.
+
+        Parameters
+        ----------
+        ctl_transform : CTLTransform or CTLTransformPair
+            *CTL* transform or pair to index.
+        category : unicode, optional
+            Category of the *CTL* transform.
+        classifiers : unicode, optional
+            Classifiers of the *CTL* transform.
+        basename : unicode, optional
+            Basename of the *CTL* transform.
+        """
+
+        if isinstance(ctl_transform, CTLTransformPair):
+            for member in (ctl_transform.forward_transform,
+                           ctl_transform.inverse_transform):
+                self.add(member, category, classifiers, basename)
+
+            return
+
+        values = {
+            'type': ctl_transform.type,
+            'namespace': ctl_transform.namespace,
+            'name': ctl_transform.name,
+            'source': ctl_transform.source,
+            'target': ctl_transform.target,
+            'version': _version(ctl_transform),
+            'user_name': ctl_transform.user_name,
+            'category': category,
+            'classifiers': classifiers,
+        }
+
+        with self._lock:
+            position = len(self._ctl_transforms)
+            self._ctl_transforms.append(ctl_transform)
+            self._classifications.append((category, classifiers, basename))
+            self._positions[id(ctl_transform)] = position
+
+            if ctl_transform.id is not None:
+                self._ids[ctl_transform.id] = position
+
+            for attribute, value in values.items():
+                if value is not None:
+                    self._indexes[attribute][value].append(position)
+
+    def update(self, classified_ctl_transforms):
+        """
+        Indexes given classified *CTL* transforms.
+
+        Parameters
+        ----------
+        classified_ctl_transforms : dict
+            Classified *CTL* transforms as returned by
+            :func:`discover_aces_dev.classify_aces_ctl_transforms` definition.
+        """
+
+        for category, classifiers in classified_ctl_transforms.items():
+            for classifier, ctl_transforms in classifiers.items():
+                for basename, ctl_transform in ctl_transforms.items():
+                    self.add(ctl_transform, category, classifier, basename)
+
+    def clear(self):
+        """
+        Removes all the *CTL* transforms from the index.
+        """
+
+        with self._lock:
+            self._ctl_transforms.clear()
+            self._classifications.clear()
+            self._ids.clear()
+            self._positions.clear()
+            for index in self._indexes.values():
+                index.clear()
+
+    def by_id(self, id_, default=None):
+        """
+        Returns the *CTL* transform with given id.
+
+        Parameters
+        ----------
+        id_ : unicode
+            *CTL* transform id as found in the file header.
+        default : object, optional
+            Value returned if no *CTL* transform has given id.
+
+        Returns
+        -------
+        CTLTransform
+            *CTL* transform.
+        """
+
+        position = self._ids.get(id_)
+
+        return (self._ctl_transforms[position]
+                if position is not None else default)
+
+    def classification(self, ctl_transform):
+        """
+        Returns the category, classifiers and basename of given indexed *CTL*
+        transform.
+
+        Parameters
+        ----------
+        ctl_transform : CTLTransform
+            Indexed *CTL* transform.
+
+        Returns
+        -------
+        tuple
+            Category, classifiers and basename.
+
+        Raises
+        ------
+        KeyError
+            If the *CTL* transform is not indexed.
+        """
+
+        position = self._positions.get(id(ctl_transform))
+        if position is None:
+            raise KeyError(f'"{ctl_transform}" CTL transform is not indexed!')
+
+        return self._classifications[position]
+
+    def values(self, attribute):
+        """
+        Returns the distinct values of given indexed attribute.
+
+        Parameters
+        ----------
+        attribute : unicode
+            Indexed attribute, see :attr:`TRANSFORM_INDEX_ATTRIBUTES`.
+
+        Returns
+        -------
+        list
+            Distinct values in indexing order.
+        """
+
+        return list(self._index(attribute))
+
+    def _index(self, attribute):
+        index = self._indexes.get(attribute)
+        if index is None:
+            raise ValueError(
+                f'"{attribute}" attribute is not indexed, it must be one of '
+                f'{TRANSFORM_INDEX_ATTRIBUTES}!')
+
+        return index
+
+    def lookup(self, attribute, value):
+        """
+        Returns the *CTL* transforms whose given attribute has given value.
+
+        Parameters
+        ----------
+        attribute : unicode
+            Indexed attribute, see :attr:`TRANSFORM_INDEX_ATTRIBUTES`.
+        value : unicode
+            Attribute value.
+
+        Returns
+        -------
+        list
+            *CTL* transforms in indexing order.
+        """
+
+        return [
+            self._ctl_transforms[position]
+            for position in self._index(attribute).get(value, [])
+        ]
+
+    def query(self, **criteria):
+        """
+        Returns the *CTL* transforms matching all the given criteria.
+
+        Other Parameters
+        ----------------
+        \\**kwargs : dict, optional
+            Indexed attributes and their values, see
+            :attr:`TRANSFORM_INDEX_ATTRIBUTES`. A value can be a *list*,
+            *tuple* or *set* of accepted values. The *id* attribute can also
+            be used.
+
+        Returns
+        -------
+        list
+            *CTL* transforms in indexing order.
+        """
+
+        postings = []
+        for attribute, values in criteria.items():
+            if not isinstance(values, (list, tuple, set, frozenset)):
+                values = [values]
+
+            if attribute == 'id':
+                positions = {
+                    self._ids[value]
+                    for value in values if value in self._ids
+                }
+            else:
+                index = self._index(attribute)
+                positions = set()
+                for value in values:
+                    positions.update(index.get(value, []))
+
+            if not positions:
+                return []
+
+            postings.append(positions)
+
+        if not postings:
+            return list(self._ctl_transforms)
+
+        postings.sort(key=len)
+        positions = postings[0].intersection(*postings[1:])
+
+        return [
+            self._ctl_transforms[position] for position in sorted(positions)
+        ]
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from collections import defaultdict
+
+__all__ = [
+    'Instrumentation', 'Profiler', 'get_instrumentation',
+    'set_instrumentation', 'instrumented', 'timer', 'count'
+]
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Instrumentation:
+    """
+    Defines the instrumentation surface of the discovery stages, i.e. *walk*,
+    *read*, *parse_header*, *patch_invalid_id*, *pairing*, *classification*
+    and *graph_build*.
+
+    This base class does nothing and is the default instrumentation so that
+    instrumenting the stages is virtually free unless a sub-class, e.g.
+    :class:`Profiler`, is installed with :func:`set_instrumentation`
+    definition.
+    """
+
+    def timer(self, stage):
+        """
+        Returns a context manager timing given stage.
+
+        Parameters
+        ----------
+        stage : unicode
+            Stage name.
+
+        Returns
+        -------
+        object
+            Context manager.
+        """
+
+        return _NULL_TIMER
+
+    def count(self, counter, value=1):
+        """
+        Increments given counter.
+
+        Parameters
+        ----------
+        counter : unicode
+            Counter name.
+        value : int, optional
+            Increment.
+        """
+
+        pass
+
+
+class _Timer:
+    __slots__ = ('_profiler', '_stage', '_start')
+
+    def __init__(self, profiler, stage):
+        self._profiler = profiler
+        self._stage = stage
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+
+        return self
+
+    def __exit__(self, *args):
+        self._profiler.record(self._stage, time.perf_counter() - self._start)
+
+        return False
+
+
+class Profiler(Instrumentation):
+    """
+    Instrumentation aggregating the stage timings and counters and notifying
+    given callbacks.
+
+    The timings of the *CTL* transforms parsed in a process pool are not
+    collected as they happen in other processes.
+
+    Parameters
+    ----------
+    callbacks : array_like, optional
+        Callables receiving the stage or counter name and the duration in
+        seconds or increment.
+
+    Examples
+    --------
+    >>> from discover_aces_dev.discover import discover_aces_ctl
+    >>> with instrumented(Profiler()) as profiler:  # doctest: +SKIP
+    ...     discover_aces_ctl()
+    >>> print(profiler.summary())  # doctest: +SKIP
+    """
+
+    def __init__(self, callbacks=None):
+        self._callbacks = list(callbacks or [])
+        self._lock = threading.Lock()
+        self._timings = defaultdict(lambda: [0, 0.0, 0.0])
+        self._counters = defaultdict(int)
+
+    @property
+    def callbacks(self):
+        return self._callbacks
+
+    def timer(self, stage):
+        return _Timer(self, stage)
+
+    def record(self, stage, duration):
+        """
+        Records given stage duration.
+
+        Parameters
+        ----------
+        stage : unicode
+            Stage name.
+        duration : float
+            Duration in seconds.
+        """
+
+        with self._lock:
+            timing = self._timings[stage]
+            timing[0] += 1
+            timing[1] += duration
+            timing[2] = max(timing[2], duration)
+
+        for callback in self._callbacks:
+            callback(stage, duration)
+
+    def count(self, counter, value=1):
+        with self._lock:
+            self._counters[counter] += value
+
+        for callback in self._callbacks:
+            callback(counter, value)
+
+    def reset(self):
+        """
+        Resets the timings and counters.
+        """
+
+        with self._lock:
+            self._timings.clear()
+            self._counters.clear()
+
+    def report(self):
+        """
+        Returns a structured report of the timings and counters.
+
+        Returns
+        -------
+        dict
+            *timings* mapping the stages to their *calls* count, *total*,
+            *mean* and *max* durations in seconds, and *counters* mapping
+            the counters to their values.
+        """
+
+        with self._lock:
+            return {
+                'timings': {
+                    stage: {
+                        'calls': calls,
+                        'total': total,
+                        'mean': total / calls,
+                        'max': maximum
+                    }
+                    for stage, (calls, total, maximum) in self._timings.items()
+                },
+                'counters': dict(self._counters)
+            }
+
+    def summary(self):
+        """
+        Returns a human readable summary of the timings and counters.
+
+        Returns
+        -------
+        unicode
+            Summary.
+        """
+
+        report = self.report()
+
+        lines = [
+            f'{"Stage":<24}{"Calls":>10}{"Total (ms)":>14}{"Mean (ms)":>14}'
+            f'{"Max (ms)":>14}'
+        ]
+        for stage, timing in sorted(
+                report['timings'].items(),
+                key=lambda item: item[1]['total'],
+                reverse=True):
+            lines.append(f'{stage:<24}{timing["calls"]:>10}'
+                         f'{timing["total"] * 1000:>14.3f}'
+                         f'{timing["mean"] * 1000:>14.3f}'
+                         f'{timing["max"] * 1000:>14.3f}')
+
+        for counter, value in sorted(report['counters'].items()):
+            lines.append(f'{counter:<24}{value:>10}')
+
+        return '\n'.join(lines)
+
+
+_INSTRUMENTATION = Instrumentation()
+
+
+def get_instrumentation():
+    """
+    Returns the current instrumentation.
+
+    Returns
+    -------
+    Instrumentation
+        Current instrumentation.
+    """
+
+    return _INSTRUMENTATION
+
+
+def set_instrumentation(instrumentation=None):
+    """
+    Sets the current instrumentation.
+
+    Parameters
+    ----------
+    instrumentation : Instrumentation, optional
+        Instrumentation to set, the default no-op instrumentation is restored
+        if *None*.
+
+    Returns
+    -------
+    Instrumentation
+        Previous instrumentation.
+    """
+
+    global _INSTRUMENTATION
+
+    previous_instrumentation = _INSTRUMENTATION
+    _INSTRUMENTATION = (instrumentation if instrumentation is not None else
+                        Instrumentation())
+
+    return previous_instrumentation
+
+
+class instrumented:
+    """
+    Context manager setting given instrumentation and restoring the previous
+    one on exit.
+
+    Parameters
+    ----------
+    instrumentation : Instrumentation, optional
+        Instrumentation to set, a :class:`Profiler` class instance is created
+        if *None*.
+    """
+
+    def __init__(self, instrumentation=None):
+        self._instrumentation = (instrumentation if instrumentation is not None
+                                 else Profiler())
+        self._previous_instrumentation = None
+
+    def __enter__(self):
+        self._previous_instrumentation = set_instrumentation(
+            self._instrumentation)
+
+        return self._instrumentation
+
+    def __exit__(self, *args):
+        set_instrumentation(self._previous_instrumentation)
+
+        return False
+
+
+def timer(stage):
+    """
+    Returns a context manager timing given stage with the current
+    instrumentation.
+
+    Parameters
+    ----------
+    stage : unicode
+        Stage name.
+
+    Returns
+    -------
+    object
+        Context manager.
+    """
+
+    return _INSTRUMENTATION.timer(stage)
+
+
+def count(counter, value=1):
+    """
+    Increments given counter with the current instrumentation.
+
+    Parameters
+    ----------
+    counter : unicode
+        Counter name.
+    value : int, optional
+        Increment.
+    """
+
+    _INSTRUMENTATION.count(counter, value)
@@ -0,0 +1,472 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import defaultdict, namedtuple
+
+from discover_aces_dev.cache import file_digest
+from discover_aces_dev.discover import (
+    REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT, CTLTransform,
+    find_transform_pairs, iter_aces_ctl)
+from discover_aces_dev.instrumentation import count, timer
+
+__all__ = [
+    'MERKLE_TREE_FORMAT_VERSION', 'MerkleTree', 'discover_aces_ctl_tree',
+    'CTLTreeDiff', 'diff_aces_ctl'
+]
+
+MERKLE_TREE_FORMAT_VERSION = 1
+
+CTLTreeDiff = namedtuple('CTLTreeDiff',
+                         ('added', 'removed', 'modified', 'repaired'))
+CTLTreeDiff.__doc__ = """
+Differences between two *CTL* transforms trees keyed by *CTL* transform id,
+or by relative path for the *CTL* transforms without an id:
+
+-   *added*: Relative paths of the *CTL* transforms only in the new tree.
+-   *removed*: Relative paths of the *CTL* transforms only in the old tree.
+-   *modified*: *(old, new)* relative paths of the *CTL* transforms whose
+    content or path changed.
+-   *repaired*: *(old, new)* ids of the paired *CTL* transform of the *CTL*
+    transforms whose pairing changed, *None* if unpaired.
+"""
+
+
+def _relative_directory(directory, root_directory):
+    relative_directory = os.path.relpath(directory, root_directory)
+    if relative_directory == os.curdir:
+        return ''
+
+    return relative_directory.replace(os.sep, '/')
+
+
+def _parent_directory(relative_directory):
+    return relative_directory.rsplit('/', 1)[0] if '/' in (
+        relative_directory) else ''
+
+
+def _id(path):
+    try:
+        return CTLTransform(path).id
+    except Exception as error:
+        logging.warning('"%s" CTL transform cannot be parsed: %s', path,
+                        error)
+
+
+class MerkleTree:
+    """
+    *Merkle* tree of the *CTL* transforms under a root directory: the hash of
+    a directory is computed from the content digest of its *CTL* transforms
+    and the hashes of its sub-directories, thus identical sub-trees have
+    identical hashes regardless of their location or modification times.
+
+    The tree is built by :func:`discover_aces_ctl_tree` definition and only
+    retains the directories containing *CTL* transforms and their ancestors.
+
+    Parameters
+    ----------
+    root_directory : unicode
+        Root directory of the tree.
+    directories : dict
+        Directories keyed by relative directory, *''* being the root
+        directory, as *{'hash': ..., 'files': {...}, 'directories': [...]}*
+        mappings where the files are *[size, mtime_ns, digest, id]* lists
+        keyed by filename.
+    """
+
+    def __init__(self, root_directory, directories):
+        self._root_directory = root_directory
+        self._directories = directories
+
+    @property
+    def root_directory(self):
+        return self._root_directory
+
+    @property
+    def hash(self):
+        """
+        Hash of the root directory.
+        """
+
+        return self._directories['']['hash']
+
+    @property
+    def directories(self):
+        return self._directories
+
+    @property
+    def ctl_transforms(self):
+        """
+        Unclassified *CTL* transforms, as returned by
+        :func:`discover_aces_dev.discover_aces_ctl` definition.
+        """
+
+        ctl_transforms = defaultdict(list)
+        for relative_directory, directory in self._directories.items():
+            if not directory['files']:
+                continue
+
+            absolute_directory = os.path.join(
+                self._root_directory, *relative_directory.split('/'))
+            ctl_transforms[os.path.normpath(absolute_directory)].extend(
+                os.path.join(absolute_directory, filename)
+                for filename in directory['files'])
+
+        return ctl_transforms
+
+    def __len__(self):
+        return sum(
+            len(directory['files'])
+            for directory in self._directories.values())
+
+    def directory_hash(self, relative_directory):
+        """
+        Returns the hash of given directory.
+
+        Parameters
+        ----------
+        relative_directory : unicode
+            Directory relative to the root directory, using */* separators.
+
+        Returns
+        -------
+        unicode
+            *SHA-256* hex digest or *None* if the directory does not contain
+            any *CTL* transforms.
+        """
+
+        directory = self._directories.get(relative_directory)
+
+        return directory['hash'] if directory is not None else None
+
+    def save(self, path):
+        """
+        Writes the tree to given *JSON* file, e.g. to diff it later against
+        another release.
+
+        Parameters
+        ----------
+        path : unicode
+            Tree path.
+        """
+
+        data = {
+            'version': MERKLE_TREE_FORMAT_VERSION,
+            'root_directory': self._root_directory,
+            'directories': self._directories,
+        }
+
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w') as tree_file:
+                json.dump(data, tree_file, separators=(',', ':'))
+
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a tree written by the :meth:`MerkleTree.save` method.
+
+        Parameters
+        ----------
+        path : unicode
+            Tree path.
+
+        Returns
+        -------
+        MerkleTree
+            *Merkle* tree.
+
+        Raises
+        ------
+        ValueError
+            If the tree format version is not supported.
+        """
+
+        with open(path) as tree_file:
+            data = json.load(tree_file)
+
+        if data.get('version') != MERKLE_TREE_FORMAT_VERSION:
+            raise ValueError(
+                f'"{path}" Merkle tree format version '
+                f'{data.get("version")} is not supported, expected '
+                f'{MERKLE_TREE_FORMAT_VERSION}!')
+
+        return cls(data['root_directory'], data['directories'])
+
+
+def _hash_directory(directories, relative_directory):
+    directory = directories[relative_directory]
+
+    entries = [
+        f'f\0{filename}\0{file_[2]}\n'
+        for filename, file_ in directory['files'].items()
+    ]
+    for name in directory['directories']:
+        sub_directory = (f'{relative_directory}/{name}'
+                         if relative_directory else name)
+        entries.append(f'd\0{name}\0{directories[sub_directory]["hash"]}\n')
+
+    digest = hashlib.sha256()
+    for entry in sorted(entries):
+        digest.update(entry.encode('utf-8'))
+
+    directory['hash'] = digest.hexdigest()
+
+
+def discover_aces_ctl_tree(
+        root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
+        filterers=None,
+        rules=None,
+        previous=None):
+    """
+    Discovers the *CTL* transforms under given root directory and computes
+    their *Merkle* tree during the discovery.
+
+    Parameters
+    ----------
+    root_directory : unicode, optional
+        Root directory to discover the *CTL* transforms from.
+    filterers : array_like, optional
+        Callables receiving a filename and returning whether the file should
+        be kept.
+    rules : DiscoveryRules, optional
+        Declarative rules pruning the directories before they are walked and
+        excluding *CTL* transforms.
+    previous : MerkleTree, optional
+        Previous tree of the same root directory, the *CTL* transforms whose
+        size and modification time are unchanged are not read again.
+
+    Returns
+    -------
+    MerkleTree
+        *Merkle* tree, the discovered *CTL* transforms being available with
+        the :attr:`MerkleTree.ctl_transforms` attribute.
+
+    Examples
+    --------
+    >>> tree = discover_aces_ctl_tree()  # doctest: +SKIP
+    >>> tree.hash  # doctest: +SKIP
+    '5d41402abc4b2a76b9719d911017c592...'
+    """
+
+    root_directory = os.path.normpath(os.path.expandvars(root_directory))
+    previous_directories = (previous.directories
+                            if previous is not None else {})
+
+    directories = {'': {'hash': None, 'files': {}, 'directories': []}}
+    for directory, paths in iter_aces_ctl(root_directory, filterers, rules):
+        relative_directory = _relative_directory(directory, root_directory)
+        previous_files = previous_directories.get(relative_directory,
+                                                  {}).get('files', {})
+
+        files = {}
+        with timer('merkle_digest'):
+            for path in paths:
+                filename = os.path.basename(path)
+                stat = os.stat(path)
+
+                file_ = previous_files.get(filename)
+                if (file_ is not None and file_[0] == stat.st_size and
+                        file_[1] == stat.st_mtime_ns):
+                    count('merkle_digests_reused')
+                else:
+                    file_ = [
+                        stat.st_size, stat.st_mtime_ns,
+                        file_digest(path),
+                        _id(path)
+                    ]
+
+                files[filename] = file_
+
+        directories.setdefault(relative_directory, {
+            'hash': None,
+            'files': {},
+            'directories': []
+        })['files'] = files
+
+        # The ancestors are registered so that the hashes propagate to the
+        # root directory.
+        while relative_directory:
+            parent_directory = _parent_directory(relative_directory)
+            parent = directories.setdefault(parent_directory, {
+                'hash': None,
+                'files': {},
+                'directories': []
+            })
+            name = relative_directory.rsplit('/', 1)[-1]
+            if name in parent['directories']:
+                break
+
+            parent['directories'].append(name)
+            relative_directory = parent_directory
+
+    with timer('merkle_hash'):
+        for relative_directory in sorted(
+                directories,
+                key=lambda directory: directory.count('/') + bool(directory),
+                reverse=True):
+            _hash_directory(directories, relative_directory)
+
+    return MerkleTree(root_directory, directories)
+
+
+def _partners(files):
+    partners = {}
+    for pairs in find_transform_pairs(list(files)).values():
+        if len(pairs) != 2:
+            continue
+
+        forward_transform = pairs['forward_transform']
+        inverse_transform = pairs['inverse_transform']
+        partners[forward_transform] = inverse_transform
+        partners[inverse_transform] = forward_transform
+
+    return partners
+
+
+def _key(relative_path, file_):
+    return file_[3] if file_[3] is not None else relative_path
+
+
+def _changed_files(tree, relative_directories, other_tree):
+    # Returns the files of given directories that are not identical in the
+    # other tree and the pairing of all the files of the directories, both
+    # keyed by id.
+    changed_files, partners = {}, {}
+    for relative_directory in relative_directories:
+        directory = tree.directories.get(relative_directory)
+        if directory is None:
+            continue
+
+        other_files = other_tree.directories.get(relative_directory,
+                                                 {}).get('files', {})
+        files = directory['files']
+        for filename, file_ in files.items():
+            relative_path = (f'{relative_directory}/{filename}'
+                             if relative_directory else filename)
+            key = _key(relative_path, file_)
+
+            other_file = other_files.get(filename)
+            if other_file is None or other_file[2] != file_[2]:
+                changed_files[key] = (relative_path, file_[2])
+
+            partners[key] = None
+
+        for filename, partner in _partners(files).items():
+            relative_path = (f'{relative_directory}/{filename}'
+                             if relative_directory else filename)
+            partner_path = (f'{relative_directory}/{partner}'
+                            if relative_directory else partner)
+            partners[_key(relative_path, files[filename])] = _key(
+                partner_path, files[partner])
+
+    return changed_files, partners
+
+
+def diff_aces_ctl(old, new, filterers=None, rules=None):
+    """
+    Returns the differences between given *CTL* transforms trees, e.g. two
+    *aces-dev* releases or a studio overlay and its base.
+
+    The trees are compared top-down and the sub-trees with identical hashes
+    are skipped entirely, thus the cost is proportional to the size of the
+    change rather than the size of the trees.
+
+    Parameters
+    ----------
+    old : unicode or MerkleTree
+        Old root directory or *Merkle* tree.
+    new : unicode or MerkleTree
+        New root directory or *Merkle* tree.
+    filterers : array_like, optional
+        Callables receiving a filename and returning whether the file should
+        be kept, used when a root directory is given.
+    rules : DiscoveryRules, optional
+        Declarative rules pruning the directories and excluding *CTL*
+        transforms, used when a root directory is given.
+
+    Returns
+    -------
+    CTLTreeDiff
+        Differences keyed by *CTL* transform id.
+
+    Examples
+    --------
+    >>> diff_aces_ctl('aces-dev-1.2/transforms/ctl',
+    ...               'aces-dev-1.3/transforms/ctl').added  # doctest: +SKIP
+    {'urn:ampas:aces:transformId:v1.5:LMT.Academy.GamutCompress.a1.3.0': \
+'lmt/LMT.Academy.GamutCompress.ctl'}
+    """
+
+    if not isinstance(old, MerkleTree):
+        old = discover_aces_ctl_tree(old, filterers, rules)
+
+    if not isinstance(new, MerkleTree):
+        new = discover_aces_ctl_tree(new, filterers, rules)
+
+    changed_directories = []
+    directories = ['']
+    while directories:
+        relative_directory = directories.pop()
+        old_directory = old.directories.get(relative_directory)
+        new_directory = new.directories.get(relative_directory)
+
+        if (old_directory is not None and new_directory is not None and
+                old_directory['hash'] == new_directory['hash']):
+            count('merkle_directories_skipped')
+            continue
+
+        changed_directories.append(relative_directory)
+
+        names = []
+        for directory in (old_directory, new_directory):
+            if directory is not None:
+                names.extend(directory['directories'])
+
+        directories.extend(
+            f'{relative_directory}/{name}' if relative_directory else name
+            for name in dict.fromkeys(names))
+
+    old_files, old_partners = _changed_files(old, changed_directories, new)
+    new_files, new_partners = _changed_files(new, changed_directories, old)
+
+    added = {
+        key: relative_path
+        for key, (relative_path, _digest) in new_files.items()
+        if key not in old_files and key not in old_partners
+    }
+    removed = {
+        key: relative_path
+        for key, (relative_path, _digest) in old_files.items()
+        if key not in new_files and key not in new_partners
+    }
+
+    modified = {}
+    for key in set(old_files).union(new_files):
+        if key in added or key in removed:
+            continue
+
+        # Transforms moved to, or from, an unchanged directory are matched
+        # by id with the other tree.
+        old_file = old_files.get(key)
+        new_file = new_files.get(key)
+        if old_file is None or new_file is None or old_file != new_file:
+            modified[key] = (old_file[0] if old_file else None,
+                             new_file[0] if new_file else None)
+
+    repaired = {
+        key: (old_partners[key], new_partners[key])
+        for key in old_partners
+        if key in new_partners and old_partners[key] != new_partners[key]
+    }
+
+    return CTLTreeDiff(added, removed, modified, repaired)
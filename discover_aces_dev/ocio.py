@@ -0,0 +1,550 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+
+from discover_aces_dev.compact_graph import CompactGraph
+from discover_aces_dev.discover import CTLTransformPair
+from discover_aces_dev.graph import (CONVERSION_GRAPH_HUBS,
+                                     _unclassify_ctl_transforms)
+from discover_aces_dev.instrumentation import count, timer
+
+__all__ = [
+    'OCIO_CONFIG_REFERENCE_COLOURSPACE', 'OCIO_CONFIG_ROLES',
+    'OCIO_CONFIG_DISPLAY_TYPES', 'OCIO_SECTION_CACHE_SCHEMA_VERSION',
+    'clf_file_transform', 'OCIOSectionCache', 'iter_ocio_config',
+    'write_ocio_config'
+]
+
+OCIO_CONFIG_REFERENCE_COLOURSPACE = 'ACES2065-1'
+"""
+Scene reference colourspace of the generated *OpenColorIO* configs.
+"""
+
+OCIO_CONFIG_ROLES = {
+    'aces_interchange': 'ACES2065-1',
+    'cie_xyz_d65_interchange': 'CIE-XYZ-D65',
+    'color_timing': 'ACEScct',
+    'compositing_log': 'ACEScct',
+    'default': 'ACES2065-1',
+    'scene_linear': 'ACEScg',
+}
+"""
+*OpenColorIO* roles and their colourspaces, the roles whose colourspace is not
+in the config are not written.
+"""
+
+OCIO_CONFIG_DISPLAY_TYPES = ('ODT', 'InvODT', 'RRTODT', 'InvRRTODT')
+"""
+*CTL* transform types whose colourspaces are exposed as displays.
+"""
+
+OCIO_SECTION_CACHE_SCHEMA_VERSION = 1
+
+
+def _scalar(value):
+    # "JSON" strings are valid "YAML" double-quoted scalars.
+    return json.dumps(str(value))
+
+
+def _flow(attributes):
+    attributes = ', '.join(f'{key}: {value}'
+                           for key, value in attributes.items())
+
+    return f'{{{attributes}}}'
+
+
+def clf_file_transform(ctl_transform, direction='forward'):
+    """
+    Returns the *OpenColorIO* *FileTransform* applying the *Common LUT
+    Format* file baked from given *CTL* transform, e.g. with *ctlrender*, and
+    named after it, *OpenColorIO* not being able to execute *CTL*.
+
+    This is the default transformer of :func:`iter_ocio_config` definition,
+    a transformer returning *BuiltinTransform* styles or any other
+    *OpenColorIO* transform can be used instead.
+
+    Parameters
+    ----------
+    ctl_transform : CTLTransform
+        *CTL* transform.
+    direction : unicode, optional
+        {'forward', 'inverse'}, direction the transform is applied in.
+
+    Returns
+    -------
+    unicode
+        *YAML* flow mapping of the *OpenColorIO* transform, *None* if given
+        *CTL* transform cannot be represented.
+
+    Examples
+    --------
+    >>> from discover_aces_dev.discover import CTLTransform
+    >>> clf_file_transform(
+    ...     CTLTransform('ODT.Academy.Rec709_100nits_dim.ctl'))
+    ... # doctest: +SKIP
+    '!<FileTransform> {src: "ODT.Academy.Rec709_100nits_dim.clf", \
+interpolation: best}'
+    """
+
+    basename = os.path.splitext(os.path.basename(ctl_transform.path))[0]
+    attributes = {'src': _scalar(f'{basename}.clf'), 'interpolation': 'best'}
+    if direction == 'inverse':
+        attributes['direction'] = 'inverse'
+
+    return f'!<FileTransform> {_flow(attributes)}'
+
+
+class OCIOSectionCache:
+    """
+    Persistent cache of the sections written by :func:`iter_ocio_config`
+    definition, keyed by the fingerprint of their input *CTL* transforms.
+
+    The sections are stored in a *SQLite* database and read one at a time so
+    that the cache never needs to be loaded in memory.
+
+    Parameters
+    ----------
+    path : unicode
+        Path to the cache database, ``:memory:`` can be used for a transient
+        cache.
+    """
+
+    def __init__(self, path):
+        self._path = path
+
+        self._connection = sqlite3.connect(path)
+        self._initialise()
+
+    @property
+    def path(self):
+        return self._path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._connection.execute(
+            'SELECT COUNT(*) FROM sections').fetchone()[0]
+
+    def _initialise(self):
+        version = self._connection.execute('PRAGMA user_version').fetchone()[0]
+
+        if version != OCIO_SECTION_CACHE_SCHEMA_VERSION:
+            logging.info(
+                '"%s" section cache schema is outdated, rebuilding it!',
+                self._path)
+            self._connection.execute('DROP TABLE IF EXISTS sections')
+
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS sections '
+            '(key TEXT PRIMARY KEY, fingerprint TEXT, text TEXT)')
+        self._connection.execute(
+            f'PRAGMA user_version = {OCIO_SECTION_CACHE_SCHEMA_VERSION}')
+        self._connection.commit()
+
+    def get(self, key, fingerprint):
+        """
+        Returns the cached section with given key and fingerprint.
+
+        Parameters
+        ----------
+        key : unicode
+            Section key.
+        fingerprint : unicode
+            Fingerprint of the section input *CTL* transforms.
+
+        Returns
+        -------
+        unicode
+            Section text or *None* if the section is not cached or its input
+            *CTL* transforms changed.
+        """
+
+        row = self._connection.execute(
+            'SELECT text FROM sections WHERE key = ? AND fingerprint = ?',
+            (key, fingerprint)).fetchone()
+
+        return row[0] if row is not None else None
+
+    def set(self, key, fingerprint, text):
+        """
+        Caches given section.
+
+        Parameters
+        ----------
+        key : unicode
+            Section key.
+        fingerprint : unicode
+            Fingerprint of the section input *CTL* transforms.
+        text : unicode
+            Section text.
+        """
+
+        self._connection.execute(
+            'INSERT OR REPLACE INTO sections VALUES (?, ?, ?)',
+            (key, fingerprint, text))
+
+    def prune(self, keys):
+        """
+        Removes the sections whose key is not in given keys and commits.
+
+        Parameters
+        ----------
+        keys : array_like
+            Keys of the sections to keep.
+        """
+
+        keys = set(keys)
+        stale_keys = [(key, ) for key, in self._connection.execute(
+            'SELECT key FROM sections') if key not in keys]
+        self._connection.executemany('DELETE FROM sections WHERE key = ?',
+                                     stale_keys)
+        self._connection.commit()
+
+    def close(self):
+        self._connection.commit()
+        self._connection.close()
+
+
+def _colourspace_name(ctl_transform):
+    sides = [
+        side for side in (ctl_transform.source, ctl_transform.target)
+        if side is not None and side != OCIO_CONFIG_REFERENCE_COLOURSPACE
+    ]
+    for side in sides:
+        if side not in CONVERSION_GRAPH_HUBS:
+            return side
+
+    return sides[0] if sides else None
+
+
+def _members(ctl_transform):
+    if isinstance(ctl_transform, CTLTransformPair):
+        return [
+            ctl_transform.forward_transform, ctl_transform.inverse_transform
+        ]
+
+    return [ctl_transform]
+
+
+def _fingerprint(transformer, skipped_names, ctl_transforms):
+    digest = hashlib.sha256()
+    digest.update(
+        f'{transformer.__module__}.{transformer.__qualname__}'.encode())
+    digest.update(json.dumps(skipped_names).encode())
+    for ctl_transform in ctl_transforms:
+        try:
+            stat = os.stat(ctl_transform.path)
+            identity = [stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            identity = None
+
+        digest.update(
+            json.dumps([ctl_transform.path, identity, ctl_transform.metadata],
+                       sort_keys=True).encode())
+
+    return digest.hexdigest()
+
+
+class _Generator:
+    def __init__(self, classified_ctl_transforms, graph, transformer):
+        self.classified_ctl_transforms = classified_ctl_transforms
+        self.transformer = transformer
+
+        if graph is None:
+            graph = CompactGraph.from_ctl_transforms(
+                _unclassify_ctl_transforms(classified_ctl_transforms))
+        self.graph = graph
+
+        self.partners = {}
+        for classifiers in classified_ctl_transforms.values():
+            for ctl_transforms in classifiers.values():
+                for ctl_transform in ctl_transforms.values():
+                    if isinstance(ctl_transform, CTLTransformPair):
+                        forward_transform, inverse_transform = _members(
+                            ctl_transform)
+                        self.partners[id(forward_transform)] = (
+                            inverse_transform)
+                        self.partners[id(inverse_transform)] = (
+                            forward_transform)
+
+        # A breadth-first search from and to the reference colourspace gives
+        # the conversions of every colourspace.
+        self.from_reference, self.to_reference = {}, {}
+        if OCIO_CONFIG_REFERENCE_COLOURSPACE in graph:
+            self.from_reference = graph.shortest_paths(
+                OCIO_CONFIG_REFERENCE_COLOURSPACE)
+            self.to_reference = {
+                node: list(reversed(path))
+                for node, path in graph.reversed().shortest_paths(
+                    OCIO_CONFIG_REFERENCE_COLOURSPACE).items()
+            }
+
+    def path_ctl_transforms(self, path):
+        return self.graph.path_edge_data(path) if path else []
+
+    def transform(self, ctl_transforms):
+        if not ctl_transforms:
+            return None
+
+        transforms = []
+        for ctl_transform in ctl_transforms:
+            transform = self.transformer(ctl_transform)
+            if transform is None and id(ctl_transform) in self.partners:
+                transform = self.transformer(
+                    self.partners[id(ctl_transform)], 'inverse')
+
+            if transform is None:
+                return None
+
+            transforms.append(transform)
+
+        if len(transforms) == 1:
+            return transforms[0]
+
+        return f'!<GroupTransform> {{children: [{", ".join(transforms)}]}}'
+
+    def colourspace(self, name, family, ctl_transforms):
+        lines = [
+            '  - !<ColorSpace>',
+            f'    name: {_scalar(name)}',
+            f'    family: {_scalar(family)}',
+            '    equalitygroup: ""',
+            '    bitdepth: 32f',
+        ]
+
+        description = []
+        for ctl_transform in ctl_transforms:
+            if ctl_transform.user_name:
+                description.append(ctl_transform.user_name)
+            if ctl_transform.id:
+                description.append(f'ACEStransformID: {ctl_transform.id}')
+
+        lines.append(f'    description: {_scalar(chr(10).join(description))}')
+        lines.append('    isdata: false')
+
+        for key, paths in (('to_scene_reference', self.to_reference),
+                           ('from_scene_reference', self.from_reference)):
+            transform = self.transform(
+                self.path_ctl_transforms(paths.get(name)))
+            if transform is not None:
+                lines.append(f'    {key}: {transform}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def iter_ocio_config(classified_ctl_transforms,
+                     graph=None,
+                     transformer=clf_file_transform,
+                     cache=None,
+                     search_path=''):
+    """
+    Generates an *OpenColorIO* config from given classified *CTL*
+    transforms, yielding its text section by section so that it can be
+    written incrementally.
+
+    Each classifiers group of the classified *CTL* transforms is a section of
+    colourspaces, one per colourspace the *CTL* transforms convert from or
+    to. The *to_scene_reference* and *from_scene_reference* transforms of a
+    colourspace chain the *CTL* transforms along its shortest conversion
+    path to and from the reference colourspace in the automatic colour
+    conversion graph, e.g. *RRT* then *ODT* for an *ODT* colourspace. The
+    colourspaces of the *ODT* and *Output Transforms* are also exposed as
+    displays.
+
+    With a cache, the sections whose input *CTL* transforms, i.e. those
+    defining the colourspaces and those along their conversion paths, are
+    unchanged are reused rather than generated again.
+
+    Parameters
+    ----------
+    classified_ctl_transforms : dict
+        Classified *CTL* transforms as returned by
+        :func:`discover_aces_dev.classify_aces_ctl_transforms` definition.
+    graph : CompactGraph, optional
+        Automatic colour conversion graph, built from the classified *CTL*
+        transforms if *None*.
+    transformer : callable, optional
+        Callable receiving a *CTL* transform and a direction and returning the
+        *YAML* flow mapping of the equivalent *OpenColorIO* transform or
+        *None*, see :func:`clf_file_transform` definition.
+    cache : OCIOSectionCache, optional
+        Cache of the sections of the previous generations.
+    search_path : unicode, optional
+        *OpenColorIO* search path, e.g. the directory of the baked *Common
+        LUT Format* files.
+
+    Yields
+    ------
+    unicode
+        Config text chunks.
+
+    Examples
+    --------
+    >>> from discover_aces_dev.discover import (
+    ...     classify_aces_ctl_transforms, discover_aces_ctl)
+    >>> config = ''.join(iter_ocio_config(
+    ...     classify_aces_ctl_transforms(discover_aces_ctl())))
+    ... # doctest: +SKIP
+    """
+
+    generator = _Generator(classified_ctl_transforms, graph, transformer)
+
+    roles = [(role, colourspace)
+             for role, colourspace in OCIO_CONFIG_ROLES.items()
+             if colourspace in generator.graph]
+
+    yield 'ocio_profile_version: 2\n\n'
+    yield 'environment:\n  {}\n'
+    yield f'search_path: {_scalar(search_path)}\n'
+    yield 'strictparsing: true\n'
+    yield 'luma: [0.2126, 0.7152, 0.0722]\n\n'
+    yield 'roles:\n'
+    yield ''.join(f'  {role}: {_scalar(colourspace)}\n'
+                  for role, colourspace in roles)
+    yield '\nfile_rules:\n'
+    yield ('  - !<Rule> {name: Default, colorspace: '
+           f'{_scalar(OCIO_CONFIG_REFERENCE_COLOURSPACE)}}}\n')
+    yield '\ncolorspaces:\n'
+    yield '\n'.join([
+        '  - !<ColorSpace>',
+        f'    name: {_scalar(OCIO_CONFIG_REFERENCE_COLOURSPACE)}',
+        '    family: "ACES"',
+        '    equalitygroup: ""',
+        '    bitdepth: 32f',
+        '    description: "The Academy Color Encoding System reference '
+        'colourspace."',
+        '    isdata: false',
+    ]) + '\n'
+
+    names = {OCIO_CONFIG_REFERENCE_COLOURSPACE}
+    displays = []
+    keys = []
+    for category, classifiers in classified_ctl_transforms.items():
+        for classifier, ctl_transforms in classifiers.items():
+            family = (category
+                      if classifier == 'base' else f'{category}/{classifier}')
+
+            colourspaces, skipped_names = {}, []
+            for ctl_transform in ctl_transforms.values():
+                for member in _members(ctl_transform):
+                    name = _colourspace_name(member)
+                    if name is None:
+                        continue
+
+                    if name in names and name not in colourspaces:
+                        skipped_names.append(name)
+                        continue
+
+                    colourspaces.setdefault(name, []).append(member)
+                    names.add(name)
+
+            if not colourspaces:
+                continue
+
+            for name, members in colourspaces.items():
+                if any(member.type in OCIO_CONFIG_DISPLAY_TYPES
+                       for member in members):
+                    displays.append(name)
+
+            key = f'colorspaces/{family}'
+            keys.append(key)
+
+            text = None
+            if cache is not None:
+                inputs = []
+                for name, members in colourspaces.items():
+                    inputs.extend(members)
+                    for paths in (generator.to_reference,
+                                  generator.from_reference):
+                        inputs.extend(
+                            generator.path_ctl_transforms(paths.get(name)))
+
+                fingerprint = _fingerprint(transformer, skipped_names,
+                                           inputs)
+                text = cache.get(key, fingerprint)
+
+            if text is not None:
+                count('ocio_sections_reused')
+            else:
+                with timer('ocio_section'):
+                    text = ''.join(
+                        generator.colourspace(name, family, members)
+                        for name, members in colourspaces.items())
+
+                if cache is not None:
+                    cache.set(key, fingerprint, text)
+
+            yield text
+
+    yield '\ndisplays:\n'
+    for display in displays:
+        yield (f'  {_scalar(display)}:\n'
+               f'    - !<View> {{name: "ACES", colorspace: '
+               f'{_scalar(display)}}}\n')
+
+    yield '\nactive_displays: []\nactive_views: []\n'
+
+    if cache is not None:
+        cache.prune(keys)
+
+
+def write_ocio_config(path,
+                      classified_ctl_transforms,
+                      graph=None,
+                      transformer=clf_file_transform,
+                      cache=None,
+                      search_path=''):
+    """
+    Writes an *OpenColorIO* config generated from given classified *CTL*
+    transforms to given path, section by section, see
+    :func:`iter_ocio_config` definition.
+
+    The config is written to a temporary file replacing the existing file
+    once complete.
+
+    Parameters
+    ----------
+    path : unicode
+        Config path.
+    classified_ctl_transforms : dict
+        Classified *CTL* transforms as returned by
+        :func:`discover_aces_dev.classify_aces_ctl_transforms` definition.
+    graph : CompactGraph, optional
+        Automatic colour conversion graph, built from the classified *CTL*
+        transforms if *None*.
+    transformer : callable, optional
+        Callable receiving a *CTL* transform and a direction and returning the
+        *YAML* flow mapping of the equivalent *OpenColorIO* transform.
+    cache : unicode or OCIOSectionCache, optional
+        Cache, or path to the cache, of the sections of the previous
+        generations.
+    search_path : unicode, optional
+        *OpenColorIO* search path.
+    """
+
+    if isinstance(cache, str):
+        with OCIOSectionCache(cache) as section_cache:
+            return write_ocio_config(path, classified_ctl_transforms, graph,
+                                     transformer, section_cache, search_path)
+
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w') as config_file:
+            for chunk in iter_ocio_config(classified_ctl_transforms, graph,
+                                          transformer, cache, search_path):
+                config_file.write(chunk)
+
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+from discover_aces_dev.instrumentation import count, timer
+
+__all__ = [
+    'PRECISION_CLASSES', 'precision_class', 'WeightingPolicy',
+    'WEIGHTING_POLICIES', 'KShortestPathsTable'
+]
+
+PRECISION_CLASSES = ('exact', 'lossy', 'approximate')
+"""
+Precision classes of the *CTL* transforms:
+
+-   *exact*: Invertible matrix and transfer function conversions, e.g.
+    *ACEScsc* and *IDT* transforms.
+-   *lossy*: Tonescale and gamut mapping output transforms, e.g. *RRT* and
+    *ODT* transforms, and look transforms.
+-   *approximate*: Inverses of the *lossy* transforms, they only approximate
+    the inversion of their forward transform.
+"""
+
+_LOSSY_CTL_TRANSFORM_TYPES = ('RRT', 'ODT', 'RRTODT', 'LMT')
+
+_APPROXIMATE_CTL_TRANSFORM_TYPES = ('InvRRT', 'InvODT', 'InvRRTODT')
+
+
+def precision_class(ctl_transform):
+    """
+    Returns the precision class of given *CTL* transform, see
+    :attr:`PRECISION_CLASSES` attribute.
+
+    Parameters
+    ----------
+    ctl_transform : CTLTransform
+        *CTL* transform.
+
+    Returns
+    -------
+    unicode
+        Precision class.
+    """
+
+    if ctl_transform.type in _APPROXIMATE_CTL_TRANSFORM_TYPES:
+        return 'approximate'
+    elif ctl_transform.type in _LOSSY_CTL_TRANSFORM_TYPES:
+        return 'lossy'
+    else:
+        return 'exact'
+
+
+class WeightingPolicy:
+    """
+    Computes the automatic colour conversion graph edge weight of a *CTL*
+    transform as the sum of a weight for its type, a penalty for its
+    precision class and a penalty if it is an inverse transform.
+
+    Parameters
+    ----------
+    type_weights : dict, optional
+        Weights keyed by *CTL* transform type.
+    precision_penalties : dict, optional
+        Penalties keyed by precision class, see :attr:`PRECISION_CLASSES`
+        attribute.
+    inverse_penalty : numeric, optional
+        Penalty of the inverse *CTL* transforms.
+    default_weight : numeric, optional
+        Weight of the *CTL* transform types missing from the type weights.
+
+    Examples
+    --------
+    >>> from discover_aces_dev.discover import CTLTransform
+    >>> policy = WeightingPolicy(inverse_penalty=2)
+    >>> policy(CTLTransform('InvODT.Academy.Rec709_100nits_dim.ctl'))
+    ... # doctest: +SKIP
+    3.0
+    """
+
+    def __init__(self,
+                 type_weights=None,
+                 precision_penalties=None,
+                 inverse_penalty=0,
+                 default_weight=1):
+        self._type_weights = dict(type_weights or {})
+        self._precision_penalties = {
+            precision: 0
+            for precision in PRECISION_CLASSES
+        }
+        self._precision_penalties.update(precision_penalties or {})
+        self._inverse_penalty = inverse_penalty
+        self._default_weight = default_weight
+
+    @property
+    def type_weights(self):
+        return dict(self._type_weights)
+
+    @property
+    def precision_penalties(self):
+        return dict(self._precision_penalties)
+
+    @property
+    def inverse_penalty(self):
+        return self._inverse_penalty
+
+    @property
+    def default_weight(self):
+        return self._default_weight
+
+    def _key(self):
+        return (tuple(sorted(self._type_weights.items())),
+                tuple(sorted(self._precision_penalties.items())),
+                self._inverse_penalty, self._default_weight)
+
+    def __eq__(self, other):
+        if not isinstance(other, WeightingPolicy):
+            return NotImplemented
+
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return (f'{self.__class__.__name__}('
+                f'{self._type_weights!r}, '
+                f'{self._precision_penalties!r}, '
+                f'{self._inverse_penalty!r}, '
+                f'{self._default_weight!r})')
+
+    def __call__(self, ctl_transform):
+        weight = self._type_weights.get(ctl_transform.type,
+                                        self._default_weight)
+        weight += self._precision_penalties[precision_class(ctl_transform)]
+
+        if (ctl_transform.type or '').startswith('Inv'):
+            weight += self._inverse_penalty
+
+        return float(weight)
+
+
+WEIGHTING_POLICIES = {
+    'hops':
+    WeightingPolicy(),
+    'default':
+    WeightingPolicy(
+        type_weights={
+            'RRTODT': 1.5,
+            'InvRRTODT': 1.5
+        },
+        precision_penalties={
+            'lossy': 0.5,
+            'approximate': 1
+        },
+        inverse_penalty=1),
+    'precision':
+    WeightingPolicy(
+        precision_penalties={
+            'lossy': 2,
+            'approximate': 4
+        },
+        inverse_penalty=2),
+}
+"""
+Named automatic colour conversion graph weighting policies:
+
+-   *hops*: Every *CTL* transform has unit weight, the paths are ranked by
+    their length.
+-   *default*: A direct *RRTODT* transform is preferred over a *RRT* and
+    *ODT* transforms chain and round-trips through inverse transforms are
+    avoided.
+-   *precision*: The *lossy* and *approximate* transforms are strongly
+    penalised, the paths are mostly ranked by their precision.
+"""
+
+
+class KShortestPathsTable:
+    """
+    Lookup table of the *k* lowest weight loopless conversion paths between
+    every pair of reachable nodes of an automatic colour conversion graph.
+
+    The paths are computed once with the
+    :meth:`discover_aces_dev.CompactGraph.all_k_shortest_paths` method so that
+    the ranked alternatives are returned without any graph search, the
+    table is rebuilt with the :meth:`KShortestPathsTable.rebuild` method
+    when the graph changes.
+
+    Parameters
+    ----------
+    graph : CompactGraph
+        Automatic colour conversion graph.
+    k : int, optional
+        Maximum path count per pair of nodes.
+    policy : WeightingPolicy or unicode, optional
+        Weighting policy or name of a :attr:`WEIGHTING_POLICIES` attribute
+        policy, the graph weights are used if *None*.
+
+    Examples
+    --------
+    >>> from discover_aces_dev.graph import get_compact_conversion_graph
+    >>> table = KShortestPathsTable(
+    ...     get_compact_conversion_graph(), 3, 'default')  # doctest: +SKIP
+    >>> weight, ctl_transforms = table.paths('ACEScg', 'OCES')[0]
+    ... # doctest: +SKIP
+    >>> weight, [ctl_transform.type for ctl_transform in ctl_transforms]
+    ... # doctest: +SKIP
+    (2.5, ['ACEScsc', 'RRT'])
+    """
+
+    def __init__(self, graph, k=3, policy=None):
+        if isinstance(policy, str):
+            policy = WEIGHTING_POLICIES[policy]
+
+        self._k = k
+        self._policy = policy
+        self._graph = None
+        self._table = {}
+        self._lock = threading.Lock()
+
+        self.rebuild(graph)
+
+    @property
+    def k(self):
+        return self._k
+
+    @property
+    def policy(self):
+        return self._policy
+
+    @property
+    def graph(self):
+        return self._graph
+
+    def __len__(self):
+        return len(self._table)
+
+    def __contains__(self, pair):
+        return pair in self._table
+
+    def rebuild(self, graph=None):
+        """
+        Computes the paths of the table again.
+
+        Parameters
+        ----------
+        graph : CompactGraph, optional
+            New automatic colour conversion graph, the current graph is used
+            if *None*.
+        """
+
+        if graph is None:
+            graph = self._graph
+
+        if self._policy is not None:
+            graph = graph.reweighted(self._policy)
+
+        table = {}
+        with timer('ranking_build'):
+            for source, target, paths in graph.all_k_shortest_paths(self._k):
+                table[source, target] = tuple(
+                    (weight, tuple(graph.path_edge_data(path)))
+                    for weight, path in paths)
+
+        with self._lock:
+            self._graph, self._table = graph, table
+
+    def paths(self, source, target):
+        """
+        Returns the ranked conversion paths from given source to given target
+        node.
+
+        Parameters
+        ----------
+        source : unicode
+            Source node name.
+        target : unicode
+            Target node name.
+
+        Returns
+        -------
+        list
+            At most *k* *(weight, ctl_transforms)* tuples sorted by
+            increasing total weight, where *ctl_transforms* is the ordered
+            list of :class:`discover_aces_dev.CTLTransform` class instances
+            along the path.
+        """
+
+        count('ranking_lookups')
+
+        with self._lock:
+            paths = self._table.get((source, target), ())
+
+        return [(weight, list(ctl_transforms))
+                for weight, ctl_transforms in paths]
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+import itertools
+import logging
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from discover_aces_dev.cache import file_digest
+from discover_aces_dev.common import vivified_to_dict
+from discover_aces_dev.discover import (
+    CTLTransform, _assemble_ctl_transform, classify_ctl_transform_paths,
+    discover_aces_ctl, parse_ctl_transforms)
+from discover_aces_dev.instrumentation import count, timer
+
+__all__ = [
+    'CTLTransformStore', 'discover_aces_ctl_roots', 'classify_aces_ctl_roots'
+]
+
+
+def _normalise_root_directory(root_directory):
+    return os.path.normpath(os.path.expandvars(root_directory))
+
+
+def _map_concurrently(function, iterable, workers=None):
+    iterable = list(iterable)
+    if len(iterable) < 2:
+        return list(map(function, iterable))
+
+    workers = min(len(iterable), workers or os.cpu_count() or 1)
+    with ThreadPoolExecutor(workers) as pool:
+        return list(pool.map(function, iterable))
+
+
+class CTLTransformStore:
+    """
+    Content-addressed store of parsed *CTL* transforms shared across several
+    transforms roots, e.g. multiple *aces-dev* versions and studio overlays.
+
+    The files are keyed by the *SHA-256* digest of their content so that
+    byte-identical files are parsed once. The *CTL* transforms of identical
+    files share the same parsed metadata and only differ by their path.
+
+    Examples
+    --------
+    >>> store = CTLTransformStore()
+    >>> len(store)
+    0
+    """
+
+    def __init__(self):
+        self._metadata = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._metadata)
+
+    def __contains__(self, digest):
+        return digest in self._metadata
+
+    def clear(self):
+        """
+        Removes all the parsed *CTL* transforms from the store.
+        """
+
+        with self._lock:
+            self._metadata.clear()
+
+    def ctl_transforms(self, paths, executor=None, workers=None):
+        """
+        Returns the :class:`discover_aces_dev.CTLTransform` class instances
+        for given paths, only parsing the files whose content is not in the
+        store yet.
+
+        Parameters
+        ----------
+        paths : array_like
+            *CTL* transform paths.
+        executor : unicode or Executor, optional
+            {None, 'thread', 'process'} or
+            :class:`concurrent.futures.Executor` class instance used to parse
+            the new files, see
+            :func:`discover_aces_dev.parse_ctl_transforms` definition.
+        workers : int, optional
+            Worker count used to hash and parse the files.
+
+        Returns
+        -------
+        dict
+            *CTL* transforms keyed by path.
+        """
+
+        paths = list(paths)
+
+        with timer('hashing'):
+            digests = dict(
+                zip(paths, _map_concurrently(file_digest, paths, workers)))
+
+        with self._lock:
+            unparsed = {}
+            for path, digest in digests.items():
+                if digest not in self._metadata and digest not in unparsed:
+                    unparsed[digest] = path
+
+        count('ctl_transforms_deduplicated', len(paths) - len(unparsed))
+        logging.info('Parsing %s unique CTL transform(s) out of %s.',
+                     len(unparsed), len(paths))
+
+        parsed = parse_ctl_transforms(unparsed.values(), executor, workers)
+
+        with self._lock:
+            for digest, ctl_transform in zip(unparsed, parsed):
+                self._metadata.setdefault(digest, ctl_transform.metadata)
+
+            return {
+                path: CTLTransform(path, self._metadata[digest])
+                for path, digest in digests.items()
+            }
+
+
+def discover_aces_ctl_roots(root_directories,
+                            filterers=None,
+                            rules=None,
+                            workers=None):
+    """
+    Discovers the *CTL* transforms under given root directories, scanning
+    them concurrently.
+
+    Parameters
+    ----------
+    root_directories : array_like
+        Root directories to discover the *CTL* transforms from.
+    filterers : array_like, optional
+        Callables receiving a filename and returning whether the file should
+        be kept.
+    rules : DiscoveryRules, optional
+        Declarative rules pruning the directories before they are walked and
+        excluding *CTL* transforms.
+    workers : int, optional
+        Maximum count of roots scanned concurrently.
+
+    Returns
+    -------
+    dict
+        Unclassified *CTL* transforms, as returned by
+        :func:`discover_aces_dev.discover_aces_ctl` definition, keyed by
+        normalised root directory.
+    """
+
+    root_directories = list(
+        dict.fromkeys(map(_normalise_root_directory, root_directories)))
+
+    return dict(
+        zip(root_directories,
+            _map_concurrently(
+                lambda root_directory: discover_aces_ctl(
+                    root_directory, filterers, rules), root_directories,
+                workers)))
+
+
+def classify_aces_ctl_roots(root_directories,
+                            filterers=None,
+                            rules=None,
+                            store=None,
+                            executor=None,
+                            workers=None):
+    """
+    Discovers and classifies the *CTL* transforms under given root
+    directories, parsing the byte-identical files only once.
+
+    The classification of each root is the same as the one returned by
+    :func:`discover_aces_dev.classify_aces_ctl_transforms` definition for
+    that root alone.
+
+    Parameters
+    ----------
+    root_directories : array_like
+        Root directories to discover the *CTL* transforms from.
+    filterers : array_like, optional
+        Callables receiving a filename and returning whether the file should
+        be kept.
+    rules : DiscoveryRules, optional
+        Declarative rules pruning the directories before they are walked and
+        excluding *CTL* transforms.
+    store : CTLTransformStore, optional
+        Store of the parsed *CTL* transforms, re-using a store across calls
+        avoids parsing the files already seen.
+    executor : unicode or Executor, optional
+        Executor used to parse the unique files, see
+        :func:`discover_aces_dev.parse_ctl_transforms` definition.
+    workers : int, optional
+        Worker count used to scan the roots and hash and parse the files.
+
+    Returns
+    -------
+    dict
+        Classified *CTL* transforms keyed by normalised root directory.
+
+    Examples
+    --------
+    >>> classified_ctl_transforms = classify_aces_ctl_roots(
+    ...     ['aces-dev-1.2/transforms/ctl', 'aces-dev-1.3/transforms/ctl'])
+    ... # doctest: +SKIP
+    """
+
+    if store is None:
+        store = CTLTransformStore()
+
+    unclassified_ctl_transforms = discover_aces_ctl_roots(
+        root_directories, filterers, rules, workers)
+
+    classified_paths = {
+        root_directory: (list(classify_ctl_transform_paths(unclassified))
+                         if unclassified else [])
+        for root_directory, unclassified in (
+            unclassified_ctl_transforms.items())
+    }
+
+    ctl_transforms = store.ctl_transforms(
+        (path for _category, _classifiers, _basename, pairs in
+         itertools.chain.from_iterable(classified_paths.values())
+         for path in pairs.values()), executor, workers)
+
+    classified_ctl_transforms = {}
+    for root_directory, paths in classified_paths.items():
+        classified = defaultdict(lambda: defaultdict(dict))
+        for category, classifiers, basename, pairs in paths:
+            classified[category][classifiers][basename] = (
+                _assemble_ctl_transform(pairs, ctl_transforms))
+
+        classified_ctl_transforms[root_directory] = vivified_to_dict(
+            classified)
+
+    return classified_ctl_transforms
@@ -0,0 +1,383 @@
+# -*- coding: utf-8 -*-
+
+import bisect
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+from collections import defaultdict
+
+from discover_aces_dev.discover import CTLTransform, CTLTransformPair
+
+__all__ = [
+    'SEARCH_INDEX_FORMAT_VERSION', 'SEARCH_FIELD_WEIGHTS', 'tokenize',
+    'SearchIndex'
+]
+
+SEARCH_INDEX_FORMAT_VERSION = 1
+
+SEARCH_FIELD_WEIGHTS = {'user_name': 3.0, 'description': 1.0, 'code': 0.5}
+"""
+Weight of the indexed fields in the search ranking.
+"""
+
+_PATTERN_TOKEN = re.compile('[^\\W_]+')
+
+_PATTERN_IDENTIFIER = re.compile('[A-Za-z_]\\w*')
+
+_CTL_KEYWORDS = frozenset([
+    'bool', 'const', 'else', 'false', 'float', 'for', 'half', 'if', 'import',
+    'input', 'int', 'output', 'return', 'struct', 'true', 'uniform',
+    'unsigned', 'varying', 'void', 'while'
+])
+
+_NGRAM_SIZE = 3
+
+
+def tokenize(text):
+    """
+    Splits given text into lower case alphanumeric tokens.
+
+    Parameters
+    ----------
+    text : unicode
+        Text to tokenize.
+
+    Returns
+    -------
+    list
+        Tokens.
+
+    Examples
+    --------
+    >>> tokenize('ACES 1.0 Output - Rec.709 (D60 sim.)')
+    ['aces', '1', '0', 'output', 'rec', '709', 'd60', 'sim']
+    """
+
+    return _PATTERN_TOKEN.findall(text.lower()) if text else []
+
+
+def _tokenize_code(code):
+    tokens = []
+    for identifier in _PATTERN_IDENTIFIER.findall(code):
+        if identifier in _CTL_KEYWORDS:
+            continue
+
+        identifier = identifier.lower()
+        tokens.append(identifier)
+        if '_' in identifier:
+            tokens.extend(token for token in identifier.split('_') if token)
+
+    return tokens
+
+
+def _ngrams(token):
+    return {
+        token[index:index + _NGRAM_SIZE]
+        for index in range(len(token) - _NGRAM_SIZE + 1)
+    }
+
+
+def _iterate_ctl_transforms(ctl_transforms):
+    if isinstance(ctl_transforms, dict):
+        for classifiers in ctl_transforms.values():
+            for classified_ctl_transforms in classifiers.values():
+                yield from _iterate_ctl_transforms(
+                    classified_ctl_transforms.values())
+
+        return
+
+    for ctl_transform in ctl_transforms:
+        if isinstance(ctl_transform, CTLTransformPair):
+            yield ctl_transform.forward_transform
+            yield ctl_transform.inverse_transform
+        else:
+            yield ctl_transform
+
+
+class SearchIndex:
+    """
+    Inverted full-text index over the *CTL* transforms user names and
+    descriptions, and optionally the identifiers of their code, supporting
+    ranked exact, prefix and substring queries.
+
+    The vocabulary is kept sorted for the prefix queries and a character
+    trigram index over the vocabulary serves the substring queries so that
+    neither scans the indexed *CTL* transforms. The results are ranked by the
+    sum over the query terms of the field weighted frequency of the matching
+    tokens times their inverse document frequency, partial matches being
+    down-weighted by their length ratio.
+
+    Parameters
+    ----------
+    ctl_transforms : array_like or dict, optional
+        *CTL* transforms to index, either an iterable of
+        :class:`discover_aces_dev.CTLTransform` or
+        :class:`discover_aces_dev.CTLTransformPair` class instances, e.g. a
+        :class:`discover_aces_dev.TransformIndex` class instance, or the
+        classified *CTL* transforms as returned by
+        :func:`discover_aces_dev.classify_aces_ctl_transforms` definition.
+    code : bool, optional
+        Whether to index the identifiers of the *CTL* transforms code, which
+        requires reading the files.
+
+    Examples
+    --------
+    >>> from discover_aces_dev.discover import (
+    ...     classify_aces_ctl_transforms, discover_aces_ctl)
+    >>> index = SearchIndex(classify_aces_ctl_transforms(discover_aces_ctl()))
+    ... # doctest: +SKIP
+    >>> index.search('alex')[0]  # doctest: +SKIP
+    (CTLTransform('Alexa-v3-logC-EI800', 'IDT.ARRI.Alexa-v3-logC-EI800.ctl'), \
+3.2188758248682006)
+    """
+
+    def __init__(self, ctl_transforms=None, code=False):
+        self._code = code
+        self._ctl_transforms = []
+        self._postings = defaultdict(dict)
+        self._vocabulary = None
+        self._ngrams = None
+        self._lock = threading.RLock()
+
+        if ctl_transforms is not None:
+            self.update(ctl_transforms)
+
+    @property
+    def code(self):
+        return self._code
+
+    def __len__(self):
+        return len(self._ctl_transforms)
+
+    def _fields(self, ctl_transform):
+        fields = [('user_name', tokenize(ctl_transform.user_name)),
+                  ('description', tokenize(ctl_transform.description))]
+        if self._code:
+            fields.append(('code', _tokenize_code(ctl_transform.code)))
+
+        return fields
+
+    def add(self, ctl_transform):
+        """
+        Indexes given *CTL* transform.
+
+        Parameters
+        ----------
+        ctl_transform : CTLTransform or CTLTransformPair
+            *CTL* transform or pair to index.
+        """
+
+        self.update([ctl_transform])
+
+    def update(self, ctl_transforms):
+        """
+        Indexes given *CTL* transforms.
+
+        Parameters
+        ----------
+        ctl_transforms : array_like or dict
+            *CTL* transforms or classified *CTL* transforms to index.
+        """
+
+        with self._lock:
+            for ctl_transform in _iterate_ctl_transforms(ctl_transforms):
+                document = len(self._ctl_transforms)
+                self._ctl_transforms.append(ctl_transform)
+
+                for field, tokens in self._fields(ctl_transform):
+                    weight = SEARCH_FIELD_WEIGHTS[field]
+                    for token in tokens:
+                        postings = self._postings[token]
+                        postings[document] = postings.get(document, 0) + weight
+
+            self._vocabulary = self._ngrams = None
+
+    def _build_vocabulary(self):
+        with self._lock:
+            if self._vocabulary is not None:
+                return
+
+            self._vocabulary = sorted(self._postings)
+            self._ngrams = defaultdict(set)
+            for token in self._vocabulary:
+                for ngram in _ngrams(token):
+                    self._ngrams[ngram].add(token)
+
+    def _matching_tokens(self, term, mode):
+        if mode == 'exact':
+            return [term] if term in self._postings else []
+
+        self._build_vocabulary()
+
+        if mode == 'prefix':
+            start = bisect.bisect_left(self._vocabulary, term)
+            end = bisect.bisect_left(self._vocabulary, f'{term}\uffff')
+
+            return self._vocabulary[start:end]
+
+        if len(term) < _NGRAM_SIZE:
+            return [token for token in self._vocabulary if term in token]
+
+        candidates = None
+        for ngram in _ngrams(term):
+            tokens = self._ngrams.get(ngram)
+            if not tokens:
+                return []
+
+            candidates = (set(tokens) if candidates is None else
+                          candidates.intersection(tokens))
+
+        return sorted(token for token in candidates if term in token)
+
+    def search(self, query, mode='prefix', limit=None):
+        """
+        Searches the *CTL* transforms matching all the terms of given query.
+
+        Parameters
+        ----------
+        query : unicode
+            Query, tokenized as the indexed fields.
+        mode : unicode, optional
+            {'prefix', 'substring', 'exact'}, how the query terms match the
+            indexed tokens.
+        limit : int, optional
+            Maximum result count.
+
+        Returns
+        -------
+        list
+            *(ctl_transform, score)* tuples sorted by decreasing score.
+
+        Raises
+        ------
+        ValueError
+            If the mode is invalid.
+        """
+
+        if mode not in ('prefix', 'substring', 'exact'):
+            raise ValueError(
+                f'"{mode}" mode is invalid, it must be one of '
+                f'[\'prefix\', \'substring\', \'exact\']!')
+
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        with self._lock:
+            document_count = len(self._ctl_transforms)
+            scores = None
+            for term in dict.fromkeys(terms):
+                term_scores = defaultdict(float)
+                for token in self._matching_tokens(term, mode):
+                    postings = self._postings[token]
+                    inverse_document_frequency = math.log(
+                        1 + document_count / len(postings))
+                    ratio = len(term) / len(token)
+                    for document, frequency in postings.items():
+                        term_scores[document] = max(
+                            term_scores[document],
+                            frequency * inverse_document_frequency * ratio)
+
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {
+                        document: score + term_scores[document]
+                        for document, score in scores.items()
+                        if document in term_scores
+                    }
+
+                if not scores:
+                    return []
+
+            results = sorted(scores.items(), key=lambda item: (-item[1],
+                                                               item[0]))
+            if limit is not None:
+                results = results[:limit]
+
+            return [(self._ctl_transforms[document], score)
+                    for document, score in results]
+
+    def save(self, path):
+        """
+        Writes the index to given *JSON* file, e.g. next to the discovery
+        cache. The *CTL* transforms metadata is stored along so that loading
+        the index does not parse them again.
+
+        Parameters
+        ----------
+        path : unicode
+            Index path.
+        """
+
+        with self._lock:
+            data = {
+                'version': SEARCH_INDEX_FORMAT_VERSION,
+                'code': self._code,
+                'ctl_transforms': [
+                    dict(ctl_transform.metadata, path=ctl_transform.path)
+                    for ctl_transform in self._ctl_transforms
+                ],
+                'postings': {
+                    token: [[document, frequency]
+                            for document, frequency in postings.items()]
+                    for token, postings in self._postings.items()
+                }
+            }
+
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w') as index_file:
+                json.dump(data, index_file, separators=(',', ':'))
+
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads an index written by the :meth:`SearchIndex.save` method.
+
+        Parameters
+        ----------
+        path : unicode
+            Index path.
+
+        Returns
+        -------
+        SearchIndex
+            Search index.
+
+        Raises
+        ------
+        ValueError
+            If the index format version is not supported.
+        """
+
+        with open(path) as index_file:
+            data = json.load(index_file)
+
+        if data.get('version') != SEARCH_INDEX_FORMAT_VERSION:
+            raise ValueError(
+                f'"{path}" search index format version '
+                f'{data.get("version")} is not supported, expected '
+                f'{SEARCH_INDEX_FORMAT_VERSION}!')
+
+        index = cls(code=data['code'])
+        index._ctl_transforms = [
+            CTLTransform(metadata['path'], metadata)
+            for metadata in data['ctl_transforms']
+        ]
+        for token, postings in data['postings'].items():
+            index._postings[token] = {
+                document: frequency
+                for document, frequency in postings
+            }
+
+        return index
@@ -0,0 +1,652 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections import defaultdict
+
+from discover_aces_dev.common import vivified_to_dict
+from discover_aces_dev.compact_graph import CompactGraph
+from discover_aces_dev.discover import (
+    CTL_TRANSFORM_METADATA_ATTRIBUTES,
+    REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT, CTLTransform, CTLTransformPair,
+    classify_aces_ctl_transforms, iter_aces_ctl)
+from discover_aces_dev.instrumentation import timer
+
+__all__ = [
+    'SNAPSHOT_FORMAT_VERSION', 'tree_fingerprint', 'write_snapshot',
+    'Snapshot', 'build_snapshot', 'load_snapshot'
+]
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+_SNAPSHOT_MAGIC = b'ACESSNAP'
+
+# Magic, format version, flags, string, record, node and edge counts, root
+# directory string and tree fingerprint.
+_SNAPSHOT_HEADER = struct.Struct('<8sIIIIIIi32s')
+
+_FLAG_GRAPH = 1
+
+_FLAG_BIG_ENDIAN = 2
+
+_RECORD_COLUMNS = (['path'] + CTL_TRANSFORM_METADATA_ATTRIBUTES +
+                   ['category', 'classifiers', 'basename', 'direction'])
+
+_NONE = 0xFFFFFFFF
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def tree_fingerprint(root_directory, filterers=None, rules=None):
+    """
+    Returns the fingerprint of the *CTL* transforms under given root
+    directory, computed from their relative paths, sizes and modification
+    times without reading them.
+
+    Parameters
+    ----------
+    root_directory : unicode
+        Root directory to discover the *CTL* transforms from.
+    filterers : array_like, optional
+        Callables receiving a filename and returning whether the file should
+        be kept.
+    rules : DiscoveryRules, optional
+        Declarative rules pruning the directories before they are walked and
+        excluding *CTL* transforms.
+
+    Returns
+    -------
+    unicode
+        *SHA-256* hex digest of the tree.
+    """
+
+    root_directory = os.path.normpath(os.path.expandvars(root_directory))
+
+    entries = []
+    for _directory, paths in iter_aces_ctl(root_directory, filterers, rules):
+        for path in paths:
+            stat = os.stat(path)
+            entries.append(f'{os.path.relpath(path, root_directory)}\0'
+                           f'{stat.st_size}\0{stat.st_mtime_ns}\n')
+
+    digest = hashlib.sha256()
+    for entry in sorted(entries):
+        digest.update(entry.encode('utf-8'))
+
+    return digest.hexdigest()
+
+
+class _StringTable:
+    def __init__(self):
+        self._indexes = {}
+        self._strings = []
+
+    def intern(self, string):
+        if string is None:
+            return _NONE
+
+        index = self._indexes.get(string)
+        if index is None:
+            index = self._indexes[string] = len(self._strings)
+            self._strings.append(string)
+
+        return index
+
+    def code(self, string):
+        # Returns the index of given string without interning it, "None" if
+        # the string is not in the table.
+        if string is None:
+            return _NONE
+
+        return self._indexes.get(string)
+
+    def __getitem__(self, index):
+        return self._strings[index] if index != _NONE else None
+
+    def __len__(self):
+        return len(self._strings)
+
+    def encode(self):
+        offsets, blob = array('Q', [0]), bytearray()
+        for string in self._strings:
+            blob.extend(string.encode('utf-8'))
+            offsets.append(len(blob))
+
+        return offsets, bytes(blob)
+
+
+def _iterate_classified_ctl_transforms(classified_ctl_transforms):
+    for category, classifiers in classified_ctl_transforms.items():
+        for classifier, ctl_transforms in classifiers.items():
+            for basename, ctl_transform in ctl_transforms.items():
+                if isinstance(ctl_transform, CTLTransformPair):
+                    yield (category, classifier, basename,
+                           'forward_transform',
+                           ctl_transform.forward_transform)
+                    yield (category, classifier, basename,
+                           'inverse_transform',
+                           ctl_transform.inverse_transform)
+                else:
+                    yield category, classifier, basename, None, ctl_transform
+
+
+def write_snapshot(path,
+                   classified_ctl_transforms,
+                   graph=None,
+                   fingerprint=None,
+                   root_directory=None):
+    """
+    Writes given classified *CTL* transforms and conversion graph to a
+    versioned, memory-mappable snapshot file.
+
+    The snapshot is made of a fixed size header followed by 8 bytes aligned
+    sections: an interned string table, a fixed width record per *CTL*
+    transform and the *CSR* adjacency arrays of the graph. The file is
+    written atomically.
+
+    Parameters
+    ----------
+    path : unicode
+        Snapshot path.
+    classified_ctl_transforms : dict
+        Classified *CTL* transforms as returned by
+        :func:`discover_aces_dev.classify_aces_ctl_transforms` definition.
+    graph : CompactGraph, optional
+        Conversion graph whose edge data are *CTL* transforms of the
+        classified *CTL* transforms.
+    fingerprint : unicode, optional
+        Fingerprint of the transforms tree as returned by
+        :func:`tree_fingerprint` definition.
+    root_directory : unicode, optional
+        Transforms root directory.
+
+    Raises
+    ------
+    ValueError
+        If an edge of the graph is not a classified *CTL* transform.
+    """
+
+    strings = _StringTable()
+    records = array('I')
+    record_indexes = {}
+    for index, (category, classifiers, basename, direction,
+                ctl_transform) in enumerate(
+                    _iterate_classified_ctl_transforms(
+                        classified_ctl_transforms)):
+        record_indexes[id(ctl_transform)] = index
+
+        values = ctl_transform.metadata
+        values.update(
+            path=ctl_transform.path,
+            category=category,
+            classifiers=classifiers,
+            basename=basename,
+            direction=direction)
+        records.extend(
+            strings.intern(values[column]) for column in _RECORD_COLUMNS)
+
+    sections = []
+    flags = _FLAG_BIG_ENDIAN if sys.byteorder == 'big' else 0
+    node_count = edge_count = 0
+    if graph is not None:
+        flags |= _FLAG_GRAPH
+
+        offsets, targets, weights, edge_data = graph.to_csr()
+        node_count, edge_count = len(graph), len(targets)
+
+        nodes = array('I')
+        for node, node_type in zip(graph.nodes, graph.node_types):
+            nodes.extend([strings.intern(node), strings.intern(node_type)])
+
+        edges = array('I')
+        for ctl_transform in edge_data:
+            index = record_indexes.get(id(ctl_transform))
+            if index is None:
+                raise ValueError(
+                    f'"{ctl_transform}" edge is not a classified CTL '
+                    f'transform!')
+
+            edges.append(index)
+
+        sections = [
+            nodes,
+            array('q', offsets),
+            array('q', targets),
+            array('d', weights), edges
+        ]
+
+    root_directory_index = (strings.intern(
+        os.path.normpath(os.path.expandvars(root_directory)))
+                            if root_directory is not None else -1)
+    string_offsets, blob = strings.encode()
+
+    header = _SNAPSHOT_HEADER.pack(
+        _SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, flags, len(strings),
+        len(records) // len(_RECORD_COLUMNS), node_count, edge_count,
+        root_directory_index,
+        bytes.fromhex(fingerprint) if fingerprint else bytes(32))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as snapshot_file:
+            for section in [header, string_offsets, blob, records
+                            ] + sections:
+                snapshot_file.write(section)
+                snapshot_file.write(
+                    bytes(_align(snapshot_file.tell()) -
+                          snapshot_file.tell()))
+
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+class Snapshot:
+    """
+    Memory-mapped snapshot of the classified *CTL* transforms and conversion
+    graph written by :func:`write_snapshot` definition.
+
+    Opening a snapshot only maps the file and validates its header, the
+    strings are decoded on demand and neither the classified *CTL* transforms
+    nor the graph access the transforms tree.
+
+    Parameters
+    ----------
+    path : unicode
+        Snapshot path.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a snapshot or its format version is not supported.
+    """
+
+    def __init__(self, path):
+        self._path = path
+
+        with open(path, 'rb') as snapshot_file:
+            self._buffer = mmap.mmap(
+                snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            (magic, version, self._flags, string_count, self._record_count,
+             self._node_count, self._edge_count, root_directory_index,
+             fingerprint) = _SNAPSHOT_HEADER.unpack_from(self._buffer)
+        except struct.error:
+            magic, version = None, None
+
+        if magic != _SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f'"{path}" is not a snapshot!')
+
+        if version != SNAPSHOT_FORMAT_VERSION:
+            self.close()
+            raise ValueError(
+                f'"{path}" snapshot format version {version} is not '
+                f'supported, expected {SNAPSHOT_FORMAT_VERSION}!')
+
+        self._fingerprint = (fingerprint.hex()
+                             if any(fingerprint) else None)
+
+        try:
+            self._offset = _align(_SNAPSHOT_HEADER.size)
+            self._string_offsets = self._section('Q', string_count + 1)
+            self._blob_offset = self._offset
+            self._offset = self._check_bounds(self._offset +
+                                              self._string_offsets[-1])
+            self._strings = None
+            self._records = self._section(
+                'I', self._record_count * len(_RECORD_COLUMNS))
+
+            if self._flags & _FLAG_GRAPH:
+                offset = self._offset
+                for typecode, length in self._graph_sections():
+                    offset = self._check_bounds(
+                        offset + array(typecode).itemsize * length)
+
+            if root_directory_index >= string_count:
+                raise ValueError(
+                    f'"{path}" snapshot root directory string index is '
+                    f'invalid!')
+        except ValueError:
+            self.close()
+            raise
+
+        self._root_directory = (self._string(root_directory_index)
+                                if root_directory_index >= 0 else None)
+
+        self._classified_ctl_transforms = None
+        self._ctl_transforms = None
+        self._graph = None
+
+    def _check_bounds(self, end):
+        # Returns the aligned offset following a section ending at given
+        # offset, checking that the section and its padding are within the
+        # file so that a truncated snapshot is detected.
+        end = _align(end)
+        if end > len(self._buffer):
+            raise ValueError(f'"{self._path}" snapshot is truncated!')
+
+        return end
+
+    def _graph_sections(self):
+        return [('I', self._node_count * 2), ('q', self._node_count + 1),
+                ('q', self._edge_count), ('d', self._edge_count),
+                ('I', self._edge_count)]
+
+    def _section(self, typecode, length):
+        # The sections are views of the mapped file, they are only copied
+        # when the snapshot byte order is not the native one.
+        start = self._offset
+        end = start + array(typecode).itemsize * length
+        self._offset = self._check_bounds(end)
+
+        if bool(self._flags & _FLAG_BIG_ENDIAN) == (sys.byteorder == 'big'):
+            return memoryview(self._buffer)[start:end].cast(typecode)
+
+        section = array(typecode)
+        section.frombytes(self._buffer[start:end])
+        section.byteswap()
+
+        return section
+
+    def _string(self, index):
+        if index == _NONE:
+            return None
+
+        return self._buffer[self._blob_offset +
+                            self._string_offsets[index]:self._blob_offset +
+                            self._string_offsets[index + 1]].decode('utf-8')
+
+    def _decode_strings(self):
+        # Decodes the whole string table at once into a mapping from string
+        # index to string, the missing values sentinel mapping to "None".
+        if self._strings is None:
+            blob = self._buffer[self._blob_offset:self._blob_offset +
+                                self._string_offsets[-1]]
+            offsets = self._string_offsets
+            self._strings = {
+                index: blob[start:end].decode('utf-8')
+                for index, (start, end) in enumerate(
+                    zip(offsets[:-1], offsets[1:]))
+            }
+            self._strings[_NONE] = None
+
+        return self._strings
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def fingerprint(self):
+        return self._fingerprint
+
+    @property
+    def root_directory(self):
+        return self._root_directory
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._record_count
+
+    def _load_ctl_transforms(self):
+        if self._ctl_transforms is not None:
+            return
+
+        column_count = len(_RECORD_COLUMNS)
+        strings = list(map(self._decode_strings().__getitem__, self._records))
+        self._ctl_transforms = []
+        self._classifications = []
+        for index in range(0, len(strings), column_count):
+            values = dict(
+                zip(_RECORD_COLUMNS, strings[index:index + column_count]))
+
+            self._ctl_transforms.append(
+                CTLTransform(values['path'], values))
+            self._classifications.append(
+                (values['category'], values['classifiers'],
+                 values['basename'], values['direction']))
+
+    @property
+    def classified_ctl_transforms(self):
+        """
+        Classified *CTL* transforms, as returned by
+        :func:`discover_aces_dev.classify_aces_ctl_transforms` definition.
+        """
+
+        if self._classified_ctl_transforms is not None:
+            return self._classified_ctl_transforms
+
+        with timer('snapshot_load'):
+            self._load_ctl_transforms()
+
+            classified_ctl_transforms = defaultdict(
+                lambda: defaultdict(dict))
+            ctl_transform_pairs = {}
+            for (category, classifiers, basename,
+                 direction), ctl_transform in zip(self._classifications,
+                                                  self._ctl_transforms):
+                if direction is None:
+                    classified_ctl_transforms[category][classifiers][
+                        basename] = ctl_transform
+                    continue
+
+                pairs = ctl_transform_pairs.setdefault(
+                    (category, classifiers, basename), {})
+                pairs[direction] = ctl_transform
+                if len(pairs) == 2:
+                    classified_ctl_transforms[category][classifiers][
+                        basename] = CTLTransformPair(
+                            pairs['forward_transform'],
+                            pairs['inverse_transform'])
+
+            self._classified_ctl_transforms = vivified_to_dict(
+                classified_ctl_transforms)
+
+        return self._classified_ctl_transforms
+
+    @property
+    def graph(self):
+        """
+        Conversion graph whose edge data are the *CTL* transforms of
+        :attr:`Snapshot.classified_ctl_transforms` attribute, *None* if the
+        snapshot has no graph.
+        """
+
+        if self._graph is not None or not self._flags & _FLAG_GRAPH:
+            return self._graph
+
+        with timer('snapshot_load'):
+            self._load_ctl_transforms()
+
+            offset = self._offset
+            nodes, offsets, targets, weights, edges = [
+                self._section(typecode, length)
+                for typecode, length in self._graph_sections()
+            ]
+            self._offset = offset
+
+            self._graph = CompactGraph.from_csr(
+                map(self._strings.__getitem__, nodes[0::2]),
+                map(self._strings.__getitem__, nodes[1::2]), offsets,
+                targets, weights,
+                [self._ctl_transforms[index] for index in edges])
+
+        return self._graph
+
+    def is_stale(self, root_directory=None, filterers=None, rules=None):
+        """
+        Returns whether the transforms tree changed since the snapshot was
+        written, by comparing its fingerprint.
+
+        Parameters
+        ----------
+        root_directory : unicode, optional
+            Transforms root directory, defaults to the snapshot root
+            directory.
+        filterers : array_like, optional
+            Filterers the snapshot was built with.
+        rules : DiscoveryRules, optional
+            Rules the snapshot was built with.
+
+        Returns
+        -------
+        bool
+            Whether the snapshot is stale, snapshots without fingerprint or
+            root directory are always stale.
+        """
+
+        if root_directory is None:
+            root_directory = self._root_directory
+
+        if self._fingerprint is None or root_directory is None:
+            return True
+
+        return tree_fingerprint(root_directory, filterers,
+                                rules) != self._fingerprint
+
+    def close(self):
+        """
+        Unmaps the snapshot file, the already loaded *CTL* transforms and
+        graph remain usable.
+
+        The graph adjacency arrays are views of the mapped file, if they are
+        still referenced, the file is unmapped when they are released.
+        """
+
+        for section in (getattr(self, '_string_offsets', None),
+                        getattr(self, '_records', None)):
+            if isinstance(section, memoryview):
+                section.release()
+
+        try:
+            self._buffer.close()
+        except BufferError:
+            pass
+
+
+def build_snapshot(path,
+                   root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
+                   filterers=None,
+                   rules=None):
+    """
+    Discovers and classifies the *CTL* transforms under given root directory,
+    builds their conversion graph and writes them to a snapshot.
+
+    Parameters
+    ----------
+    path : unicode
+        Snapshot path.
+    root_directory : unicode, optional
+        Transforms root directory.
+    filterers : array_like, optional
+        Filterers passed to :func:`discover_aces_dev.discover_aces_ctl`
+        definition.
+    rules : DiscoveryRules, optional
+        Rules passed to :func:`discover_aces_dev.discover_aces_ctl`
+        definition.
+
+    Returns
+    -------
+    Snapshot
+        Written snapshot.
+    """
+
+    from discover_aces_dev.graph import _unclassify_ctl_transforms
+
+    root_directory = os.path.normpath(os.path.expandvars(root_directory))
+
+    fingerprint = tree_fingerprint(root_directory, filterers, rules)
+
+    unclassified_ctl_transforms = defaultdict(list)
+    for directory, paths in iter_aces_ctl(root_directory, filterers, rules):
+        unclassified_ctl_transforms[directory].extend(paths)
+
+    classified_ctl_transforms = classify_aces_ctl_transforms(
+        unclassified_ctl_transforms)
+
+    with timer('graph_build'):
+        graph = CompactGraph.from_ctl_transforms(
+            _unclassify_ctl_transforms(classified_ctl_transforms))
+
+    write_snapshot(path, classified_ctl_transforms, graph, fingerprint,
+                   root_directory)
+
+    return Snapshot(path)
+
+
+def load_snapshot(path,
+                  root_directory=None,
+                  filterers=None,
+                  rules=None,
+                  rebuild=True):
+    """
+    Loads given snapshot, optionally checking it against the transforms tree.
+
+    Parameters
+    ----------
+    path : unicode
+        Snapshot path.
+    root_directory : unicode, optional
+        Transforms root directory, the tree is not accessed at all and the
+        snapshot is loaded as is if *None*.
+    filterers : array_like, optional
+        Filterers the snapshot was built with.
+    rules : DiscoveryRules, optional
+        Rules the snapshot was built with.
+    rebuild : bool, optional
+        Whether to rebuild a missing, invalid or stale snapshot, otherwise
+        *None* is returned.
+
+    Returns
+    -------
+    Snapshot or None
+        Snapshot.
+
+    Examples
+    --------
+    >>> snapshot = load_snapshot('aces.snapshot')  # doctest: +SKIP
+    >>> snapshot.graph.shortest_path('ACEScg', 'OCES')  # doctest: +SKIP
+    ['ACEScg', 'ACES2065-1', 'OCES']
+    """
+
+    snapshot = None
+    try:
+        snapshot = Snapshot(path)
+    except (OSError, ValueError) as error:
+        logging.info('"%s" snapshot cannot be loaded: %s', path, error)
+
+    if root_directory is None:
+        return snapshot
+
+    if snapshot is not None and not snapshot.is_stale(root_directory,
+                                                      filterers, rules):
+        return snapshot
+
+    if snapshot is not None:
+        logging.info('"%s" snapshot is stale!', path)
+        snapshot.close()
+
+    if not rebuild:
+        return None
+
+    logging.info('Building "%s" snapshot.', path)
+
+    return build_snapshot(path, root_directory, filterers, rules)
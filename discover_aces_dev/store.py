@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+
+import operator
+import re
+from array import array
+
+from discover_aces_dev.common import is_numpy_installed
+from discover_aces_dev.discover import CTLTransform
+from discover_aces_dev.instrumentation import count, timer
+from discover_aces_dev.snapshot import (_NONE, _RECORD_COLUMNS, _StringTable,
+                                        _iterate_classified_ctl_transforms)
+
+if is_numpy_installed():  # pragma: no cover
+    import numpy as np
+
+__all__ = ['TRANSFORM_STORE_COLUMNS', 'TransformStore']
+
+_VERSION_COLUMNS = {
+    'major_version': 'major_version_number',
+    'minor_version': 'minor_version_number',
+    'patch_version': 'patch_version_number',
+}
+
+TRANSFORM_STORE_COLUMNS = _RECORD_COLUMNS + list(_VERSION_COLUMNS)
+"""
+Columns of the :class:`TransformStore` class: the path, metadata and
+classification of the *CTL* transforms as string table indexes, followed by
+the version numbers of their id as integers, e.g. *1* for *a1*.
+"""
+
+_OPERATORS = {
+    'lt': operator.lt,
+    'le': operator.le,
+    'gt': operator.gt,
+    'ge': operator.ge,
+    'ne': operator.ne,
+}
+
+_PATTERN_VERSION_NUMBER = re.compile('\\d+')
+
+
+def _version_number(version_number):
+    if version_number is None:
+        return _NONE
+
+    search = _PATTERN_VERSION_NUMBER.search(version_number)
+
+    return int(search.group(0)) if search else _NONE
+
+
+class TransformStore:
+    """
+    Compact, immutable columnar store of the metadata and classification of
+    *CTL* transforms.
+
+    The strings are interned into a string table and each *CTL* transform is
+    a fixed width record of unsigned 32-bit integers, one per column of
+    :attr:`TRANSFORM_STORE_COLUMNS` attribute, the missing values being
+    *0xFFFFFFFF*. The records can be filtered without creating any
+    :class:`discover_aces_dev.CTLTransform` class instance, those are only
+    created when requested and do not hold the *CTL* code until it is
+    accessed. With *NumPy*, the filters are vectorized and the records are
+    exported as a structured array sharing the store memory.
+
+    Several stores, e.g. successive versions of a catalogue, can share their
+    string table so that the strings common to them are stored once.
+
+    Parameters
+    ----------
+    classified_ctl_transforms : dict
+        Classified *CTL* transforms as returned by
+        :func:`discover_aces_dev.classify_aces_ctl_transforms` definition.
+    strings : object, optional
+        String table of another store, see :attr:`TransformStore.strings`
+        attribute.
+
+    Examples
+    --------
+    >>> from discover_aces_dev.discover import (
+    ...     classify_aces_ctl_transforms, discover_aces_ctl)
+    >>> store = TransformStore(
+    ...     classify_aces_ctl_transforms(discover_aces_ctl()))
+    ... # doctest: +SKIP
+    >>> store.query(type='ODT', major_version__ge=1)[:1]  # doctest: +SKIP
+    [CTLTransform('Rec709_100nits_dim', 'ODT.Academy.Rec709_100nits_dim.ctl')]
+    """
+
+    def __init__(self, classified_ctl_transforms, strings=None):
+        self._strings = _StringTable() if strings is None else strings
+        self._records = array('I')
+
+        with timer('store_build'):
+            for (category, classifiers, basename, direction,
+                 ctl_transform) in _iterate_classified_ctl_transforms(
+                     classified_ctl_transforms):
+                values = ctl_transform.metadata
+                values.update(
+                    path=ctl_transform.path,
+                    category=category,
+                    classifiers=classifiers,
+                    basename=basename,
+                    direction=direction)
+
+                self._records.extend(
+                    self._strings.intern(values[column])
+                    for column in _RECORD_COLUMNS)
+                self._records.extend(
+                    _version_number(values[attribute])
+                    for attribute in _VERSION_COLUMNS.values())
+
+    @property
+    def strings(self):
+        """
+        String table of the store, the string table indexes of the records
+        are decoded with :meth:`TransformStore.string` method.
+        """
+
+        return self._strings
+
+    @property
+    def records(self):
+        """
+        Records of the store, as a flat *array* of unsigned 32-bit integers.
+        """
+
+        return self._records
+
+    def __len__(self):
+        return len(self._records) // len(TRANSFORM_STORE_COLUMNS)
+
+    def __getitem__(self, index):
+        return self.ctl_transform(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.ctl_transform(index)
+
+    def string(self, code):
+        """
+        Returns the string with given string table index.
+
+        Parameters
+        ----------
+        code : int
+            String table index.
+
+        Returns
+        -------
+        unicode
+            String, *None* for the missing values.
+        """
+
+        return self._strings[int(code)]
+
+    def _column_index(self, column):
+        try:
+            return TRANSFORM_STORE_COLUMNS.index(column)
+        except ValueError:
+            raise ValueError(
+                f'"{column}" column is invalid, it must be one of '
+                f'{TRANSFORM_STORE_COLUMNS}!')
+
+    def column(self, column):
+        """
+        Returns the values of given column, string table indexes for the
+        string columns.
+
+        Parameters
+        ----------
+        column : unicode
+            Column, see :attr:`TRANSFORM_STORE_COLUMNS` attribute.
+
+        Returns
+        -------
+        array or ndarray
+            Column values, a view of the records if *NumPy* is installed.
+        """
+
+        index = self._column_index(column)
+        if is_numpy_installed():
+            return self.to_structured_array()[column]
+
+        return self._records[index::len(TRANSFORM_STORE_COLUMNS)]
+
+    def values(self, column):
+        """
+        Returns the distinct values of given column.
+
+        Parameters
+        ----------
+        column : unicode
+            Column, see :attr:`TRANSFORM_STORE_COLUMNS` attribute.
+
+        Returns
+        -------
+        list
+            Distinct values in storing order.
+        """
+
+        values = dict.fromkeys(int(code) for code in self.column(column))
+        values.pop(_NONE, None)
+
+        if column in _VERSION_COLUMNS:
+            return list(values)
+
+        return [self._strings[code] for code in values]
+
+    def metadata(self, index):
+        """
+        Returns the metadata and classification of the *CTL* transform with
+        given index.
+
+        Parameters
+        ----------
+        index : int
+            *CTL* transform index.
+
+        Returns
+        -------
+        dict
+            Values of the string columns.
+        """
+
+        if not -len(self) <= index < len(self):
+            raise IndexError(f'{index} CTL transform index is out of range!')
+
+        start = (index % len(self)) * len(TRANSFORM_STORE_COLUMNS)
+
+        return {
+            column: self._strings[code]
+            for column, code in zip(
+                _RECORD_COLUMNS,
+                self._records[start:start + len(_RECORD_COLUMNS)])
+        }
+
+    def ctl_transform(self, index):
+        """
+        Creates the *CTL* transform with given index.
+
+        Parameters
+        ----------
+        index : int
+            *CTL* transform index.
+
+        Returns
+        -------
+        CTLTransform
+            *CTL* transform, a new instance is created on each call.
+        """
+
+        count('store_ctl_transforms_created')
+
+        metadata = self.metadata(index)
+
+        return CTLTransform(metadata['path'], metadata)
+
+    def _mask(self, column, operation, value):
+        index = self._column_index(column)
+        is_version_column = column in _VERSION_COLUMNS
+
+        if operation is None:
+            if not isinstance(value, (list, tuple, set, frozenset)):
+                value = [value]
+
+            if is_version_column:
+                codes = {_NONE if item is None else item for item in value}
+            else:
+                codes = {self._strings.code(item) for item in value}
+                codes.discard(None)
+
+            if is_numpy_installed():
+                return np.isin(self.column(column), list(codes))
+
+            return [code in codes for code in self.column(column)]
+
+        comparer = _OPERATORS.get(operation)
+        if comparer is None:
+            raise ValueError(
+                f'"{operation}" operation is invalid, it must be one of '
+                f'{list(_OPERATORS)}!')
+
+        if not is_version_column:
+            if operation != 'ne':
+                raise ValueError(
+                    f'"{operation}" operation is only supported by the '
+                    f'{list(_VERSION_COLUMNS)} columns!')
+
+            code = self._strings.code(value)
+            if code is None:
+                return self._mask(column, 'ne', None)
+
+            value = code
+
+        values = self.column(column)
+        if is_numpy_installed():
+            return comparer(values, value) & (values != _NONE)
+
+        return [
+            comparer(code, value) and code != _NONE for code in values
+        ]
+
+    def select(self, **criteria):
+        """
+        Returns the indexes of the *CTL* transforms matching all the given
+        criteria.
+
+        Other Parameters
+        ----------------
+        \\**kwargs : dict, optional
+            Columns and their values, see :attr:`TRANSFORM_STORE_COLUMNS`
+            attribute. A value can be a *list*, *tuple* or *set* of accepted
+            values. A column can be suffixed with *__lt*, *__le*, *__gt*,
+            *__ge* or *__ne* to compare its values instead, only *__ne* is
+            supported by the string columns.
+
+        Returns
+        -------
+        list
+            *CTL* transforms indexes in storing order.
+
+        Examples
+        --------
+        >>> store.select(type='ODT', major_version__ge=1)  # doctest: +SKIP
+        [12, 13, 14]
+        """
+
+        count('store_selections')
+
+        mask = None
+        for criterion, value in criteria.items():
+            column, _separator, operation = criterion.partition('__')
+            criterion_mask = self._mask(column, operation or None, value)
+
+            if mask is None:
+                mask = criterion_mask
+            elif is_numpy_installed():
+                mask = mask & criterion_mask
+            else:
+                mask = [a and b for a, b in zip(mask, criterion_mask)]
+
+        if mask is None:
+            return list(range(len(self)))
+
+        if is_numpy_installed():
+            return np.flatnonzero(mask).tolist()
+
+        return [index for index, selected in enumerate(mask) if selected]
+
+    def query(self, **criteria):
+        """
+        Creates the *CTL* transforms matching all the given criteria, see
+        :meth:`TransformStore.select` method.
+
+        Other Parameters
+        ----------------
+        \\**kwargs : dict, optional
+            Columns and their values.
+
+        Returns
+        -------
+        list
+            *CTL* transforms in storing order.
+        """
+
+        return [self.ctl_transform(index) for index in self.select(**criteria)]
+
+    def to_structured_array(self):
+        """
+        Returns the records as a *NumPy* structured array with a field per
+        column of :attr:`TRANSFORM_STORE_COLUMNS` attribute.
+
+        The array is a read-only view of the records, no data is copied.
+
+        Returns
+        -------
+        ndarray
+            Structured array.
+        """
+
+        is_numpy_installed(raise_exception=True)
+
+        records = np.frombuffer(
+            self._records,
+            dtype=np.dtype([(column, np.uint32)
+                            for column in TRANSFORM_STORE_COLUMNS]))
+        records.flags.writeable = False
+
+        return records
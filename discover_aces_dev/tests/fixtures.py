@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from discover_aces_dev.discover import ACES_URN
+
+__all__ = ['CTL_TRANSFORMS', 'write_ctl_transforms', 'TransformsTreeTestCase']
+
+CTL_TRANSFORMS = {
+    'ctl/csc/ACEScg': [
+        'ACEScsc.Academy.ACEScg_to_ACES', 'ACEScsc.Academy.ACES_to_ACEScg'
+    ],
+    'ctl/csc/ACEScct': [
+        'ACEScsc.Academy.ACEScct_to_ACES', 'ACEScsc.Academy.ACES_to_ACEScct'
+    ],
+    'ctl/idt/vendorSupplied/sony': ['IDT.Sony.SLog3_SGamut3'],
+    'ctl/idt/vendorSupplied/canon': ['IDT.Canon.C300MkII_CanonLog2'],
+    'ctl/odt/rec709': [
+        'ODT.Academy.Rec709_100nits_dim', 'InvODT.Academy.Rec709_100nits_dim'
+    ],
+    'ctl/odt/p3': ['ODT.Academy.P3D65_48nits', 'InvODT.Academy.P3D65_48nits'],
+    'ctl/outputTransforms': [
+        'RRTODT.Academy.Rec2020_1000nits_15nits_HLG',
+        'InvRRTODT.Academy.Rec2020_1000nits_15nits_HLG'
+    ],
+    'ctl/lmt': ['LMT.Academy.ACES_0_1_1'],
+    'ctl/rrt': ['RRT', 'InvRRT'],
+    'ctl/lib': ['ACESlib.Utilities'],
+    'ctl/utilities': ['ACESutil.Unity'],
+}
+"""
+Basenames of the *CTL* transforms of a small *aces-dev* like tree, keyed by
+directory.
+"""
+
+_CTL_TRANSFORM = '''// <ACEStransformID>{id}</ACEStransformID>
+// <ACESuserName>Test - {basename}</ACESuserName>
+
+//
+// Test "{basename}" transform.
+//
+
+void main(input varying float rIn,
+          input varying float gIn,
+          input varying float bIn,
+          input varying float aIn,
+          output varying float rOut,
+          output varying float gOut,
+          output varying float bOut,
+          output varying float aOut)
+{{
+    rOut = rIn;
+    gOut = gIn;
+    bOut = bIn;
+    aOut = aIn;
+}}
+'''
+
+
+def write_ctl_transforms(root_directory, ctl_transforms=None):
+    """
+    Writes given *CTL* transforms under given root directory.
+
+    Parameters
+    ----------
+    root_directory : unicode
+        Directory to write the *CTL* transforms into.
+    ctl_transforms : dict, optional
+        Basenames of the *CTL* transforms keyed by directory relative to the
+        root directory, defaults to :attr:`CTL_TRANSFORMS` attribute.
+
+    Returns
+    -------
+    list
+        Paths of the written *CTL* transforms.
+    """
+
+    if ctl_transforms is None:
+        ctl_transforms = CTL_TRANSFORMS
+
+    paths = []
+    for directory, basenames in ctl_transforms.items():
+        directory = os.path.join(root_directory, *directory.split('/'))
+        os.makedirs(directory, exist_ok=True)
+
+        for basename in basenames:
+            path = os.path.join(directory, f'{basename}.ctl')
+            with open(path, 'w') as ctl_file:
+                ctl_file.write(
+                    _CTL_TRANSFORM.format(
+                        id=f'{ACES_URN}:{basename}.a1.0.3',
+                        basename=basename))
+
+            paths.append(path)
+
+    return paths
+
+
+class TransformsTreeTestCase(unittest.TestCase):
+    """
+    Base test case writing the :attr:`CTL_TRANSFORMS` attribute *CTL*
+    transforms under the *transforms* directory of a temporary directory.
+    """
+
+    def setUp(self):
+        """
+        Initialises common tests attributes.
+        """
+
+        self._temporary_directory = tempfile.mkdtemp()
+        self._root_directory = os.path.join(self._temporary_directory,
+                                            'transforms')
+
+        write_ctl_transforms(self._root_directory)
+
+    def tearDown(self):
+        """
+        After tests actions.
+        """
+
+        shutil.rmtree(self._temporary_directory)
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from discover_aces_dev.asynchronous import (
+    async_classify_aces_ctl_transforms, async_discover_aces_ctl,
+    async_parse_ctl_transforms)
+from discover_aces_dev.discover import (
+    CTLTransformPair, DiscoveryRules, classify_aces_ctl_transforms,
+    discover_aces_ctl)
+from discover_aces_dev.index import TransformIndex
+from discover_aces_dev.tests.fixtures import TransformsTreeTestCase
+
+__all__ = [
+    'TestAsyncDiscoverAcesCtl', 'TestAsyncParseCtlTransforms',
+    'TestAsyncClassifyAcesCtlTransforms'
+]
+
+
+def _paths(classified_ctl_transforms):
+    # Returns the classification of the paths of given classified "CTL"
+    # transforms in classification order, the pairs being flattened.
+    paths = []
+    for category, classifiers in classified_ctl_transforms.items():
+        for classifier, ctl_transforms in classifiers.items():
+            for basename, ctl_transform in ctl_transforms.items():
+                if isinstance(ctl_transform, CTLTransformPair):
+                    members = (ctl_transform.forward_transform,
+                               ctl_transform.inverse_transform)
+                else:
+                    members = (ctl_transform, )
+
+                for member in members:
+                    paths.append((category, classifier, basename, member.path,
+                                  member.id))
+
+    return paths
+
+
+class TestAsyncDiscoverAcesCtl(TransformsTreeTestCase):
+    """
+    Defines :func:`discover_aces_dev.asynchronous.async_discover_aces_ctl`
+    definition unit tests methods.
+    """
+
+    def test_async_discover_aces_ctl(self):
+        """
+        Tests :func:`discover_aces_dev.asynchronous.async_discover_aces_ctl`
+        definition.
+        """
+
+        ctl_transforms = discover_aces_ctl(self._root_directory)
+
+        self.assertListEqual(
+            list(
+                asyncio.run(async_discover_aces_ctl(
+                    self._root_directory)).items()),
+            list(ctl_transforms.items()))
+
+        # A single concurrent listing on a dedicated executor walks the tree
+        # in the same order.
+        with ThreadPoolExecutor(2) as executor:
+            self.assertListEqual(
+                list(
+                    asyncio.run(
+                        async_discover_aces_ctl(
+                            self._root_directory,
+                            concurrency=1,
+                            executor=executor)).items()),
+                list(ctl_transforms.items()))
+
+        filterers = [lambda path: 'Academy' in path]
+        rules = DiscoveryRules(excluded_classifiers=['rec709'])
+        self.assertListEqual(
+            list(
+                asyncio.run(
+                    async_discover_aces_ctl(self._root_directory, filterers,
+                                            rules)).items()),
+            list(
+                discover_aces_ctl(self._root_directory, filterers,
+                                  rules).items()))
+
+        self.assertDictEqual(
+            asyncio.run(
+                async_discover_aces_ctl(f'{self._root_directory}/missing')),
+            {})
+
+
+class TestAsyncParseCtlTransforms(TransformsTreeTestCase):
+    """
+    Defines :func:`discover_aces_dev.asynchronous.async_parse_ctl_transforms`
+    definition unit tests methods.
+    """
+
+    def test_async_parse_ctl_transforms(self):
+        """
+        Tests :func:`discover_aces_dev.asynchronous.\
+async_parse_ctl_transforms` definition.
+        """
+
+        paths = [
+            path for paths in discover_aces_ctl(self._root_directory).values()
+            for path in paths
+        ]
+
+        ctl_transforms = asyncio.run(
+            async_parse_ctl_transforms(paths, concurrency=2))
+
+        self.assertListEqual(
+            [ctl_transform.path for ctl_transform in ctl_transforms], paths)
+        self.assertTrue(
+            all(ctl_transform.id.endswith('.a1.0.3')
+                for ctl_transform in ctl_transforms))
+
+
+class TestAsyncClassifyAcesCtlTransforms(TransformsTreeTestCase):
+    """
+    Defines :func:`discover_aces_dev.asynchronous.\
+async_classify_aces_ctl_transforms` definition unit tests methods.
+    """
+
+    def test_async_classify_aces_ctl_transforms(self):
+        """
+        Tests :func:`discover_aces_dev.asynchronous.\
+async_classify_aces_ctl_transforms` definition.
+        """
+
+        async def catalogue(index):
+            return await async_classify_aces_ctl_transforms(
+                await async_discover_aces_ctl(self._root_directory),
+                index=index)
+
+        index = TransformIndex()
+        classified_ctl_transforms = asyncio.run(catalogue(index))
+
+        self.assertListEqual(
+            _paths(classified_ctl_transforms),
+            _paths(
+                classify_aces_ctl_transforms(
+                    discover_aces_ctl(self._root_directory))))
+        self.assertEqual(len(index), 17)
+
+
+if __name__ == '__main__':
+    unittest.main()
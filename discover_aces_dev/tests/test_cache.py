@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from discover_aces_dev.cache import DiscoveryCache
+from discover_aces_dev.discover import (ACES_URN,
+                                        classify_aces_ctl_transforms,
+                                        discover_aces_ctl)
+
+__all__ = ['TestDiscoveryCache']
+
+
+class TestDiscoveryCache(unittest.TestCase):
+    """
+    Defines :class:`discover_aces_dev.cache.DiscoveryCache` class unit tests
+    methods.
+    """
+
+    def setUp(self):
+        """
+        Initialises common tests attributes.
+        """
+
+        self._root_directory = tempfile.mkdtemp()
+
+        directory = os.path.join(self._root_directory, 'ctl', 'idt', 'Y')
+        os.makedirs(directory)
+
+        # "IDT.Academy.Y.ctl" and "IDT.Academy.Y.CTL" have the same pair
+        # basename, only one of them is classified.
+        for basename in ('IDT.Academy.Y.ctl', 'IDT.Academy.Y.CTL',
+                         'IDT.Academy.Z.ctl'):
+            with open(os.path.join(directory, basename), 'w') as ctl_file:
+                ctl_file.write(f'// <ACEStransformID>{ACES_URN}:'
+                               f'{os.path.splitext(basename)[0]}.a1.0.3'
+                               f'</ACEStransformID>\n')
+
+        self._unclassified_ctl_transforms = discover_aces_ctl(
+            self._root_directory, [lambda filename: True])
+
+    def tearDown(self):
+        """
+        After tests actions.
+        """
+
+        shutil.rmtree(self._root_directory)
+
+    def test_classify_aces_ctl_transforms(self):
+        """
+        Tests :meth:`discover_aces_dev.cache.DiscoveryCache.\
+classify_aces_ctl_transforms` method.
+        """
+
+        classified_ctl_transforms = classify_aces_ctl_transforms(
+            self._unclassified_ctl_transforms)
+
+        def paths(classified_ctl_transforms):
+            return {
+                (category, classifier, basename, ctl_transform.path)
+                for category, classifiers in classified_ctl_transforms.items()
+                for classifier, ctl_transforms in classifiers.items()
+                for basename, ctl_transform in ctl_transforms.items()
+            }
+
+        path = os.path.join(self._root_directory, 'cache.sqlite')
+        for _ in range(2):
+            with DiscoveryCache(path) as cache:
+                with self.assertLogs(level='INFO') as logs:
+                    self.assertSetEqual(
+                        paths(
+                            cache.classify_aces_ctl_transforms(
+                                self._unclassified_ctl_transforms)),
+                        paths(classified_ctl_transforms))
+
+        self.assertIn('Discovery cache is up-to-date.', logs.output[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+from discover_aces_dev.client import DaemonClient, DaemonError
+
+__all__ = ['TestDaemonClient']
+
+
+class TestDaemonClient(unittest.TestCase):
+    """
+    Defines :class:`discover_aces_dev.client.DaemonClient` class unit tests
+    methods.
+    """
+
+    def setUp(self):
+        """
+        Initialises common tests attributes.
+        """
+
+        self._temporary_directory = tempfile.mkdtemp()
+        self._address = os.path.join(self._temporary_directory, 'daemon.sock')
+        self._requests = []
+
+        # The server reads each request and closes the connection without
+        # answering, as a daemon shutting down would.
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self._address)
+        self._server.listen()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def tearDown(self):
+        """
+        After tests actions.
+        """
+
+        self._server.close()
+        shutil.rmtree(self._temporary_directory)
+
+    def _serve(self):
+        while True:
+            try:
+                connection, _address = self._server.accept()
+            except OSError:
+                return
+
+            with connection, connection.makefile('rb') as connection_file:
+                self._requests.append(connection_file.readline())
+
+    def test_request(self):
+        """
+        Tests :meth:`discover_aces_dev.client.DaemonClient.request` method.
+        """
+
+        with DaemonClient(self._address, timeout=5) as client:
+            self.assertRaises(DaemonError, client.request, 'ping')
+            self.assertEqual(len(self._requests), 2)
+
+            self.assertRaises(DaemonError, client.request, 'reload')
+            self.assertEqual(len(self._requests), 3)
+
+    def test_request_unreachable(self):
+        """
+        Tests :meth:`discover_aces_dev.client.DaemonClient.request` method
+        with an unreachable daemon.
+        """
+
+        with DaemonClient(
+                os.path.join(self._temporary_directory, 'missing.sock'),
+                timeout=5) as client:
+            self.assertRaises(DaemonError, client.request, 'shutdown')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from collections import namedtuple
+
+from discover_aces_dev.compact_graph import CompactGraph
+
+__all__ = ['TestCompactGraph']
+
+_CTLTransform = namedtuple('_CTLTransform', ('type', 'source', 'target'))
+
+_CTL_TRANSFORMS = [
+    _CTLTransform('IDT', 'ARRI', 'ACES2065-1'),
+    _CTLTransform('ACEScsc', 'ACEScg', 'ACES2065-1'),
+    _CTLTransform('RRT', 'ACES2065-1', 'OCES'),
+    _CTLTransform('ODT', 'OCES', 'Rec709'),
+    _CTLTransform('ODT', 'OCES', 'P3D65'),
+]
+
+
+class TestCompactGraph(unittest.TestCase):
+    """
+    Defines :class:`discover_aces_dev.compact_graph.CompactGraph` class unit
+    tests methods.
+    """
+
+    def setUp(self):
+        """
+        Initialises common tests attributes.
+        """
+
+        self._graph = CompactGraph.from_ctl_transforms(_CTL_TRANSFORMS)
+
+    def test_neighbourhood(self):
+        """
+        Tests :meth:`discover_aces_dev.compact_graph.CompactGraph.\
+neighbourhood` method.
+        """
+
+        self.assertSetEqual(
+            self._graph.neighbourhood('OCES'),
+            {'OCES', 'ACES2065-1', 'Rec709', 'P3D65'})
+        self.assertSetEqual(
+            self._graph.neighbourhood('Rec709', 2),
+            {'Rec709', 'OCES', 'ACES2065-1', 'P3D65'})
+        self.assertSetEqual(
+            self._graph.neighbourhood('ARRI', 0), {'ARRI'})
+
+        self.assertSetEqual(
+            self._graph.neighbourhood(['ARRI', 'Rec709']),
+            self._graph.neighbourhood('ARRI') |
+            self._graph.neighbourhood('Rec709'))
+        self.assertSetEqual(self._graph.neighbourhood([]), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from discover_aces_dev.ctl_parser import (CTLSyntaxError,
+                                          ExpressionStatement, Increment,
+                                          Name, parse_ctl)
+
+__all__ = ['TestParseCtl']
+
+
+class TestParseCtl(unittest.TestCase):
+    """
+    Defines :func:`discover_aces_dev.ctl_parser.parse_ctl` definition unit
+    tests methods.
+    """
+
+    def test_parse_ctl_increments(self):
+        """
+        Tests :func:`discover_aces_dev.ctl_parser.parse_ctl` definition
+        prefix and postfix increments.
+        """
+
+        function = parse_ctl('void f() { ++i; i--; }').definitions[0]
+
+        self.assertListEqual(function.body.statements, [
+            ExpressionStatement(Increment('++', Name('i'), True)),
+            ExpressionStatement(Increment('--', Name('i'), False)),
+        ])
+
+    def test_raise_exception_parse_ctl(self):
+        """
+        Tests :func:`discover_aces_dev.ctl_parser.parse_ctl` definition raised
+        exception.
+        """
+
+        self.assertRaises(CTLSyntaxError, parse_ctl, 'float[3')
+        self.assertRaises(CTLSyntaxError, parse_ctl, 'float[3][2 f(')
+        self.assertRaises(CTLSyntaxError, parse_ctl, 'void f() { ++i; ')
+
+
+if __name__ == '__main__':
+    unittest.main()
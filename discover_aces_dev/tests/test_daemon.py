@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+
+from discover_aces_dev.daemon import QueryDaemon
+from discover_aces_dev.graph import (get_compact_conversion_graph,
+                                     invalidate_conversion_graph)
+from discover_aces_dev.tests.fixtures import TransformsTreeTestCase
+
+__all__ = ['TestQueryDaemon']
+
+
+def _edges(graph):
+    return sorted((source, target, ctl_transform.path)
+                  for source, target, ctl_transform in graph.edges())
+
+
+class TestQueryDaemon(TransformsTreeTestCase):
+    """
+    Defines :class:`discover_aces_dev.daemon.QueryDaemon` class unit tests
+    methods.
+    """
+
+    def setUp(self):
+        """
+        Initialises common tests attributes.
+        """
+
+        super().setUp()
+
+        self._daemon = QueryDaemon(
+            os.path.join(self._temporary_directory, 'daemon.sock'),
+            self._root_directory,
+            graph_filterers=[lambda filename: 'P3D65' not in filename])
+
+    def tearDown(self):
+        """
+        After tests actions.
+        """
+
+        self._daemon.close()
+        invalidate_conversion_graph()
+
+        super().tearDown()
+
+    def test_catalogue(self):
+        """
+        Tests :attr:`discover_aces_dev.daemon.QueryDaemon.catalogue`
+        attribute.
+        """
+
+        graph = self._daemon.catalogue.graph
+
+        self.assertListEqual(
+            _edges(graph),
+            _edges(
+                get_compact_conversion_graph(
+                    self._root_directory,
+                    [lambda filename: 'P3D65' not in filename])))
+        self.assertNotIn('P3D65_48nits', graph)
+        self.assertIn('Rec709_100nits_dim', graph)
+
+    def test_handle(self):
+        """
+        Tests :meth:`discover_aces_dev.daemon.QueryDaemon.handle` method.
+        """
+
+        self.assertIn(b'"result":"pong"',
+                      self._daemon.handle(b'{"id":0,"method":"ping"}'))
+        self.assertIn(
+            b'ODT.Academy.Rec709_100nits_dim.ctl',
+            self._daemon.handle(
+                b'{"id":1,"method":"path","params":'
+                b'{"source":"ACEScg","target":"Rec709_100nits_dim"}}'))
+        self.assertIn(b'"error"',
+                      self._daemon.handle(b'{"id":2,"method":"unknown"}'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+
+from discover_aces_dev.dependencies import (DependencyGraph,
+                                            get_dependency_graph,
+                                            invalidate_dependency_graph)
+from discover_aces_dev.discover import CTLTransform
+from discover_aces_dev.tests.fixtures import TransformsTreeTestCase
+
+__all__ = ['TestCTLTransformImports', 'TestDependencyGraph']
+
+_IMPORTS = '''import "ACESlib.Utilities";
+  import "ACESlib.Transform_Common" ;
+// import "ACESlib.Commented";
+/*
+import "ACESlib.BlockCommented";
+*/ import "ACESlib.Tonescales";
+/* import "ACESlib.InlineCommented"; */
+const string URL = "http://example.com/*";
+import "ACESlib.ODT_Common";
+'''
+
+
+class TestCTLTransformImports(TransformsTreeTestCase):
+    """
+    Defines :attr:`discover_aces_dev.discover.CTLTransform.imports` property
+    unit tests methods.
+    """
+
+    def test_imports(self):
+        """
+        Tests :attr:`discover_aces_dev.discover.CTLTransform.imports`
+        property.
+        """
+
+        path = os.path.join(self._root_directory, 'ctl', 'odt', 'rec709',
+                            'ODT.Academy.Rec709_100nits_dim.ctl')
+        with open(path) as ctl_file:
+            code = ctl_file.read()
+
+        with open(path, 'w') as ctl_file:
+            ctl_file.write(_IMPORTS + code)
+
+        self.assertListEqual(
+            CTLTransform(path).imports, [
+                'ACESlib.Utilities', 'ACESlib.Transform_Common',
+                'ACESlib.Tonescales', 'ACESlib.ODT_Common'
+            ])
+
+
+class TestDependencyGraph(TransformsTreeTestCase):
+    """
+    Defines :class:`discover_aces_dev.dependencies.DependencyGraph` class
+    unit tests methods.
+    """
+
+    def setUp(self):
+        """
+        Initialises common tests attributes.
+        """
+
+        super().setUp()
+
+        self._paths = {}
+        for directory, dirnames, filenames in os.walk(self._root_directory):
+            for filename in filenames:
+                self._paths[os.path.splitext(filename)[0]] = os.path.join(
+                    directory, filename)
+
+        self._add_imports('ACESlib.Utilities', ['ACESlib.Missing'])
+        self._add_imports('RRT', ['ACESlib.Utilities'])
+        self._add_imports('ODT.Academy.Rec709_100nits_dim',
+                          ['ACESlib.Utilities', 'RRT'])
+
+    def tearDown(self):
+        """
+        After tests actions.
+        """
+
+        invalidate_dependency_graph()
+
+        super().tearDown()
+
+    def _add_imports(self, basename, modules):
+        path = self._paths[basename]
+        with open(path) as ctl_file:
+            code = ctl_file.read()
+
+        with open(path, 'w') as ctl_file:
+            for module in modules:
+                ctl_file.write(f'import "{module}";\n')
+
+            ctl_file.write(code)
+
+    def test_dependency_graph(self):
+        """
+        Tests :class:`discover_aces_dev.dependencies.DependencyGraph` class.
+        """
+
+        dependency_graph = DependencyGraph(
+            [CTLTransform(path) for path in self._paths.values()])
+
+        self.assertEqual(len(dependency_graph), len(self._paths))
+        self.assertIn(self._paths['RRT'], dependency_graph)
+
+        self.assertDictEqual(dependency_graph.unresolved_imports(), {
+            os.path.normpath(self._paths['ACESlib.Utilities']):
+            ['ACESlib.Missing']
+        })
+
+        self.assertSetEqual({
+            ctl_transform.path for ctl_transform in
+            dependency_graph.dependants(self._paths['ACESlib.Utilities'])
+        }, {
+            self._paths['RRT'], self._paths['ODT.Academy.Rec709_100nits_dim']
+        })
+        self.assertListEqual([
+            ctl_transform.path for ctl_transform in
+            dependency_graph.dependencies(
+                self._paths['ODT.Academy.Rec709_100nits_dim'])
+        ], [self._paths['ACESlib.Utilities'], self._paths['RRT']])
+
+        order = dependency_graph.topological_order()
+        self.assertLess(
+            order.index(self._paths['ACESlib.Utilities']),
+            order.index(self._paths['RRT']))
+        self.assertLess(
+            order.index(self._paths['RRT']),
+            order.index(self._paths['ODT.Academy.Rec709_100nits_dim']))
+
+    def test_affected(self):
+        """
+        Tests :meth:`discover_aces_dev.dependencies.DependencyGraph.affected`
+        method.
+        """
+
+        dependency_graph = DependencyGraph(
+            [CTLTransform(path) for path in self._paths.values()])
+
+        self.assertListEqual([
+            ctl_transform.path for ctl_transform in dependency_graph.affected(
+                [self._paths['ACESlib.Utilities']])
+        ], [
+            self._paths['ACESlib.Utilities'], self._paths['RRT'],
+            self._paths['ODT.Academy.Rec709_100nits_dim']
+        ])
+
+        # Files outside the graph are matched by module name.
+        self.assertListEqual([
+            ctl_transform.path for ctl_transform in dependency_graph.affected(
+                [os.path.join('elsewhere', 'RRT.ctl'), 'Unknown.ctl'])
+        ], [self._paths['RRT'], self._paths['ODT.Academy.Rec709_100nits_dim']])
+
+    def test_raise_exception_topological_order(self):
+        """
+        Tests :meth:`discover_aces_dev.dependencies.DependencyGraph.\
+topological_order` method raised exception.
+        """
+
+        self._add_imports('ACESlib.Utilities',
+                          ['ODT.Academy.Rec709_100nits_dim'])
+
+        dependency_graph = DependencyGraph(
+            [CTLTransform(path) for path in self._paths.values()])
+
+        self.assertRaises(ValueError, dependency_graph.topological_order)
+
+    def test_get_dependency_graph(self):
+        """
+        Tests :func:`discover_aces_dev.dependencies.get_dependency_graph`
+        definition.
+        """
+
+        dependency_graph = get_dependency_graph(self._root_directory)
+
+        self.assertIs(get_dependency_graph(self._root_directory),
+                      dependency_graph)
+
+        invalidate_dependency_graph(self._root_directory)
+
+        self.assertIsNot(
+            get_dependency_graph(self._root_directory), dependency_graph)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from discover_aces_dev.common import is_numpy_installed
+from discover_aces_dev.ctl_parser import parse_ctl
+from discover_aces_dev.discover import CTLTransform
+from discover_aces_dev.evaluation import (
+    _PARSED_CTL_FILES, CTLEvaluationError, CTLFunction,
+    clear_compiled_ctl_transforms, compile_ctl_transform,
+    evaluate_ctl_transform)
+
+if is_numpy_installed():  # pragma: no cover
+    import numpy as np
+
+__all__ = ['TestCTLFunction', 'TestCompileCtlTransform']
+
+_MAIN_SIGNATURE = """
+void main(input varying float rIn,
+          input varying float gIn,
+          input varying float bIn,
+          input varying float aIn,
+          output varying float rOut,
+          output varying float gOut,
+          output varying float bOut,
+          output varying float aOut)
+"""
+
+_CTL_MATRIX = """
+const float M[3][3] = {
+    { 0.6954522414, 0.1406786965, 0.1638690622 },
+    { 0.0447945634, 0.8596711185, 0.0955343182 },
+    { -0.0055258826, 0.0040252103, 1.0015006723 }
+};
+""" + _MAIN_SIGNATURE + """
+{
+    float RGB[3] = { rIn, gIn, bIn };
+    float M_T[3][3] = transpose_f33(M);
+    float XYZ[3] = mult_f3_f33(RGB, M_T);
+    float identity[3] = mult_f3_f33(XYZ, invert_f33(M_T));
+
+    rOut = XYZ[0];
+    gOut = XYZ[1];
+    bOut = identity[2];
+    aOut = aIn;
+}
+"""
+
+_CTL_BRANCHES = _MAIN_SIGNATURE + """
+{
+    if (rIn < 0.0) {
+        rOut = 0.0;
+    } else if (rIn > 1.0) {
+        rOut = 1.0;
+    } else {
+        rOut = rIn * 0.5;
+    }
+
+    gOut = gIn > bIn ? gIn : bIn;
+    bOut = bIn;
+    aOut = aIn;
+}
+"""
+
+_CTL_LOOPS = _MAIN_SIGNATURE + """
+{
+    float power = 1.0;
+    for (int i = 0; i < 3; i = i + 1) {
+        power = power * rIn;
+    }
+
+    int halvings = 0;
+    float value = gIn;
+    while (value > 1.0) {
+        value = value / 2.0;
+        halvings = halvings + 1;
+    }
+
+    rOut = power;
+    gOut = halvings;
+    bOut = value;
+    aOut = aIn;
+}
+"""
+
+_CTL_OUTPUT_PARAMETERS = """
+void split(input float value, output float integer, output float fraction)
+{
+    integer = floor(value);
+    fraction = value - integer;
+}
+""" + _MAIN_SIGNATURE + """
+{
+    float integer;
+    float fraction;
+    split(rIn, integer, fraction);
+
+    rOut = integer;
+    gOut = fraction;
+    bOut = bIn;
+    aOut = aIn;
+}
+"""
+
+_CTL_INCREMENTS = _MAIN_SIGNATURE + """
+{
+    float value = rIn;
+    rOut = ++value;
+    gOut = value--;
+
+    int i = 0;
+    int j = ++i;
+    int k = i--;
+
+    bOut = value + j * 10 + k * 100 + i * 1000;
+    aOut = aIn;
+}
+"""
+
+
+def _ctl_function(code):
+    return CTLFunction(parse_ctl(code).definitions)
+
+
+@unittest.skipUnless(is_numpy_installed(), '"NumPy" is not installed!')
+class TestCTLFunction(unittest.TestCase):
+    """
+    Defines :class:`discover_aces_dev.evaluation.CTLFunction` class unit
+    tests methods.
+    """
+
+    def test_matrix_operations(self):
+        """
+        Tests :class:`discover_aces_dev.evaluation.CTLFunction` class matrix
+        operations.
+        """
+
+        RGB = np.array([[0.18, 0.18, 0.18], [1.0, 0.5, 0.25]])
+        M = np.array([
+            [0.6954522414, 0.1406786965, 0.1638690622],
+            [0.0447945634, 0.8596711185, 0.0955343182],
+            [-0.0055258826, 0.0040252103, 1.0015006723],
+        ])
+
+        output = _ctl_function(_CTL_MATRIX)(RGB)
+        np.testing.assert_allclose(output[..., :2],
+                                   np.einsum('ij,...j->...i', M, RGB)[..., :2])
+        np.testing.assert_allclose(output[..., 2], RGB[..., 2])
+
+    def test_branches(self):
+        """
+        Tests :class:`discover_aces_dev.evaluation.CTLFunction` class data
+        dependent branches.
+        """
+
+        RGB = np.array([[-1.0, 0.2, 0.8], [0.5, 0.9, 0.1], [2.0, 0.3, 0.3]])
+
+        np.testing.assert_allclose(
+            _ctl_function(_CTL_BRANCHES)(RGB),
+            [[0.0, 0.8, 0.8], [0.25, 0.9, 0.1], [1.0, 0.3, 0.3]])
+
+    def test_loops(self):
+        """
+        Tests :class:`discover_aces_dev.evaluation.CTLFunction` class *for*
+        and data dependent *while* loops.
+        """
+
+        RGB = np.array([[2.0, 0.5, 0.0], [0.5, 3.0, 0.0], [-1.0, 10.0, 0.0]])
+
+        np.testing.assert_allclose(
+            _ctl_function(_CTL_LOOPS)(RGB),
+            [[8.0, 0.0, 0.5], [0.125, 2.0, 0.75], [-1.0, 4.0, 0.625]])
+
+    def test_output_parameters(self):
+        """
+        Tests :class:`discover_aces_dev.evaluation.CTLFunction` class output
+        parameters of the called functions.
+        """
+
+        RGB = np.array([[1.25, 0.0, 0.5], [-0.5, 0.0, 0.5]])
+
+        np.testing.assert_allclose(
+            _ctl_function(_CTL_OUTPUT_PARAMETERS)(RGB),
+            [[1.0, 0.25, 0.5], [-1.0, 0.5, 0.5]])
+
+    def test_increments(self):
+        """
+        Tests :class:`discover_aces_dev.evaluation.CTLFunction` class prefix
+        and postfix increments and decrements.
+        """
+
+        np.testing.assert_allclose(
+            _ctl_function(_CTL_INCREMENTS)([2.0, 0.0, 0.0]),
+            [3.0, 3.0, 112.0])
+
+    def test_vectorisation(self):
+        """
+        Tests that :class:`discover_aces_dev.evaluation.CTLFunction` class
+        evaluates whole arrays as it evaluates their pixels one by one.
+        """
+
+        RGB = np.random.RandomState(4).uniform(-1, 4, (4, 5, 3))
+
+        for code in (_CTL_MATRIX, _CTL_BRANCHES, _CTL_LOOPS,
+                     _CTL_OUTPUT_PARAMETERS, _CTL_INCREMENTS):
+            function = _ctl_function(code)
+            output = function(RGB)
+
+            self.assertTupleEqual(output.shape, RGB.shape)
+            for index in np.ndindex(RGB.shape[:-1]):
+                np.testing.assert_allclose(output[index],
+                                           function(RGB[index]))
+
+    def test_raise_exception_CTLFunction(self):
+        """
+        Tests :class:`discover_aces_dev.evaluation.CTLFunction` class raised
+        exceptions.
+        """
+
+        self.assertRaises(CTLEvaluationError, _ctl_function,
+                          'float f() { return 1.0; }')
+
+        self.assertRaises(ValueError, _ctl_function(_CTL_BRANCHES),
+                          np.zeros([2, 4]))
+
+
+@unittest.skipUnless(is_numpy_installed(), '"NumPy" is not installed!')
+class TestCompileCtlTransform(unittest.TestCase):
+    """
+    Defines :func:`discover_aces_dev.evaluation.compile_ctl_transform`
+    definition unit tests methods.
+    """
+
+    def setUp(self):
+        """
+        Initialises common tests attributes.
+        """
+
+        self._temporary_directory = tempfile.mkdtemp()
+
+        for directory, scale in (('lib', 2.0), ('lib_alternate', 3.0)):
+            self._write(
+                os.path.join(directory, 'Lib.Scale.ctl'),
+                f'float scale() {{ return {scale}; }}')
+
+        self._ctl_transform_path = self._write(
+            'ACEScsc.Academy.A_to_B.ctl',
+            'import "Lib.Scale";\n' + _MAIN_SIGNATURE + """
+{
+    rOut = rIn * scale();
+    gOut = gIn;
+    bOut = bIn;
+    aOut = aIn;
+}
+""")
+
+    def tearDown(self):
+        """
+        After tests actions.
+        """
+
+        shutil.rmtree(self._temporary_directory)
+        clear_compiled_ctl_transforms()
+
+    def _write(self, path, code):
+        path = os.path.join(self._temporary_directory, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as ctl_file:
+            ctl_file.write(code)
+
+        return path
+
+    def _modify(self, path, old, new):
+        # The modification time is bumped explicitly as successive writes can
+        # share it on filesystems with a coarse timestamp resolution.
+        with open(path) as ctl_file:
+            code = ctl_file.read()
+
+        modification_time = os.stat(path).st_mtime_ns
+        self._write(path, code.replace(old, new))
+        os.utime(
+            path, ns=(modification_time + 10**9, modification_time + 10**9))
+
+    def test_compile_ctl_transform(self):
+        """
+        Tests :func:`discover_aces_dev.evaluation.compile_ctl_transform`
+        definition.
+        """
+
+        ctl_transform = CTLTransform(self._ctl_transform_path)
+
+        self.assertIs(
+            compile_ctl_transform(ctl_transform),
+            compile_ctl_transform(ctl_transform))
+
+        self.assertEqual(
+            evaluate_ctl_transform(ctl_transform, [1, 1, 1])[0], 2.0)
+        self.assertEqual(
+            evaluate_ctl_transform(ctl_transform, [1, 1, 1], None, [
+                os.path.join(self._temporary_directory, 'lib_alternate')
+            ])[0], 3.0)
+
+        self._modify(self._ctl_transform_path, 'rIn * scale()',
+                     'rIn * scale() * 2.0')
+
+        self.assertEqual(
+            evaluate_ctl_transform(ctl_transform, [1, 1, 1])[0], 4.0)
+
+    def test_compile_ctl_transform_modified_module(self):
+        """
+        Tests :func:`discover_aces_dev.evaluation.compile_ctl_transform`
+        definition recompilation when an imported module is modified.
+        """
+
+        ctl_transform = CTLTransform(self._ctl_transform_path)
+
+        self.assertEqual(
+            evaluate_ctl_transform(ctl_transform, [1, 1, 1])[0], 2.0)
+
+        self._modify(
+            os.path.join(self._temporary_directory, 'lib', 'Lib.Scale.ctl'),
+            '2.0', '5.0')
+
+        self.assertEqual(
+            evaluate_ctl_transform(ctl_transform, [1, 1, 1])[0], 5.0)
+
+        # The modified module replaces its previous abstract syntax tree.
+        self.assertEqual(len(_PARSED_CTL_FILES), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from collections import namedtuple
+
+from discover_aces_dev.compact_graph import CompactGraph
+from discover_aces_dev.graph import conversion_graph_to_dot
+
+__all__ = ['TestConversionGraphToDot']
+
+_CTLTransform = namedtuple('_CTLTransform', ('type', 'source', 'target'))
+
+_CTL_TRANSFORMS = [
+    _CTLTransform('IDT', 'ARRI', 'ACES2065-1'),
+    _CTLTransform('ACEScsc', 'ACEScg', 'ACES2065-1'),
+    _CTLTransform('ACEScsc', 'ACES2065-1', 'ACEScg'),
+    _CTLTransform('RRT', 'ACES2065-1', 'OCES'),
+    _CTLTransform('ODT', 'OCES', 'Rec709'),
+]
+
+
+class TestConversionGraphToDot(unittest.TestCase):
+    """
+    Defines :func:`discover_aces_dev.graph.conversion_graph_to_dot`
+    definition unit tests methods.
+    """
+
+    def test_conversion_graph_to_dot(self):
+        """
+        Tests :func:`discover_aces_dev.graph.conversion_graph_to_dot`
+        definition.
+        """
+
+        graph = CompactGraph.from_ctl_transforms(_CTL_TRANSFORMS)
+
+        dot = conversion_graph_to_dot(graph)
+        self.assertTrue(dot.startswith('digraph {\n'))
+        self.assertIn('\tsubgraph "cluster_IDT" {', dot)
+        self.assertIn('\t"ACEScg" -> "ACES2065-1";', dot)
+        self.assertEqual(dot, conversion_graph_to_dot(graph))
+
+        dot = conversion_graph_to_dot(graph, cluster='ODT')
+        self.assertIn('"Rec709"', dot)
+        self.assertIn('"OCES"', dot)
+        self.assertNotIn('"ARRI"', dot)
+
+        dot = conversion_graph_to_dot(graph, node='ARRI', radius=1)
+        self.assertIn('\t"ARRI" -> "ACES2065-1";', dot)
+        self.assertNotIn('"OCES"', dot)
+
+        self.assertRaises(ValueError, conversion_graph_to_dot, graph,
+                          cluster='Unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
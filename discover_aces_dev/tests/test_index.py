@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from discover_aces_dev.discover import (ACES_URN, classify_aces_ctl_transforms,
+                                        discover_aces_ctl)
+from discover_aces_dev.index import TransformIndex
+from discover_aces_dev.tests.fixtures import TransformsTreeTestCase
+
+__all__ = ['TestTransformIndex']
+
+
+class TestTransformIndex(TransformsTreeTestCase):
+    """
+    Defines :class:`discover_aces_dev.index.TransformIndex` class unit tests
+    methods.
+    """
+
+    def setUp(self):
+        """
+        Initialises common tests attributes.
+        """
+
+        super().setUp()
+
+        self._index = TransformIndex()
+        self._classified_ctl_transforms = classify_aces_ctl_transforms(
+            discover_aces_ctl(self._root_directory), index=self._index)
+
+    def test_update(self):
+        """
+        Tests :meth:`discover_aces_dev.index.TransformIndex.update` method.
+        """
+
+        # The pairs members are indexed individually.
+        self.assertEqual(len(self._index), 17)
+
+        index = TransformIndex(self._classified_ctl_transforms)
+        self.assertSetEqual(
+            {ctl_transform.path for ctl_transform in index},
+            {ctl_transform.path for ctl_transform in self._index})
+
+        index.clear()
+        self.assertEqual(len(index), 0)
+        self.assertListEqual(index.values('type'), [])
+
+    def test_by_id(self):
+        """
+        Tests :meth:`discover_aces_dev.index.TransformIndex.by_id` method.
+        """
+
+        id_ = f'{ACES_URN}:ODT.Academy.Rec709_100nits_dim.a1.0.3'
+
+        self.assertIn(id_, self._index)
+        self.assertEqual(self._index.by_id(id_).id, id_)
+        self.assertIsNone(self._index.by_id(f'{ACES_URN}:Unknown'))
+        self.assertEqual(self._index.by_id(f'{ACES_URN}:Unknown', 0), 0)
+
+    def test_classification(self):
+        """
+        Tests :meth:`discover_aces_dev.index.TransformIndex.classification`
+        method.
+        """
+
+        ctl_transform_pair = self._classified_ctl_transforms['csc']['ACEScg'][
+            'ACEScsc.Academy.ACEScg']
+
+        self.assertTupleEqual(
+            self._index.classification(
+                ctl_transform_pair.inverse_transform),
+            ('csc', 'ACEScg', 'ACEScsc.Academy.ACEScg'))
+
+        self.assertRaises(KeyError, self._index.classification,
+                          ctl_transform_pair)
+
+    def test_values(self):
+        """
+        Tests :meth:`discover_aces_dev.index.TransformIndex.values` method.
+        """
+
+        self.assertListEqual(self._index.values('version'), ['a1.0.3'])
+        self.assertSetEqual(
+            set(self._index.values('category')), {
+                'csc', 'input_transform', 'lib', 'lmt', 'output_transform',
+                'rrt', 'utility'
+            })
+
+        self.assertRaises(ValueError, self._index.values, 'path')
+
+    def test_lookup(self):
+        """
+        Tests :meth:`discover_aces_dev.index.TransformIndex.lookup` method.
+        """
+
+        self.assertSetEqual({
+            ctl_transform.target
+            for ctl_transform in self._index.lookup('type', 'ODT')
+        }, {'Rec709_100nits_dim', 'P3D65_48nits'})
+        self.assertListEqual(self._index.lookup('type', 'Unknown'), [])
+
+    def test_query(self):
+        """
+        Tests :meth:`discover_aces_dev.index.TransformIndex.query` method.
+        """
+
+        self.assertListEqual([
+            ctl_transform.name for ctl_transform in self._index.query(
+                type='ODT', target='Rec709_100nits_dim')
+        ], ['Rec709_100nits_dim'])
+
+        self.assertSetEqual({
+            ctl_transform.type for ctl_transform in self._index.query(
+                category='output_transform', classifiers=['rec709', 'p3'])
+        }, {'ODT', 'InvODT'})
+
+        self.assertListEqual([
+            ctl_transform.type for ctl_transform in self._index.query(
+                id=f'{ACES_URN}:RRT.a1.0.3', category='rrt')
+        ], ['RRT'])
+
+        self.assertListEqual(
+            self._index.query(type='ODT', category='input_transform'), [])
+
+        self.assertEqual(len(self._index.query()), len(self._index))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from discover_aces_dev.discover import ACES_URN
+from discover_aces_dev.instrumentation import Profiler, instrumented
+from discover_aces_dev.merkle import (MerkleTree, diff_aces_ctl,
+                                      discover_aces_ctl_tree)
+from discover_aces_dev.tests.fixtures import (TransformsTreeTestCase,
+                                              write_ctl_transforms)
+
+__all__ = ['TestDiscoverAcesCtlTree', 'TestDiffAcesCtl']
+
+
+def _id(basename):
+    return f'{ACES_URN}:{basename}.a1.0.3'
+
+
+class TestDiscoverAcesCtlTree(TransformsTreeTestCase):
+    """
+    Defines :func:`discover_aces_dev.merkle.discover_aces_ctl_tree`
+    definition unit tests methods.
+    """
+
+    def test_discover_aces_ctl_tree(self):
+        """
+        Tests :func:`discover_aces_dev.merkle.discover_aces_ctl_tree`
+        definition.
+        """
+
+        tree = discover_aces_ctl_tree(self._root_directory)
+
+        self.assertEqual(len(tree), 17)
+        self.assertEqual(tree.directory_hash(''), tree.hash)
+        self.assertIsNone(tree.directory_hash('ctl/unknown'))
+        self.assertListEqual(
+            sorted(tree.ctl_transforms[os.path.join(
+                self._root_directory, 'ctl', 'rrt')]),
+            sorted(
+                os.path.join(self._root_directory, 'ctl', 'rrt', filename)
+                for filename in ('RRT.ctl', 'InvRRT.ctl')))
+
+        # Identical sub-trees have identical hashes regardless of their
+        # location.
+        root_directory = os.path.join(self._temporary_directory, 'copy')
+        shutil.copytree(
+            os.path.join(self._root_directory, 'ctl', 'csc'),
+            os.path.join(root_directory, 'colourspaces'))
+        other_tree = discover_aces_ctl_tree(root_directory)
+        self.assertEqual(
+            other_tree.directory_hash('colourspaces'),
+            tree.directory_hash('ctl/csc'))
+        self.assertNotEqual(other_tree.hash, tree.hash)
+
+        path = os.path.join(self._root_directory, 'ctl', 'csc', 'ACEScg',
+                            'ACEScsc.Academy.ACEScg_to_ACES.ctl')
+        with open(path, 'a') as ctl_file:
+            ctl_file.write('// Modified.\n')
+
+        modified_tree = discover_aces_ctl_tree(self._root_directory)
+        for relative_directory in ('', 'ctl', 'ctl/csc', 'ctl/csc/ACEScg'):
+            self.assertNotEqual(
+                modified_tree.directory_hash(relative_directory),
+                tree.directory_hash(relative_directory))
+        for relative_directory in ('ctl/csc/ACEScct', 'ctl/odt'):
+            self.assertEqual(
+                modified_tree.directory_hash(relative_directory),
+                tree.directory_hash(relative_directory))
+
+    def test_discover_aces_ctl_tree_previous(self):
+        """
+        Tests :func:`discover_aces_dev.merkle.discover_aces_ctl_tree`
+        definition with a previous tree.
+        """
+
+        tree = discover_aces_ctl_tree(self._root_directory)
+
+        path = os.path.join(self._root_directory, 'ctl', 'rrt', 'RRT.ctl')
+        with open(path, 'a') as ctl_file:
+            ctl_file.write('// Modified.\n')
+
+        with instrumented(Profiler()) as profiler:
+            previous_tree = discover_aces_ctl_tree(
+                self._root_directory, previous=tree)
+
+        self.assertEqual(
+            profiler.report()['counters']['merkle_digests_reused'], 16)
+        self.assertDictEqual(previous_tree.directories,
+                             discover_aces_ctl_tree(
+                                 self._root_directory).directories)
+
+    def test_save(self):
+        """
+        Tests :meth:`discover_aces_dev.merkle.MerkleTree.save` and
+        :meth:`discover_aces_dev.merkle.MerkleTree.load` methods.
+        """
+
+        tree = discover_aces_ctl_tree(self._root_directory)
+
+        path = os.path.join(self._temporary_directory, 'tree.json')
+        tree.save(path)
+        loaded_tree = MerkleTree.load(path)
+
+        self.assertEqual(loaded_tree.root_directory, tree.root_directory)
+        self.assertEqual(loaded_tree.hash, tree.hash)
+        self.assertDictEqual(loaded_tree.directories, tree.directories)
+
+        with open(path, 'w') as tree_file:
+            tree_file.write('{"version": 0}')
+
+        self.assertRaises(ValueError, MerkleTree.load, path)
+
+
+class TestDiffAcesCtl(unittest.TestCase):
+    """
+    Defines :func:`discover_aces_dev.merkle.diff_aces_ctl` definition unit
+    tests methods.
+    """
+
+    def setUp(self):
+        """
+        Initialises common tests attributes.
+        """
+
+        self._temporary_directory = tempfile.mkdtemp()
+        self._old_directory = os.path.join(self._temporary_directory, 'old')
+        self._new_directory = os.path.join(self._temporary_directory, 'new')
+
+        write_ctl_transforms(self._old_directory)
+        write_ctl_transforms(self._new_directory)
+
+    def tearDown(self):
+        """
+        After tests actions.
+        """
+
+        shutil.rmtree(self._temporary_directory)
+
+    def _path(self, relative_path):
+        return os.path.join(self._new_directory, *relative_path.split('/'))
+
+    def test_diff_aces_ctl(self):
+        """
+        Tests :func:`discover_aces_dev.merkle.diff_aces_ctl` definition.
+        """
+
+        write_ctl_transforms(self._new_directory,
+                             {'ctl/lmt': ['LMT.Academy.GamutCompress']})
+
+        os.remove(
+            self._path('ctl/idt/vendorSupplied/canon/'
+                       'IDT.Canon.C300MkII_CanonLog2.ctl'))
+        os.remove(self._path('ctl/odt/p3/InvODT.Academy.P3D65_48nits.ctl'))
+
+        path = self._path('ctl/odt/rec709/ODT.Academy.Rec709_100nits_dim.ctl')
+        with open(path, 'a') as ctl_file:
+            ctl_file.write('// Modified.\n')
+
+        os.makedirs(self._path('ctl/utilities/moved'))
+        os.rename(
+            self._path('ctl/utilities/ACESutil.Unity.ctl'),
+            self._path('ctl/utilities/moved/ACESutil.Unity.ctl'))
+
+        diff = diff_aces_ctl(self._old_directory, self._new_directory)
+
+        self.assertDictEqual(
+            diff.added, {
+                _id('LMT.Academy.GamutCompress'):
+                'ctl/lmt/LMT.Academy.GamutCompress.ctl'
+            })
+        self.assertDictEqual(
+            diff.removed, {
+                _id('IDT.Canon.C300MkII_CanonLog2'):
+                'ctl/idt/vendorSupplied/canon/'
+                'IDT.Canon.C300MkII_CanonLog2.ctl',
+                _id('InvODT.Academy.P3D65_48nits'):
+                'ctl/odt/p3/InvODT.Academy.P3D65_48nits.ctl',
+            })
+        self.assertDictEqual(
+            diff.modified, {
+                _id('ODT.Academy.Rec709_100nits_dim'):
+                ('ctl/odt/rec709/ODT.Academy.Rec709_100nits_dim.ctl',
+                 'ctl/odt/rec709/ODT.Academy.Rec709_100nits_dim.ctl'),
+                _id('ACESutil.Unity'): ('ctl/utilities/ACESutil.Unity.ctl',
+                                        'ctl/utilities/moved/'
+                                        'ACESutil.Unity.ctl'),
+            })
+        self.assertDictEqual(
+            diff.repaired, {
+                _id('ODT.Academy.P3D65_48nits'):
+                (_id('InvODT.Academy.P3D65_48nits'), None)
+            })
+
+    def test_diff_aces_ctl_unchanged(self):
+        """
+        Tests :func:`discover_aces_dev.merkle.diff_aces_ctl` definition with
+        unchanged trees.
+        """
+
+        old_tree = discover_aces_ctl_tree(self._old_directory)
+
+        with instrumented(Profiler()) as profiler:
+            diff = diff_aces_ctl(old_tree, self._new_directory)
+
+        self.assertTupleEqual(diff, ({}, {}, {}, {}))
+
+        # The identical root directory is skipped along with its sub-trees.
+        self.assertEqual(
+            profiler.report()['counters']['merkle_directories_skipped'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
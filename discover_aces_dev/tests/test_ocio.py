@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import sqlite3
+import unittest
+
+from discover_aces_dev.discover import (CTLTransform,
+                                        classify_aces_ctl_transforms,
+                                        discover_aces_ctl)
+from discover_aces_dev.instrumentation import Profiler, instrumented
+from discover_aces_dev.ocio import (OCIOSectionCache, clf_file_transform,
+                                    iter_ocio_config, write_ocio_config)
+from discover_aces_dev.tests.fixtures import TransformsTreeTestCase
+
+__all__ = [
+    'TestClfFileTransform', 'TestOCIOSectionCache', 'TestIterOcioConfig',
+    'TestWriteOcioConfig'
+]
+
+
+class TestClfFileTransform(TransformsTreeTestCase):
+    """
+    Defines :func:`discover_aces_dev.ocio.clf_file_transform` definition unit
+    tests methods.
+    """
+
+    def test_clf_file_transform(self):
+        """
+        Tests :func:`discover_aces_dev.ocio.clf_file_transform` definition.
+        """
+
+        ctl_transform = CTLTransform(
+            os.path.join(self._root_directory, 'ctl', 'odt', 'rec709',
+                         'ODT.Academy.Rec709_100nits_dim.ctl'))
+
+        self.assertEqual(
+            clf_file_transform(ctl_transform),
+            '!<FileTransform> {src: "ODT.Academy.Rec709_100nits_dim.clf", '
+            'interpolation: best}')
+        self.assertEqual(
+            clf_file_transform(ctl_transform, 'inverse'),
+            '!<FileTransform> {src: "ODT.Academy.Rec709_100nits_dim.clf", '
+            'interpolation: best, direction: inverse}')
+
+
+class TestOCIOSectionCache(TransformsTreeTestCase):
+    """
+    Defines :class:`discover_aces_dev.ocio.OCIOSectionCache` class unit tests
+    methods.
+    """
+
+    def test_get(self):
+        """
+        Tests :meth:`discover_aces_dev.ocio.OCIOSectionCache.get` and
+        :meth:`discover_aces_dev.ocio.OCIOSectionCache.set` methods.
+        """
+
+        with OCIOSectionCache(':memory:') as cache:
+            self.assertIsNone(cache.get('colorspaces/lmt', 'a'))
+
+            cache.set('colorspaces/lmt', 'a', 'LMT')
+            self.assertEqual(cache.get('colorspaces/lmt', 'a'), 'LMT')
+            self.assertIsNone(cache.get('colorspaces/lmt', 'b'))
+
+            cache.set('colorspaces/lmt', 'b', 'LMT - Modified')
+            self.assertEqual(len(cache), 1)
+            self.assertIsNone(cache.get('colorspaces/lmt', 'a'))
+            self.assertEqual(
+                cache.get('colorspaces/lmt', 'b'), 'LMT - Modified')
+
+    def test_prune(self):
+        """
+        Tests :meth:`discover_aces_dev.ocio.OCIOSectionCache.prune` method.
+        """
+
+        path = os.path.join(self._temporary_directory, 'sections.sqlite')
+        with OCIOSectionCache(path) as cache:
+            for key in ('colorspaces/lmt', 'colorspaces/rrt',
+                        'colorspaces/csc/ACEScg'):
+                cache.set(key, 'a', key)
+
+            cache.prune(['colorspaces/rrt', 'colorspaces/unknown'])
+
+        with OCIOSectionCache(path) as cache:
+            self.assertEqual(len(cache), 1)
+            self.assertEqual(
+                cache.get('colorspaces/rrt', 'a'), 'colorspaces/rrt')
+
+    def test_schema_version(self):
+        """
+        Tests :class:`discover_aces_dev.ocio.OCIOSectionCache` class outdated
+        schema rebuilding.
+        """
+
+        path = os.path.join(self._temporary_directory, 'sections.sqlite')
+        with OCIOSectionCache(path) as cache:
+            cache.set('colorspaces/lmt', 'a', 'LMT')
+
+        connection = sqlite3.connect(path)
+        connection.execute('PRAGMA user_version = 0')
+        connection.commit()
+        connection.close()
+
+        with OCIOSectionCache(path) as cache:
+            self.assertEqual(len(cache), 0)
+
+
+class TestIterOcioConfig(TransformsTreeTestCase):
+    """
+    Defines :func:`discover_aces_dev.ocio.iter_ocio_config` definition unit
+    tests methods.
+    """
+
+    def _classify(self):
+        return classify_aces_ctl_transforms(
+            discover_aces_ctl(self._root_directory))
+
+    def test_iter_ocio_config(self):
+        """
+        Tests :func:`discover_aces_dev.ocio.iter_ocio_config` definition.
+        """
+
+        config = ''.join(
+            iter_ocio_config(self._classify(), search_path='luts'))
+
+        self.assertTrue(config.startswith('ocio_profile_version: 2\n'))
+        self.assertIn('search_path: "luts"\n', config)
+        self.assertIn('  scene_linear: "ACEScg"\n', config)
+        self.assertNotIn('cie_xyz_d65_interchange', config)
+
+        # The conversions chain the "CTL" transforms along the shortest path
+        # to and from the reference colourspace, inverting the pairs members
+        # if needed.
+        self.assertIn(
+            '    name: "Rec709_100nits_dim"\n'
+            '    family: "output_transform/rec709"\n', config)
+        self.assertIn(
+            '    from_scene_reference: !<GroupTransform> {children: ['
+            '!<FileTransform> {src: "RRT.clf", interpolation: best}, '
+            '!<FileTransform> {src: "ODT.Academy.Rec709_100nits_dim.clf", '
+            'interpolation: best}]}\n', config)
+        self.assertIn(
+            '    to_scene_reference: !<FileTransform> '
+            '{src: "IDT.Sony.SLog3_SGamut3.clf", interpolation: best}\n',
+            config)
+
+        displays = config[config.index('\ndisplays:\n'):]
+        for display in ('Rec709_100nits_dim', 'P3D65_48nits',
+                        'Rec2020_1000nits_15nits_HLG'):
+            self.assertIn(f'  "{display}":\n', displays)
+        self.assertNotIn('ACEScg', displays)
+
+    def test_iter_ocio_config_transformer(self):
+        """
+        Tests :func:`discover_aces_dev.ocio.iter_ocio_config` definition with
+        a transformer not representing every *CTL* transform.
+        """
+
+        def transformer(ctl_transform, direction='forward'):
+            if ctl_transform.type == 'InvRRT':
+                return None
+
+            return clf_file_transform(ctl_transform, direction)
+
+        config = ''.join(iter_ocio_config(self._classify(), None,
+                                          transformer))
+        colourspace = config[config.index('    name: "OCES"\n'):]
+        colourspace = colourspace[:colourspace.index('  - !<ColorSpace>')]
+
+        # The "InvRRT" transform is replaced by the inverse "RRT" transform.
+        self.assertIn(
+            '    to_scene_reference: !<FileTransform> {src: "RRT.clf", '
+            'interpolation: best, direction: inverse}\n', colourspace)
+
+        config = ''.join(
+            iter_ocio_config(self._classify(), None,
+                             lambda ctl_transform, direction='forward': None))
+        self.assertNotIn('to_scene_reference', config)
+        self.assertNotIn('from_scene_reference', config)
+
+    def test_iter_ocio_config_cache(self):
+        """
+        Tests :func:`discover_aces_dev.ocio.iter_ocio_config` definition
+        sections reuse and pruning with a cache.
+        """
+
+        def generate(cache):
+            with instrumented(Profiler()) as profiler:
+                config = ''.join(
+                    iter_ocio_config(self._classify(), cache=cache))
+
+            return config, profiler.report()['counters'].get(
+                'ocio_sections_reused', 0)
+
+        with OCIOSectionCache(':memory:') as cache:
+            config, reused = generate(cache)
+            self.assertEqual(reused, 0)
+            self.assertEqual(len(cache), 9)
+
+            self.assertTupleEqual(generate(cache), (config, 9))
+
+            # Only the section defining the modified "ODT" is generated again.
+            path = os.path.join(self._root_directory, 'ctl', 'odt', 'rec709',
+                                'ODT.Academy.Rec709_100nits_dim.ctl')
+            with open(path) as ctl_file:
+                code = ctl_file.read()
+            with open(path, 'w') as ctl_file:
+                ctl_file.write(
+                    code.replace('<ACESuserName>Test - ',
+                                 '<ACESuserName>Modified - '))
+
+            config, reused = generate(cache)
+            self.assertEqual(reused, 8)
+            self.assertIn('Modified - ODT.Academy.Rec709_100nits_dim', config)
+
+            # The sections of the removed "CTL" transforms are pruned.
+            shutil.rmtree(os.path.join(self._root_directory, 'ctl', 'odt',
+                                       'p3'))
+
+            config, reused = generate(cache)
+            self.assertEqual(reused, 8)
+            self.assertEqual(len(cache), 8)
+            self.assertIsNone(
+                cache.get('colorspaces/output_transform/p3', None))
+            self.assertNotIn('P3D65_48nits', config)
+
+
+class TestWriteOcioConfig(TransformsTreeTestCase):
+    """
+    Defines :func:`discover_aces_dev.ocio.write_ocio_config` definition unit
+    tests methods.
+    """
+
+    def test_write_ocio_config(self):
+        """
+        Tests :func:`discover_aces_dev.ocio.write_ocio_config` definition.
+        """
+
+        classified_ctl_transforms = classify_aces_ctl_transforms(
+            discover_aces_ctl(self._root_directory))
+
+        path = os.path.join(self._temporary_directory, 'config.ocio')
+        cache_path = os.path.join(self._temporary_directory,
+                                  'sections.sqlite')
+        write_ocio_config(path, classified_ctl_transforms, cache=cache_path)
+
+        with open(path) as config_file:
+            self.assertEqual(
+                config_file.read(),
+                ''.join(iter_ocio_config(classified_ctl_transforms)))
+
+        with OCIOSectionCache(cache_path) as cache:
+            self.assertEqual(len(cache), 9)
+
+        self.assertListEqual(
+            sorted(os.listdir(self._temporary_directory)),
+            ['config.ocio', 'sections.sqlite', 'transforms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from collections import namedtuple
+
+from discover_aces_dev.compact_graph import CompactGraph
+from discover_aces_dev.ranking import (WEIGHTING_POLICIES,
+                                       KShortestPathsTable, WeightingPolicy)
+
+__all__ = ['TestWeightingPolicy', 'TestKShortestPathsTable']
+
+_CTLTransform = namedtuple('_CTLTransform', ('type', 'source', 'target'))
+
+_CTL_TRANSFORMS = [
+    _CTLTransform('ACEScsc', 'ACEScg', 'ACES2065-1'),
+    _CTLTransform('ACEScsc', 'ACES2065-1', 'ACEScg'),
+    _CTLTransform('RRT', 'ACES2065-1', 'OCES'),
+    _CTLTransform('InvRRT', 'OCES', 'ACES2065-1'),
+    _CTLTransform('ODT', 'OCES', 'Rec709'),
+    _CTLTransform('InvODT', 'Rec709', 'OCES'),
+    _CTLTransform('RRTODT', 'ACES2065-1', 'Rec709'),
+    _CTLTransform('InvRRTODT', 'Rec709', 'ACES2065-1'),
+]
+
+
+class TestWeightingPolicy(unittest.TestCase):
+    """
+    Defines :class:`discover_aces_dev.ranking.WeightingPolicy` class unit
+    tests methods.
+    """
+
+    def test__call__(self):
+        """
+        Tests :meth:`discover_aces_dev.ranking.WeightingPolicy.__call__`
+        method.
+        """
+
+        policy = WeightingPolicy(inverse_penalty=2)
+        self.assertEqual(policy(_CTLTransform('InvODT', None, None)), 3.0)
+        self.assertEqual(policy(_CTLTransform('ODT', None, None)), 1.0)
+
+        policy = WEIGHTING_POLICIES['default']
+        self.assertEqual(policy(_CTLTransform('RRTODT', None, None)), 2.0)
+        self.assertEqual(policy(_CTLTransform('RRT', None, None)), 1.5)
+        self.assertEqual(policy(_CTLTransform('InvRRT', None, None)), 3.0)
+
+    def test__hash__(self):
+        """
+        Tests :meth:`discover_aces_dev.ranking.WeightingPolicy.__hash__`
+        method.
+        """
+
+        self.assertEqual(
+            hash(WeightingPolicy({'ODT': 2})),
+            hash(WeightingPolicy({'ODT': 2}, {'exact': 0})))
+        self.assertNotEqual(WeightingPolicy(), WeightingPolicy({'ODT': 2}))
+
+
+class TestKShortestPathsTable(unittest.TestCase):
+    """
+    Defines :class:`discover_aces_dev.ranking.KShortestPathsTable` class unit
+    tests methods.
+    """
+
+    def test_paths(self):
+        """
+        Tests :meth:`discover_aces_dev.ranking.KShortestPathsTable.paths`
+        method.
+        """
+
+        table = KShortestPathsTable(
+            CompactGraph.from_ctl_transforms(_CTL_TRANSFORMS), 3, 'default')
+
+        self.assertListEqual(
+            [(weight, [ctl_transform.type for ctl_transform in path])
+             for weight, path in table.paths('ACES2065-1', 'Rec709')],
+            [(2.0, ['RRTODT']), (3.0, ['RRT', 'ODT'])])
+
+        self.assertListEqual(
+            [(weight, [ctl_transform.type for ctl_transform in path])
+             for weight, path in table.paths('ACEScg', 'Rec709')],
+            [(3.0, ['ACEScsc', 'RRTODT']), (4.0, ['ACEScsc', 'RRT', 'ODT'])])
+
+        self.assertListEqual(table.paths('ACEScg', 'Unknown'), [])
+
+    def test_rebuild(self):
+        """
+        Tests :meth:`discover_aces_dev.ranking.KShortestPathsTable.rebuild`
+        method.
+        """
+
+        table = KShortestPathsTable(
+            CompactGraph.from_ctl_transforms(_CTL_TRANSFORMS[:6]), 3,
+            'default')
+        self.assertEqual(len(table.paths('ACES2065-1', 'Rec709')), 1)
+
+        table.rebuild(CompactGraph.from_ctl_transforms(_CTL_TRANSFORMS))
+        self.assertEqual(len(table.paths('ACES2065-1', 'Rec709')), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from discover_aces_dev.discover import (
+    CTLTransformPair, classify_aces_ctl_transforms, discover_aces_ctl)
+from discover_aces_dev.roots import (_normalise_root_directory,
+                                     classify_aces_ctl_roots)
+from discover_aces_dev.tests.fixtures import TransformsTreeTestCase
+
+__all__ = ['TestClassifyAcesCtlRoots']
+
+
+def _paths(classified_ctl_transforms):
+    # Returns the classification of the paths of given classified "CTL"
+    # transforms, the pairs being flattened.
+    paths = set()
+    for category, classifiers in classified_ctl_transforms.items():
+        for classifier, ctl_transforms in classifiers.items():
+            for basename, ctl_transform in ctl_transforms.items():
+                if isinstance(ctl_transform, CTLTransformPair):
+                    members = (ctl_transform.forward_transform,
+                               ctl_transform.inverse_transform)
+                else:
+                    members = (ctl_transform, )
+
+                for member in members:
+                    paths.add((category, classifier, basename, member.path))
+
+    return paths
+
+
+class TestClassifyAcesCtlRoots(TransformsTreeTestCase):
+    """
+    Defines :func:`discover_aces_dev.roots.classify_aces_ctl_roots`
+    definition unit tests methods.
+    """
+
+    def test_classify_aces_ctl_roots(self):
+        """
+        Tests :func:`discover_aces_dev.roots.classify_aces_ctl_roots`
+        definition.
+        """
+
+        classified_ctl_transforms = classify_aces_ctl_transforms(
+            discover_aces_ctl(self._root_directory))
+
+        classified_ctl_roots = classify_aces_ctl_roots(
+            [self._root_directory])
+
+        self.assertSetEqual(
+            _paths(classified_ctl_roots[_normalise_root_directory(
+                self._root_directory)]), _paths(classified_ctl_transforms))
+        self.assertIn('csc', classified_ctl_transforms)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+
+from discover_aces_dev.discover import (classify_aces_ctl_transforms,
+                                        discover_aces_ctl)
+from discover_aces_dev.search import SearchIndex, tokenize
+from discover_aces_dev.tests.fixtures import TransformsTreeTestCase
+
+__all__ = ['TestTokenize', 'TestSearchIndex']
+
+
+def _user_names(results):
+    return [ctl_transform.user_name for ctl_transform, _score in results]
+
+
+class TestTokenize(unittest.TestCase):
+    """
+    Defines :func:`discover_aces_dev.search.tokenize` definition unit tests
+    methods.
+    """
+
+    def test_tokenize(self):
+        """
+        Tests :func:`discover_aces_dev.search.tokenize` definition.
+        """
+
+        self.assertListEqual(
+            tokenize('ACES 1.0 Output - Rec.709 (D60 sim.)'),
+            ['aces', '1', '0', 'output', 'rec', '709', 'd60', 'sim'])
+        self.assertListEqual(tokenize(None), [])
+
+
+class TestSearchIndex(TransformsTreeTestCase):
+    """
+    Defines :class:`discover_aces_dev.search.SearchIndex` class unit tests
+    methods.
+    """
+
+    def setUp(self):
+        """
+        Initialises common tests attributes.
+        """
+
+        super().setUp()
+
+        self._classified_ctl_transforms = classify_aces_ctl_transforms(
+            discover_aces_ctl(self._root_directory))
+        self._index = SearchIndex(self._classified_ctl_transforms)
+
+    def test_search(self):
+        """
+        Tests :meth:`discover_aces_dev.search.SearchIndex.search` method.
+        """
+
+        # The pairs members are indexed individually.
+        self.assertEqual(len(self._index), 17)
+
+        self.assertListEqual(
+            _user_names(self._index.search('rec709', 'exact')), [
+                'Test - ODT.Academy.Rec709_100nits_dim',
+                'Test - InvODT.Academy.Rec709_100nits_dim'
+            ])
+        self.assertListEqual(self._index.search('rec', 'exact'), [])
+
+        # The prefix matches are down-weighted by their length ratio.
+        results = self._index.search('rec')
+        self.assertListEqual(
+            _user_names(results), [
+                'Test - ODT.Academy.Rec709_100nits_dim',
+                'Test - InvODT.Academy.Rec709_100nits_dim',
+                'Test - RRTODT.Academy.Rec2020_1000nits_15nits_HLG',
+                'Test - InvRRTODT.Academy.Rec2020_1000nits_15nits_HLG'
+            ])
+        self.assertGreater(results[0][1], results[2][1])
+        self.assertLess(results[0][1],
+                        self._index.search('rec709', 'exact')[0][1])
+
+        self.assertListEqual(
+            _user_names(self._index.search('gamut', 'substring')),
+            ['Test - IDT.Sony.SLog3_SGamut3'])
+        self.assertListEqual(self._index.search('gamut'), [])
+
+        # All the query terms must match.
+        self.assertListEqual(
+            _user_names(self._index.search('odt rec')),
+            ['Test - ODT.Academy.Rec709_100nits_dim'])
+        self.assertListEqual(self._index.search('odt sony'), [])
+
+        self.assertEqual(len(self._index.search('rec', limit=1)), 1)
+        self.assertListEqual(self._index.search(''), [])
+
+    def test_search_code(self):
+        """
+        Tests :meth:`discover_aces_dev.search.SearchIndex.search` method with
+        the *CTL* transforms code indexed.
+        """
+
+        path = os.path.join(self._root_directory, 'ctl', 'rrt', 'RRT.ctl')
+        with open(path, 'a') as ctl_file:
+            ctl_file.write('\nfloat segmented_spline_c5_fwd(float x)\n'
+                           '{\n    return x;\n}\n')
+
+        index = SearchIndex(
+            classify_aces_ctl_transforms(
+                discover_aces_ctl(self._root_directory)),
+            code=True)
+
+        self.assertTrue(index.code)
+        self.assertListEqual(
+            _user_names(index.search('segmented_spline_c5_fwd', 'exact')),
+            ['Test - RRT'])
+        self.assertListEqual(
+            _user_names(index.search('spline', 'exact')), ['Test - RRT'])
+        self.assertListEqual(index.search('float', 'exact'), [])
+        self.assertListEqual(self._index.search('spline'), [])
+
+    def test_save(self):
+        """
+        Tests :meth:`discover_aces_dev.search.SearchIndex.save` and
+        :meth:`discover_aces_dev.search.SearchIndex.load` methods.
+        """
+
+        path = os.path.join(self._temporary_directory, 'search.json')
+        self._index.save(path)
+
+        index = SearchIndex.load(path)
+
+        self.assertEqual(len(index), len(self._index))
+        for query, mode in (('rec', 'prefix'), ('709', 'substring'),
+                            ('sony slog', 'prefix')):
+            self.assertListEqual([
+                (ctl_transform.path, score)
+                for ctl_transform, score in index.search(query, mode)
+            ], [(ctl_transform.path, score)
+                for ctl_transform, score in self._index.search(query, mode)])
+
+    def test_raise_exception_search(self):
+        """
+        Tests :meth:`discover_aces_dev.search.SearchIndex.search` method
+        raised exception.
+        """
+
+        self.assertRaises(ValueError, self._index.search, 'rec', 'fuzzy')
+
+    def test_raise_exception_load(self):
+        """
+        Tests :meth:`discover_aces_dev.search.SearchIndex.load` method raised
+        exception.
+        """
+
+        path = os.path.join(self._temporary_directory, 'search.json')
+        with open(path, 'w') as index_file:
+            index_file.write('{"version": 0}')
+
+        self.assertRaises(ValueError, SearchIndex.load, path)
+
+
+if __name__ == '__main__':
+    unittest.main()
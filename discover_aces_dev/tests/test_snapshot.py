@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+
+from discover_aces_dev.snapshot import Snapshot, build_snapshot, load_snapshot
+from discover_aces_dev.tests.fixtures import TransformsTreeTestCase
+
+__all__ = ['TestSnapshot', 'TestLoadSnapshot']
+
+
+class _SnapshotTestCase(TransformsTreeTestCase):
+    def setUp(self):
+        """
+        Initialises common tests attributes.
+        """
+
+        super().setUp()
+
+        self._path = os.path.join(self._temporary_directory, 'aces.snapshot')
+
+        with build_snapshot(self._path, self._root_directory) as snapshot:
+            self._length = len(snapshot)
+
+        with open(self._path, 'rb') as snapshot_file:
+            self._data = snapshot_file.read()
+
+    def _truncate(self, size):
+        with open(self._path, 'wb') as snapshot_file:
+            snapshot_file.write(self._data[:size])
+
+
+class TestSnapshot(_SnapshotTestCase):
+    """
+    Defines :class:`discover_aces_dev.snapshot.Snapshot` class unit tests
+    methods.
+    """
+
+    def test_truncated(self):
+        """
+        Tests :class:`discover_aces_dev.snapshot.Snapshot` class handling of
+        truncated snapshots.
+        """
+
+        sizes = list(range(0, len(self._data), 7)) + [len(self._data) - 1]
+        for size in sizes:
+            self._truncate(size)
+
+            with self.assertRaises(ValueError):
+                Snapshot(self._path)
+
+    def test_graph(self):
+        """
+        Tests :attr:`discover_aces_dev.snapshot.Snapshot.graph` attribute.
+        """
+
+        snapshot = Snapshot(self._path)
+        graph = snapshot.graph
+
+        # The adjacency arrays are views of the mapped file.
+        offsets, targets, weights, _edge_data = graph.to_csr()
+        for section in (offsets, targets, weights):
+            self.assertIsInstance(section, memoryview)
+
+        snapshot.close()
+
+        self.assertListEqual(
+            graph.shortest_path('ACEScg', 'Rec709_100nits_dim'),
+            ['ACEScg', 'ACES2065-1', 'OCES', 'Rec709_100nits_dim'])
+
+
+class TestLoadSnapshot(_SnapshotTestCase):
+    """
+    Defines :func:`discover_aces_dev.snapshot.load_snapshot` definition unit
+    tests methods.
+    """
+
+    def test_load_snapshot(self):
+        """
+        Tests :func:`discover_aces_dev.snapshot.load_snapshot` definition.
+        """
+
+        self._truncate(len(self._data) // 2)
+
+        with load_snapshot(self._path, self._root_directory) as snapshot:
+            self.assertEqual(len(snapshot), self._length)
+            self.assertIsNotNone(snapshot.graph)
+
+
+if __name__ == '__main__':
+    unittest.main()
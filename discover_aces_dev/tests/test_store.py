@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+from unittest import mock
+
+from discover_aces_dev.common import is_numpy_installed
+from discover_aces_dev.discover import (ACES_URN,
+                                        classify_aces_ctl_transforms,
+                                        discover_aces_ctl)
+from discover_aces_dev.store import TRANSFORM_STORE_COLUMNS, TransformStore
+from discover_aces_dev.tests.fixtures import TransformsTreeTestCase
+
+__all__ = ['TestTransformStore']
+
+
+class TestTransformStore(TransformsTreeTestCase):
+    """
+    Defines :class:`discover_aces_dev.store.TransformStore` class unit tests
+    methods.
+    """
+
+    def setUp(self):
+        """
+        Initialises common tests attributes.
+        """
+
+        super().setUp()
+
+        for relative_path, version in (
+            ('ctl/odt/p3/ODT.Academy.P3D65_48nits.ctl', 'a1.1.0'),
+            ('ctl/odt/p3/InvODT.Academy.P3D65_48nits.ctl', 'a1.1.0'),
+            ('ctl/rrt/RRT.ctl', 'a2.0.0'),
+            ('ctl/idt/vendorSupplied/sony/IDT.Sony.SLog3_SGamut3.ctl',
+             'a1.0'),
+        ):
+            path = os.path.join(self._root_directory,
+                                *relative_path.split('/'))
+            with open(path) as ctl_file:
+                code = ctl_file.read()
+
+            basename = os.path.splitext(os.path.basename(path))[0]
+            with open(path, 'w') as ctl_file:
+                ctl_file.write(
+                    code.replace(f'{basename}.a1.0.3',
+                                 f'{basename}.{version}'))
+
+        self._store = TransformStore(
+            classify_aces_ctl_transforms(
+                discover_aces_ctl(self._root_directory)))
+
+    def _types(self, indexes):
+        return sorted(self._store.metadata(index)['type']
+                      for index in indexes)
+
+    def _assert_select(self):
+        self.assertListEqual(self._store.select(), list(range(17)))
+
+        self.assertListEqual(
+            self._types(self._store.select(type='ODT')), ['ODT', 'ODT'])
+        self.assertListEqual(
+            self._types(self._store.select(type=['RRT', 'InvRRT', 'Unknown'])),
+            ['InvRRT', 'RRT'])
+        self.assertListEqual(self._store.select(type='Unknown'), [])
+
+        self.assertListEqual(
+            self._types(self._store.select(major_version__ge=2)), ['RRT'])
+        self.assertListEqual(
+            self._types(self._store.select(minor_version__gt=0)),
+            ['InvODT', 'ODT'])
+        self.assertListEqual(
+            self._types(
+                self._store.select(type='ODT', minor_version__lt=1)), ['ODT'])
+
+        # The missing values never match the comparisons but can be selected
+        # with "None", e.g. the patch version of an "IDT" id.
+        self.assertEqual(len(self._store.select(patch_version__ge=0)), 16)
+        self.assertListEqual(
+            self._types(self._store.select(patch_version=None)), ['IDT'])
+        self.assertListEqual(self._store.select(major_version=None), [])
+
+        self.assertEqual(
+            len(self._store.select(category__ne='output_transform')), 11)
+        self.assertEqual(len(self._store.select(type__ne='Unknown')), 17)
+        self.assertListEqual(
+            self._types(
+                self._store.select(
+                    category='output_transform', classifiers__ne='base',
+                    type__ne='ODT')), ['InvODT', 'InvODT'])
+
+    def test_select(self):
+        """
+        Tests :meth:`discover_aces_dev.store.TransformStore.select` method.
+        """
+
+        self._assert_select()
+
+    def test_select_without_numpy(self):
+        """
+        Tests :meth:`discover_aces_dev.store.TransformStore.select` method
+        without *NumPy*.
+        """
+
+        with mock.patch(
+                'discover_aces_dev.store.is_numpy_installed',
+                return_value=False):
+            self._assert_select()
+
+            self.assertListEqual(
+                sorted(self._store.values('major_version')), [1, 2])
+
+    def test_query(self):
+        """
+        Tests :meth:`discover_aces_dev.store.TransformStore.query` method.
+        """
+
+        ctl_transforms = self._store.query(type='ODT', minor_version__ge=1)
+
+        self.assertListEqual(
+            [ctl_transform.id for ctl_transform in ctl_transforms],
+            [f'{ACES_URN}:ODT.Academy.P3D65_48nits.a1.1.0'])
+        self.assertEqual(
+            ctl_transforms[0].path,
+            os.path.join(self._root_directory, 'ctl', 'odt', 'p3',
+                         'ODT.Academy.P3D65_48nits.ctl'))
+        self.assertEqual(ctl_transforms[0].target, 'P3D65_48nits')
+
+    def test_metadata(self):
+        """
+        Tests :meth:`discover_aces_dev.store.TransformStore.metadata` method.
+        """
+
+        index = self._store.select(type='RRT')[0]
+        metadata = self._store.metadata(index)
+
+        self.assertEqual(metadata['category'], 'rrt')
+        self.assertEqual(metadata['id'], f'{ACES_URN}:RRT.a2.0.0')
+        self.assertDictEqual(
+            self._store.metadata(index - len(self._store)), metadata)
+        self.assertIsNot(self._store[index], self._store[index])
+
+        self.assertRaises(IndexError, self._store.metadata, len(self._store))
+
+    def test_values(self):
+        """
+        Tests :meth:`discover_aces_dev.store.TransformStore.values` method.
+        """
+
+        self.assertListEqual(
+            sorted(self._store.values('major_version')), [1, 2])
+        self.assertListEqual(
+            sorted(self._store.values('category')), [
+                'csc', 'input_transform', 'lib', 'lmt', 'output_transform',
+                'rrt', 'utility'
+            ])
+
+        self.assertRaises(ValueError, self._store.values, 'version')
+
+    def test_strings(self):
+        """
+        Tests :attr:`discover_aces_dev.store.TransformStore.strings`
+        attribute.
+        """
+
+        store = TransformStore(
+            classify_aces_ctl_transforms(
+                discover_aces_ctl(self._root_directory)), self._store.strings)
+
+        # The strings are interned once in the shared string table.
+        self.assertIs(store.strings, self._store.strings)
+        self.assertEqual(store.records, self._store.records)
+
+    @unittest.skipUnless(is_numpy_installed(), '"NumPy" is not installed!')
+    def test_to_structured_array(self):
+        """
+        Tests :meth:`discover_aces_dev.store.TransformStore.\
+to_structured_array` method.
+        """
+
+        records = self._store.to_structured_array()
+
+        self.assertEqual(len(records), len(self._store))
+        self.assertTupleEqual(records.dtype.names,
+                              tuple(TRANSFORM_STORE_COLUMNS))
+        self.assertFalse(records.flags.writeable)
+        self.assertEqual(
+            self._store.string(records['type'][0]),
+            self._store.metadata(0)['type'])
+
+    def test_raise_exception_select(self):
+        """
+        Tests :meth:`discover_aces_dev.store.TransformStore.select` method
+        raised exceptions.
+        """
+
+        self.assertRaises(ValueError, self._store.select, version='a1.0.3')
+        self.assertRaises(ValueError, self._store.select, type__ge='ODT')
+        self.assertRaises(ValueError, self._store.select,
+                          major_version__eq=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from discover_aces_dev.discover import (classify_aces_ctl_transforms,
+                                        discover_aces_ctl)
+from discover_aces_dev.tests.fixtures import TransformsTreeTestCase
+from discover_aces_dev.watch import LiveCatalogue, PollingWatcher
+
+__all__ = ['TestLiveCatalogue']
+
+
+def _classifications(classified_ctl_transforms):
+    return {(category, classifier, basename)
+            for category, classifiers in classified_ctl_transforms.items()
+            for classifier, ctl_transforms in classifiers.items()
+            for basename in ctl_transforms}
+
+
+class TestLiveCatalogue(TransformsTreeTestCase):
+    """
+    Defines :class:`discover_aces_dev.watch.LiveCatalogue` class unit tests
+    methods.
+    """
+
+    def test_classified_ctl_transforms(self):
+        """
+        Tests :attr:`discover_aces_dev.watch.LiveCatalogue.\
+classified_ctl_transforms` attribute.
+        """
+
+        with LiveCatalogue(
+                self._root_directory,
+                watcher=PollingWatcher(self._root_directory)) as catalogue:
+            self.assertSetEqual(
+                _classifications(catalogue.classified_ctl_transforms),
+                _classifications(
+                    classify_aces_ctl_transforms(
+                        discover_aces_ctl(self._root_directory))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,697 @@
+# -*- coding: utf-8 -*-
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections import defaultdict, namedtuple
+
+from discover_aces_dev.common import vivified_to_dict
+from discover_aces_dev.compact_graph import CompactGraph
+from discover_aces_dev.discover import (
+    REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT, CTLTransform, DirectoryTrie,
+    _assemble_ctl_transform, _filter_ctl_transforms, _scan_directory, _walk,
+    find_transform_pairs)
+from discover_aces_dev.instrumentation import timer
+
+__all__ = [
+    'ChangeEvent', 'PollingWatcher', 'InotifyWatcher', 'is_inotify_available',
+    'create_watcher', 'LiveCatalogue'
+]
+
+ChangeEvent = namedtuple('ChangeEvent', ('type', 'path', 'previous_path'))
+ChangeEvent.__new__.__defaults__ = (None, )
+ChangeEvent.__doc__ = """
+Change of a *CTL* transform file, *type* is one of *added*, *modified*,
+*removed* or *renamed*, *previous_path* being only set for the latter.
+"""
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+
+_INOTIFY_MASK = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM
+                 | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF
+                 | _IN_MOVE_SELF)
+
+_INOTIFY_EVENT = struct.Struct('iIII')
+
+
+def _relative_directory(directory, root_directory):
+    relative_directory = os.path.relpath(directory, root_directory)
+    if relative_directory == os.curdir:
+        return ''
+
+    return relative_directory.replace(os.sep, '/')
+
+
+def _directory_state(directory, relative_directory, filterers, rules):
+    # Returns the sub-directories of given directory and the identity, i.e.
+    # inode, size and modification time of its "CTL" transforms, or "None"
+    # if the directory does not exist anymore.
+    scan = _scan_directory(directory, relative_directory, rules)
+    if scan is None:
+        return None
+
+    sub_directories, entries = scan
+
+    state = {}
+    for path in _filter_ctl_transforms(directory, relative_directory,
+                                       entries, filterers, rules):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+
+        state[path] = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    return [directory for directory, _relative in sub_directories], state
+
+
+def _diff(previous_state, state):
+    added, removed, events = {}, {}, []
+    for path, identity in state.items():
+        previous_identity = previous_state.get(path)
+        if previous_identity is None:
+            added[path] = identity
+        elif previous_identity != identity:
+            events.append(ChangeEvent('modified', path))
+
+    for path, identity in previous_state.items():
+        if path not in state:
+            removed[path] = identity
+
+    # A removed and an added file sharing the same inode were renamed.
+    inodes = {identity[0]: path for path, identity in removed.items()}
+    for path, identity in added.items():
+        previous_path = inodes.pop(identity[0], None)
+        if previous_path is not None:
+            del removed[previous_path]
+            events.append(ChangeEvent('renamed', path, previous_path))
+        else:
+            events.append(ChangeEvent('added', path))
+
+    events.extend(ChangeEvent('removed', path) for path in removed)
+
+    return events
+
+
+class _Watcher:
+    def __init__(self, root_directory, filterers=None, rules=None):
+        self._root_directory = os.path.normpath(
+            os.path.expandvars(root_directory))
+        self._filterers = list(filterers or [])
+        self._rules = rules
+
+        self._state = {}
+        for directory, relative_directory, _entries in _walk(
+                self._root_directory, rules):
+            directory_state = _directory_state(
+                directory, relative_directory, self._filterers, rules)
+            if directory_state is not None:
+                self._state[directory] = directory_state[1]
+
+    @property
+    def root_directory(self):
+        return self._root_directory
+
+    @property
+    def filterers(self):
+        return self._filterers
+
+    @property
+    def rules(self):
+        return self._rules
+
+    @property
+    def state(self):
+        """
+        *CTL* transforms identity, i.e. inode, size and modification time,
+        keyed by path and directory.
+        """
+
+        return self._state
+
+    def _rescan(self, directories):
+        # Rescans given directories, recursing into their new
+        # sub-directories, and returns the change events.
+        previous_state, state = {}, {}
+        directories = list(dict.fromkeys(directories))
+        scanned = set()
+        while directories:
+            directory = directories.pop()
+            if directory in scanned:
+                continue
+            scanned.add(directory)
+
+            previous_state.update(self._state.get(directory, {}))
+
+            directory_state = None
+            if (directory == self._root_directory or directory.startswith(
+                    f'{self._root_directory}{os.sep}')):
+                relative_directory = _relative_directory(
+                    directory, self._root_directory)
+                if (not relative_directory or self._rules is None or
+                        not self._rules.is_directory_excluded(
+                            relative_directory)):
+                    directory_state = _directory_state(
+                        directory, relative_directory, self._filterers,
+                        self._rules)
+
+            if directory_state is None:
+                if self._state.pop(directory, None) is not None:
+                    self._on_directory_removed(directory)
+
+                # The sub-directories of a removed directory are gone too.
+                directories.extend(
+                    known_directory for known_directory in self._state
+                    if known_directory.startswith(f'{directory}{os.sep}'))
+                continue
+
+            sub_directories, files = directory_state
+            self._state[directory] = files
+            state.update(files)
+            self._on_directory_scanned(directory)
+
+            # New sub-directories are scanned and the known ones that
+            # disappeared, e.g. renamed, are removed.
+            directories.extend(sub_directory
+                               for sub_directory in sub_directories
+                               if sub_directory not in self._state)
+            directories.extend(
+                known_directory for known_directory in self._state
+                if os.path.dirname(known_directory) == directory and
+                known_directory not in sub_directories)
+
+        return _diff(previous_state, state)
+
+    def _on_directory_scanned(self, directory):
+        pass
+
+    def _on_directory_removed(self, directory):
+        pass
+
+    def poll(self, timeout=0):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class PollingWatcher(_Watcher):
+    """
+    Portable watcher detecting the changes of the *CTL* transforms under
+    given root directory by periodically comparing their inode, size and
+    modification time.
+
+    Parameters
+    ----------
+    root_directory : unicode
+        Root directory to watch.
+    filterers : array_like, optional
+        Callables receiving a filename and returning whether the file should
+        be kept.
+    rules : DiscoveryRules, optional
+        Declarative rules pruning the directories and excluding *CTL*
+        transforms.
+    """
+
+    def poll(self, timeout=0):
+        """
+        Returns the changes since the previous poll, waiting up to given
+        timeout for changes.
+
+        Parameters
+        ----------
+        timeout : numeric, optional
+            Maximum duration in seconds to wait for changes.
+
+        Returns
+        -------
+        list
+            :class:`ChangeEvent` class instances.
+        """
+
+        deadline = time.monotonic() + timeout
+        while True:
+            with timer('watch_poll'):
+                events = self._rescan(list(self._state) +
+                                      [self._root_directory])
+
+            remaining = deadline - time.monotonic()
+            if events or remaining <= 0:
+                return events
+
+            time.sleep(min(remaining, 0.25))
+
+
+def _libc():
+    path = ctypes.util.find_library('c')
+
+    return ctypes.CDLL(path or 'libc.so.6', use_errno=True)
+
+
+def is_inotify_available():
+    """
+    Returns whether *inotify* is available.
+
+    Returns
+    -------
+    bool
+        Whether *inotify* is available.
+    """
+
+    if not sys.platform.startswith('linux'):
+        return False
+
+    try:
+        return hasattr(_libc(), 'inotify_init1')
+    except OSError:
+        return False
+
+
+class InotifyWatcher(_Watcher):
+    """
+    *Linux* watcher detecting the changes of the *CTL* transforms under given
+    root directory with *inotify*, through *ctypes*.
+
+    Only the directories reported by *inotify* are rescanned, the whole tree
+    is rescanned if the kernel event queue overflows.
+
+    Parameters
+    ----------
+    root_directory : unicode
+        Root directory to watch.
+    filterers : array_like, optional
+        Callables receiving a filename and returning whether the file should
+        be kept.
+    rules : DiscoveryRules, optional
+        Declarative rules pruning the directories and excluding *CTL*
+        transforms.
+
+    Raises
+    ------
+    OSError
+        If *inotify* cannot be initialised.
+    """
+
+    def __init__(self, root_directory, filterers=None, rules=None):
+        self._libc = _libc()
+        self._descriptor = self._libc.inotify_init1(os.O_NONBLOCK |
+                                                    os.O_CLOEXEC)
+        if self._descriptor < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+        self._watches = {}
+        self._directories = {}
+
+        super().__init__(root_directory, filterers, rules)
+
+        for directory in self._state:
+            self._add_watch(directory)
+        self._add_watch(self._root_directory)
+
+    def _add_watch(self, directory):
+        if directory in self._watches:
+            return
+
+        watch = self._libc.inotify_add_watch(self._descriptor,
+                                             os.fsencode(directory),
+                                             _INOTIFY_MASK)
+        if watch < 0:
+            logging.warning('"%s" directory cannot be watched: %s', directory,
+                            os.strerror(ctypes.get_errno()))
+            return
+
+        self._watches[directory] = watch
+        self._directories[watch] = directory
+
+    def _on_directory_scanned(self, directory):
+        self._add_watch(directory)
+
+    def _on_directory_removed(self, directory):
+        watch = self._watches.pop(directory, None)
+        # A moved directory keeps its watch descriptor which might already
+        # be assigned to its new path.
+        if watch is not None and self._directories.get(watch) == directory:
+            del self._directories[watch]
+            self._libc.inotify_rm_watch(self._descriptor, watch)
+
+    def _read(self):
+        directories, overflow = set(), False
+        while True:
+            try:
+                data = os.read(self._descriptor, 65536)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(data):
+                watch, mask, _cookie, length = _INOTIFY_EVENT.unpack_from(
+                    data, offset)
+                offset += _INOTIFY_EVENT.size + length
+
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+
+                directory = self._directories.get(watch)
+                if directory is None:
+                    continue
+
+                if mask & _IN_IGNORED:
+                    del self._directories[watch]
+                    self._watches.pop(directory, None)
+
+                directories.add(directory)
+
+        return directories, overflow
+
+    def poll(self, timeout=0):
+        """
+        Returns the changes since the previous poll, waiting up to given
+        timeout for changes.
+
+        Parameters
+        ----------
+        timeout : numeric, optional
+            Maximum duration in seconds to wait for changes.
+
+        Returns
+        -------
+        list
+            :class:`ChangeEvent` class instances.
+        """
+
+        deadline = time.monotonic() + timeout
+        while True:
+            readable, _writable, _exceptional = select.select(
+                [self._descriptor], [], [],
+                max(0, deadline - time.monotonic()))
+
+            events = []
+            if readable:
+                directories, overflow = self._read()
+                if overflow:
+                    logging.warning('"inotify" queue overflowed, rescanning '
+                                    'the whole tree!')
+                    directories = set(self._state) | {self._root_directory}
+
+                with timer('watch_poll'):
+                    events = self._rescan(directories)
+
+            if events or time.monotonic() >= deadline:
+                return events
+
+    def close(self):
+        if self._descriptor >= 0:
+            os.close(self._descriptor)
+            self._descriptor = -1
+
+
+def create_watcher(root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
+                   filterers=None,
+                   rules=None,
+                   polling=None):
+    """
+    Creates a watcher for given root directory, using *inotify* when
+    available and polling otherwise.
+
+    Parameters
+    ----------
+    root_directory : unicode, optional
+        Root directory to watch.
+    filterers : array_like, optional
+        Callables receiving a filename and returning whether the file should
+        be kept.
+    rules : DiscoveryRules, optional
+        Declarative rules pruning the directories and excluding *CTL*
+        transforms.
+    polling : bool, optional
+        Whether to force polling, *inotify* is used if available when *None*.
+
+    Returns
+    -------
+    PollingWatcher or InotifyWatcher
+        Watcher.
+    """
+
+    if polling is None:
+        polling = not is_inotify_available()
+
+    if not polling:
+        try:
+            return InotifyWatcher(root_directory, filterers, rules)
+        except OSError as error:
+            logging.warning(
+                '"inotify" cannot be used, falling back to polling: %s',
+                error)
+
+    return PollingWatcher(root_directory, filterers, rules)
+
+
+class LiveCatalogue:
+    """
+    In-memory classification and conversion graph of the *CTL* transforms
+    under given root directory, kept up-to-date with a watcher.
+
+    Each change only re-parses the added or modified *CTL* transforms and
+    re-pairs the *CTL* transforms of the affected directories, the
+    classification and conversion graph are rebuilt from the already parsed
+    *CTL* transforms on next access. The directories are classified as
+    :func:`discover_aces_dev.classify_aces_ctl_transforms` definition does,
+    relative to the root directory inferred from them.
+
+    Parameters
+    ----------
+    root_directory : unicode, optional
+        Root directory to watch, e.g. *transforms* or *transforms/ctl*.
+    filterers : array_like, optional
+        Callables receiving a filename and returning whether the file should
+        be kept.
+    rules : DiscoveryRules, optional
+        Declarative rules pruning the directories and excluding *CTL*
+        transforms.
+    watcher : PollingWatcher or InotifyWatcher, optional
+        Watcher, created with :func:`create_watcher` definition if *None*.
+    callbacks : array_like, optional
+        Callables receiving each :class:`ChangeEvent` class instance once
+        the catalogue is updated.
+
+    Examples
+    --------
+    >>> catalogue = LiveCatalogue('aces-dev/transforms')  # doctest: +SKIP
+    >>> catalogue.callbacks.append(print)  # doctest: +SKIP
+    >>> catalogue.run()  # doctest: +SKIP
+    ChangeEvent(type='modified', \
+path='aces-dev/transforms/ctl/odt/rec709/ODT.Academy.Rec709_100nits_dim.ctl', \
+previous_path=None)
+    """
+
+    def __init__(self,
+                 root_directory=REFERENCE_IMPLEMENTATION_TRANSFORMS_ROOT,
+                 filterers=None,
+                 rules=None,
+                 watcher=None,
+                 callbacks=None):
+        self._watcher = (watcher if watcher is not None else create_watcher(
+            root_directory, filterers, rules))
+        self._callbacks = list(callbacks or [])
+        self._lock = threading.RLock()
+
+        self._ctl_transforms = {}
+        self._identities = {}
+        self._entries = {}
+        self._classified_ctl_transforms = None
+        self._graph = None
+
+        self._update(list(self._watcher.state))
+
+    @property
+    def watcher(self):
+        return self._watcher
+
+    @property
+    def root_directory(self):
+        return self._watcher.root_directory
+
+    @property
+    def callbacks(self):
+        return self._callbacks
+
+    def _parse(self, path, identity):
+        if self._identities.get(path) == identity:
+            return self._ctl_transforms[path]
+
+        try:
+            ctl_transform = CTLTransform(path)
+        except (OSError, AssertionError, ValueError) as error:
+            logging.warning('"%s" CTL transform cannot be parsed: %s', path,
+                            error)
+            return None
+
+        self._ctl_transforms[path] = ctl_transform
+        self._identities[path] = identity
+
+        return ctl_transform
+
+    def _update(self, directories):
+        state = self._watcher.state
+        for directory in directories:
+            for path in [
+                    path for path in self._ctl_transforms
+                    if os.path.dirname(path) == directory and
+                    path not in state.get(directory, {})
+            ]:
+                del self._ctl_transforms[path]
+                del self._identities[path]
+
+            files = state.get(directory)
+            if not files:
+                self._entries.pop(directory, None)
+                continue
+
+            ctl_transforms = {}
+            for path, identity in files.items():
+                ctl_transform = self._parse(path, identity)
+                if ctl_transform is not None:
+                    ctl_transforms[path] = ctl_transform
+
+            # The directories are classified on next access as the inferred
+            # root directory depends on all of them.
+            self._entries[directory] = [
+                (basename, _assemble_ctl_transform(pairs, ctl_transforms))
+                for basename, pairs in find_transform_pairs(
+                    ctl_transforms).items()
+            ]
+
+        self._classified_ctl_transforms = None
+        self._graph = None
+
+    def poll(self, timeout=0):
+        """
+        Applies the changes since the previous poll to the catalogue and
+        notifies the callbacks, waiting up to given timeout for changes.
+
+        Parameters
+        ----------
+        timeout : numeric, optional
+            Maximum duration in seconds to wait for changes.
+
+        Returns
+        -------
+        list
+            :class:`ChangeEvent` class instances.
+        """
+
+        events = self._watcher.poll(timeout)
+        if not events:
+            return events
+
+        directories = set()
+        for event in events:
+            directories.add(os.path.dirname(event.path))
+            if event.previous_path is not None:
+                directories.add(os.path.dirname(event.previous_path))
+
+        with self._lock, timer('watch_update'):
+            self._update(sorted(directories))
+
+        for event in events:
+            logging.info('"%s" CTL transform was %s.', event.path,
+                         event.type)
+
+            for callback in self._callbacks:
+                callback(event)
+
+        return events
+
+    def run(self, stop_event=None, timeout=1):
+        """
+        Polls the changes until given event is set.
+
+        Parameters
+        ----------
+        stop_event : threading.Event, optional
+            Event stopping the loop when set, the loop runs forever if
+            *None*.
+        timeout : numeric, optional
+            Maximum duration in seconds of each poll.
+        """
+
+        while stop_event is None or not stop_event.is_set():
+            self.poll(timeout)
+
+    @property
+    def classified_ctl_transforms(self):
+        """
+        Classified *CTL* transforms, as returned by
+        :func:`discover_aces_dev.classify_aces_ctl_transforms` definition.
+        """
+
+        with self._lock:
+            if self._classified_ctl_transforms is None:
+                trie = DirectoryTrie(self._entries)
+                classified_ctl_transforms = defaultdict(
+                    lambda: defaultdict(dict))
+                for directory, entries in self._entries.items():
+                    category, classifiers = trie.classify(directory)
+                    for basename, ctl_transform in entries:
+                        classified_ctl_transforms[category][classifiers][
+                            basename] = ctl_transform
+
+                self._classified_ctl_transforms = vivified_to_dict(
+                    classified_ctl_transforms)
+
+            return self._classified_ctl_transforms
+
+    @property
+    def graph(self):
+        """
+        Conversion graph of the *CTL* transforms.
+        """
+
+        from discover_aces_dev.graph import _unclassify_ctl_transforms
+
+        with self._lock:
+            if self._graph is None:
+                with timer('graph_build'):
+                    self._graph = CompactGraph.from_ctl_transforms(
+                        _unclassify_ctl_transforms(
+                            self.classified_ctl_transforms))
+
+            return self._graph
+
+    def close(self):
+        """
+        Closes the watcher.
+        """
+
+        self._watcher.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()